@@ -0,0 +1,10 @@
+# Imports
+from django.contrib import admin
+from .models import Discount, Item, Promotion, TaxRate
+
+
+# Register the models
+admin.site.register(Item)
+admin.site.register(TaxRate)
+admin.site.register(Discount)
+admin.site.register(Promotion)
@@ -0,0 +1,12 @@
+# Imports
+from django.apps import AppConfig
+
+
+# App configuration
+class CatalogConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "backend.apps.catalog"
+
+    # Connect the signal receivers
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,167 @@
+# Imports
+import gc
+import json
+import random
+import sys
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+
+from backend.apps.catalog.models import Discount, Item, Promotion, TaxRate
+from backend.apps.catalog.pricing import PricingRules
+
+
+# Command to benchmark the pricing engine against growing rule sets
+class Command(BaseCommand):
+    help = (
+        "Compile synthetic catalogs with more and more discounts and "
+        "promotions, price the same bills with each of them in memory and "
+        "print the cost per line as JSON. Fails when the cost per line with "
+        "the most rules grows past --max-growth times the cost with the "
+        "fewest."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--items", type=int, default=1000)
+        parser.add_argument("--bills", type=int, default=5000)
+        parser.add_argument("--lines", type=int, default=5, help="Lines per bill")
+        parser.add_argument(
+            "--rules",
+            default="1000,10000,100000",
+            help="Comma separated numbers of discount rules to compile",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="Timed runs per rule set"
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed")
+        parser.add_argument(
+            "--max-growth",
+            type=float,
+            default=1.5,
+            help="Allowed ratio of the cost per line with the most rules",
+        )
+        parser.add_argument("--output", help="Write the JSON results to this file")
+
+    def handle(self, *args, **options):
+        try:
+            counts = sorted({int(count) for count in options["rules"].split(",")})
+        except ValueError:
+            raise CommandError("--rules must be comma separated integers")
+        if options["items"] < 1 or options["bills"] < 1 or options["repeat"] < 1:
+            raise CommandError("--items, --bills and --repeat must be at least 1")
+
+        rng = random.Random(options["seed"])
+        items = [
+            Item(
+                item_id=f"ITEM{number:05d}",
+                name=f"Item {number}",
+                price=Decimal(rng.randrange(100, 50000)) / 100,
+                tax_class=rng.choice(Item.TaxClass.values),
+            )
+            for number in range(options["items"])
+        ]
+        taxes = [
+            TaxRate(tax_class=tax_class, rate=rate)
+            for tax_class, rate in zip(
+                Item.TaxClass.values, (Decimal("18"), Decimal("5"), 0, 0)
+            )
+        ]
+
+        # The same bills are priced with every rule set
+        item_ids = [item.item_id for item in items]
+        bills = [
+            [
+                (rng.choice(item_ids), rng.randint(1, 10), None)
+                for _ in range(options["lines"])
+            ]
+            for _ in range(options["bills"])
+        ]
+        line_count = options["bills"] * options["lines"]
+
+        results = {}
+        for count in counts:
+            discounts, promotions = self.rules(rng, item_ids, count)
+
+            # Compile the rules
+            started = time.perf_counter()
+            rules = PricingRules(items, taxes, discounts, promotions)
+            compile_ms = (time.perf_counter() - started) * 1000
+
+            sizes = {"discounts": len(discounts), "promotions": len(promotions)}
+            del discounts, promotions
+
+            # Price the bills with the collector off like timeit, keeping the
+            # fastest run
+            best = None
+            gc.collect()
+            gc.disable()
+            try:
+                for _ in range(options["repeat"]):
+                    started = time.perf_counter()
+                    for _ in rules.price_bills(bills):
+                        pass
+                    elapsed = time.perf_counter() - started
+                    best = elapsed if best is None else min(best, elapsed)
+            finally:
+                gc.enable()
+
+            results[str(count)] = {
+                **sizes,
+                "compile_ms": round(compile_ms, 3),
+                "ns_per_line": round(best / line_count * 1e9, 1),
+                "bills_per_second": round(options["bills"] / best, 1),
+            }
+            self.stderr.write(
+                f"{count} rules: {results[str(count)]['ns_per_line']} ns/line"
+            )
+
+        fewest, most = results[str(counts[0])], results[str(counts[-1])]
+        growth = most["ns_per_line"] / fewest["ns_per_line"]
+        report = {
+            "dataset": {
+                "items": options["items"],
+                "bills": options["bills"],
+                "lines": options["lines"],
+            },
+            "rules": results,
+            "growth": round(growth, 3),
+        }
+
+        # Write the results
+        content = json.dumps(report, indent=2, sort_keys=True) + "\n"
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                file.write(content)
+        else:
+            sys.stdout.write(content)
+
+        if growth > options["max_growth"]:
+            raise CommandError(
+                f"Cost per line grew {growth:.2f} times from {counts[0]} to "
+                f"{counts[-1]} rules, more than --max-growth {options['max_growth']}"
+            )
+
+    def rules(self, rng, item_ids, count):
+        # Discounts spread over the items, one promotion for ten discounts
+        discounts = [
+            Discount(
+                pk=number,
+                item_id=rng.choice(item_ids),
+                min_quantity=rng.randint(1, 10),
+                percent=Decimal(rng.randrange(0, 3000)) / 100,
+                amount=Decimal(rng.randrange(0, 200)) / 100,
+            )
+            for number in range(count)
+        ]
+        promotions = [
+            Promotion(
+                pk=number,
+                name=f"Promotion {number}",
+                min_total=Decimal(rng.randrange(0, 500000)) / 100,
+                percent=Decimal(rng.randrange(0, 1500)) / 100,
+                amount=Decimal(rng.randrange(0, 5000)) / 100,
+            )
+            for number in range(count // 10)
+        ]
+        return discounts, promotions
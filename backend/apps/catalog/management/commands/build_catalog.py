@@ -0,0 +1,36 @@
+# Imports
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from backend.apps.catalog.models import Item, items_from_orders
+from backend.apps.catalog.prices import price_table
+from backend.apps.orders.models import Order
+
+
+# Command to create the catalog items of the existing orders
+class Command(BaseCommand):
+    help = (
+        "Create a catalog item for every item ID used by the existing orders "
+        "that is not in the catalog yet, priced at its latest unit price. The "
+        "catalog migrations run it once, run it again after loading old "
+        "orders, then rename and reprice the items in the admin."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database to fill",
+        )
+
+    def handle(self, *args, **options):
+        using = options["database"]
+
+        # Create the items and reload the price tables
+        with transaction.atomic(using=using):
+            items = Item.objects.using(using).bulk_create(
+                items_from_orders(Item, Order, using)
+            )
+            price_table.invalidate(using)
+
+        self.stdout.write(f"Created {len(items)} catalog items")
@@ -0,0 +1,24 @@
+from django.db import migrations
+
+from backend.apps.catalog.models import items_from_orders
+
+
+# Create the catalog items of the orders saved before the catalog existed, so
+# their items can still be sold once the prices come from the catalog
+def create_items(apps, schema_editor):
+    Item = apps.get_model("catalog", "Item")
+    Order = apps.get_model("orders", "Order")
+    using = schema_editor.connection.alias
+    Item.objects.using(using).bulk_create(items_from_orders(Item, Order, using))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0001_initial"),
+        ("orders", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_items, migrations.RunPython.noop),
+    ]
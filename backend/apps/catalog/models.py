@@ -0,0 +1,238 @@
+# Imports
+from django.db import models
+from django.db.models import OuterRef, Subquery
+from django.utils.translation import gettext_lazy as _
+
+
+# Build the items missing from the catalog for the item IDs of the orders
+def items_from_orders(Item, Order, using):
+    # Latest unit price of every item missing from the catalog
+    latest = (
+        Order.objects.using(using)
+        .filter(item_id=OuterRef("item_id"))
+        .order_by("-order_date", "-order_id")
+        .values("unit_price")[:1]
+    )
+    rows = (
+        Order.objects.using(using)
+        .exclude(item_id__in=Item.objects.using(using).values("item_id"))
+        .order_by()
+        .values("item_id")
+        .distinct()
+        .annotate(price=Subquery(latest))
+    )
+    return [
+        Item(item_id=row["item_id"], name=row["item_id"], price=row["price"])
+        for row in rows.iterator()
+    ]
+
+
+# Class based model for the catalog items
+class Item(models.Model):
+    """
+    Model for storing the items that can be sold and their prices.
+    Attributes:
+        item_id (CharField): A CharField that stores the item's ID, the one used by the order lines.
+        name (CharField): A CharField that stores the item's name.
+        price (DecimalField): A DecimalField that stores the unit price of the item.
+        tax_class (CharField): A CharField that stores the tax class the item is taxed under.
+        is_active (BooleanField): A BooleanField that indicates whether the item can be sold.
+    """
+
+    # Tax classes of the items
+    class TaxClass(models.TextChoices):
+        STANDARD = "standard", _("Standard")
+        REDUCED = "reduced", _("Reduced")
+        ZERO = "zero", _("Zero Rated")
+        EXEMPT = "exempt", _("Exempt")
+
+    # Fields
+    item_id = models.CharField(
+        max_length=10,
+        primary_key=True,
+        verbose_name=_("Item ID"),
+    )
+    name = models.CharField(
+        max_length=100,
+        verbose_name=_("Name"),
+    )
+    price = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        verbose_name=_("Price"),
+    )
+    tax_class = models.CharField(
+        max_length=20,
+        choices=TaxClass.choices,
+        default=TaxClass.STANDARD,
+        verbose_name=_("Tax Class"),
+    )
+    is_active = models.BooleanField(
+        default=True,
+        verbose_name=_("Is Active"),
+    )
+
+    # Meta class for the Item model
+    class Meta:
+        verbose_name = _("Item")
+        verbose_name_plural = _("Items")
+
+    # String representation of the Item model
+    def __str__(self):
+        return f"{self.item_id} {self.name}"
+
+
+# Class based model for the tax slabs
+class TaxRate(models.Model):
+    """
+    Model for storing the tax slab of each tax class.
+    Attributes:
+        tax_class (CharField): A CharField that stores the tax class the rate applies to.
+        rate (DecimalField): A DecimalField that stores the tax rate in percent.
+    """
+
+    # Fields
+    tax_class = models.CharField(
+        max_length=20,
+        primary_key=True,
+        choices=Item.TaxClass.choices,
+        verbose_name=_("Tax Class"),
+    )
+    rate = models.DecimalField(
+        max_digits=5,
+        decimal_places=2,
+        verbose_name=_("Rate"),
+    )
+
+    # Meta class for the TaxRate model
+    class Meta:
+        verbose_name = _("Tax Rate")
+        verbose_name_plural = _("Tax Rates")
+
+    # String representation of the TaxRate model
+    def __str__(self):
+        return f"{self.tax_class} {self.rate}%"
+
+
+# Class based model for the item discounts
+class Discount(models.Model):
+    """
+    Model for storing the discounts on an item, applied to an order line.
+    Attributes:
+        item (ForeignKey): A ForeignKey that stores the discounted item.
+        min_quantity (PositiveIntegerField): A PositiveIntegerField that stores the quantity a line needs for the discount.
+        percent (DecimalField): A DecimalField that stores the discount in percent of the line price.
+        amount (DecimalField): A DecimalField that stores the discount per unit.
+        starts_at (DateTimeField): A DateTimeField that stores when the discount starts, empty for now.
+        ends_at (DateTimeField): A DateTimeField that stores when the discount ends, empty for never.
+        is_active (BooleanField): A BooleanField that indicates whether the discount can be applied.
+    """
+
+    # Fields
+    item = models.ForeignKey(
+        Item,
+        on_delete=models.CASCADE,
+        related_name="discounts",
+        verbose_name=_("Item"),
+    )
+    min_quantity = models.PositiveIntegerField(
+        default=1,
+        verbose_name=_("Minimum Quantity"),
+    )
+    percent = models.DecimalField(
+        max_digits=5,
+        decimal_places=2,
+        default=0,
+        verbose_name=_("Percent"),
+    )
+    amount = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        default=0,
+        verbose_name=_("Amount per Unit"),
+    )
+    starts_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_("Starts At"),
+    )
+    ends_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_("Ends At"),
+    )
+    is_active = models.BooleanField(
+        default=True,
+        verbose_name=_("Is Active"),
+    )
+
+    # Meta class for the Discount model
+    class Meta:
+        verbose_name = _("Discount")
+        verbose_name_plural = _("Discounts")
+
+    # String representation of the Discount model
+    def __str__(self):
+        return f"{self.item_id} from {self.min_quantity}"
+
+
+# Class based model for the bill promotions
+class Promotion(models.Model):
+    """
+    Model for storing the promotions taken off the total of a bill.
+    Attributes:
+        name (CharField): A CharField that stores the promotion's name.
+        min_total (DecimalField): A DecimalField that stores the bill total the promotion needs.
+        percent (DecimalField): A DecimalField that stores the discount in percent of the bill total.
+        amount (DecimalField): A DecimalField that stores the discount amount.
+        starts_at (DateTimeField): A DateTimeField that stores when the promotion starts, empty for now.
+        ends_at (DateTimeField): A DateTimeField that stores when the promotion ends, empty for never.
+        is_active (BooleanField): A BooleanField that indicates whether the promotion can be applied.
+    """
+
+    # Fields
+    name = models.CharField(
+        max_length=100,
+        verbose_name=_("Name"),
+    )
+    min_total = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        default=0,
+        verbose_name=_("Minimum Total"),
+    )
+    percent = models.DecimalField(
+        max_digits=5,
+        decimal_places=2,
+        default=0,
+        verbose_name=_("Percent"),
+    )
+    amount = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        default=0,
+        verbose_name=_("Amount"),
+    )
+    starts_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_("Starts At"),
+    )
+    ends_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_("Ends At"),
+    )
+    is_active = models.BooleanField(
+        default=True,
+        verbose_name=_("Is Active"),
+    )
+
+    # Meta class for the Promotion model
+    class Meta:
+        verbose_name = _("Promotion")
+        verbose_name_plural = _("Promotions")
+
+    # String representation of the Promotion model
+    def __str__(self):
+        return self.name
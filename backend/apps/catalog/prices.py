@@ -0,0 +1,121 @@
+# Imports
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import router, transaction
+from django.utils import timezone
+
+from .models import Item
+from .pricing import compile_rules, from_cents
+
+
+# Default settings for the price table
+DEFAULTS = {
+    # Django cache alias holding the catalog version
+    "ALIAS": "default",
+    # Seconds after which the table is reloaded even without a new version
+    "MAX_AGE": 60,
+}
+
+
+# Read a price table setting
+def get_setting(name):
+    return getattr(settings, "CATALOG", {}).get(name, DEFAULTS[name])
+
+
+# Class for the process-local pricing rules
+class PriceTable:
+    """
+    Pricing rules of the catalog, loaded and compiled once and kept in memory
+    by every process.
+
+    The table remembers the catalog version it was loaded at. The version is
+    kept in the Django cache so that all the processes sharing it see a
+    change, and a new one is written by the post_save / post_delete receivers
+    once the transaction commits. A table older than MAX_AGE, or past the
+    dates of a discount or promotion, is reloaded anyway, which bounds how
+    stale the prices get when the cache is not shared.
+    """
+
+    key = "catalog:version"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rules = None
+        self._version = None
+        self._loaded_at = 0.0
+
+    @property
+    def cache(self):
+        return caches[get_setting("ALIAS")]
+
+    def version(self):
+        # Get the current catalog version, starting one when missing
+        version = self.cache.get(self.key)
+        if version is None:
+            self.cache.add(self.key, uuid.uuid4().hex, None)
+            version = self.cache.get(self.key)
+        return version
+
+    def rules(self):
+        """
+        Return the compiled PricingRules of the catalog.
+        """
+
+        version = self.version()
+        with self._lock:
+            rules = self._rules
+            if (
+                rules is not None
+                and self._version == version
+                and time.monotonic() - self._loaded_at < get_setting("MAX_AGE")
+                and (rules.valid_until is None or timezone.now() < rules.valid_until)
+            ):
+                return rules
+
+        # Read the version before the rules so a change made meanwhile is seen
+        rules = compile_rules(router.db_for_read(Item))
+        with self._lock:
+            self._rules, self._version = rules, version
+            self._loaded_at = time.monotonic()
+        return rules
+
+    def items(self):
+        # Return a dict of item_id to ItemPrice for the active items
+        return self.rules().items
+
+    def invalidate(self, using=None):
+        # Start a new version once the current transaction is committed
+        transaction.on_commit(
+            lambda: self.cache.set(self.key, uuid.uuid4().hex, None),
+            using=using or router.db_for_write(Item),
+        )
+
+
+# Shared price table
+price_table = PriceTable()
+
+
+# Price the order lines of a bill from the pricing rules
+def price_orders(orders, rules=None):
+    """
+    Set the unit price, discount and tax of every order line from the
+    catalog and return the discount of the bill. Raises PricingError, with
+    one error dict per line, when some items cannot be sold.
+    """
+
+    if rules is None:
+        rules = price_table.rules()
+
+    # Price the whole bill at once
+    bill = rules.price_bill(
+        (order["item_id"], order["quantity"], None) for order in orders
+    )
+    for order, line in zip(orders, bill.lines):
+        order["unit_price"] = from_cents(line.unit_price)
+        order["discount"] = from_cents(line.discount)
+        order["tax"] = from_cents(line.tax)
+    return from_cents(bill.discount)
@@ -0,0 +1,234 @@
+# Imports
+from bisect import bisect_right
+from collections import defaultdict, namedtuple
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.utils import timezone
+
+from .models import Discount, Item, Promotion, TaxRate
+
+
+# Price and tax class of an item that can be sold
+ItemPrice = namedtuple("ItemPrice", "name price tax_class")
+
+# Priced order line, the amounts are in cents
+LinePrice = namedtuple("LinePrice", "item_id quantity unit_price discount tax total")
+
+# Priced bill, the amounts are in cents and the discount is the promotion's
+BillPrice = namedtuple("BillPrice", "lines subtotal discount tax total promotion")
+
+
+# Raised when some lines of a bill name items that cannot be sold
+class PricingError(Exception):
+    def __init__(self, errors):
+        super().__init__("Some items are not in the catalog")
+
+        # One error dict per line, empty for the lines that are fine
+        self.errors = errors
+
+
+# Convert an amount to cents, or a percentage to basis points, rounded half up
+def hundredths(value):
+    return int((Decimal(value) * 100).quantize(Decimal(1), ROUND_HALF_UP))
+
+
+# Convert an amount in cents back to a decimal
+def from_cents(amount):
+    return Decimal(amount).scaleb(-2)
+
+
+# Part of an amount in cents at a rate in basis points, rounded half up
+def share(amount, rate):
+    if amount < 0:
+        return -share(-amount, rate)
+    return (amount * rate + 5000) // 10000
+
+
+# Class for the pricing rules compiled into lookup tables
+class PricingRules:
+    """
+    Prices, tax slabs, item discounts and bill promotions compiled once into
+    lookup tables, with every amount in integer cents.
+
+    Each item maps to its price, its tax rate and the sorted quantity
+    thresholds of its discounts, each threshold holding the best discount of
+    the rules it reaches. Pricing a line is then a dict lookup and a bisect
+    however many rules there are. Promotions are compiled the same way over
+    the bill total.
+
+    A line pays its best discount (percent of the line or amount per unit),
+    then tax on what is left. The best promotion the total reaches comes off
+    the total after tax, like a voucher. Rules outside their dates are left
+    out and `valid_until` tells when the next one starts or ends.
+    """
+
+    def __init__(self, items, taxes=(), discounts=(), promotions=(), now=None):
+        now = now or timezone.now()
+        self.valid_until = None
+
+        # Tax rate of every tax class, missing classes are not taxed
+        rates = {tax.tax_class: hundredths(tax.rate) for tax in taxes}
+
+        # Discount rules of every item
+        rules = defaultdict(list)
+        for discount in self.current(discounts, now):
+            rules[discount.item_id].append(
+                (
+                    discount.min_quantity,
+                    hundredths(discount.percent),
+                    hundredths(discount.amount),
+                    discount.pk,
+                )
+            )
+
+        # Lookup table of the items
+        self.items, self.lines = {}, {}
+        for item in items:
+            self.items[item.item_id] = ItemPrice(item.name, item.price, item.tax_class)
+            self.lines[item.item_id] = (
+                hundredths(item.price),
+                rates.get(item.tax_class, 0),
+                *self.compile(rules.get(item.item_id, ())),
+            )
+
+        # Lookup table of the promotions
+        self.promotion_thresholds, self.promotion_tiers = self.compile(
+            (
+                hundredths(promotion.min_total),
+                hundredths(promotion.percent),
+                hundredths(promotion.amount),
+                promotion.pk,
+            )
+            for promotion in self.current(promotions, now)
+        )
+
+    def current(self, rules, now):
+        # Yield the rules running now and remember the next date to reload at
+        for rule in rules:
+            for moment in (rule.starts_at, rule.ends_at):
+                if moment is not None and moment > now:
+                    if self.valid_until is None or moment < self.valid_until:
+                        self.valid_until = moment
+            if (rule.starts_at is None or rule.starts_at <= now) and (
+                rule.ends_at is None or rule.ends_at > now
+            ):
+                yield rule
+
+    def compile(self, rules):
+        """
+        Take (threshold, percent, amount, key) rules and return the sorted
+        thresholds with, for each one, the best (percent, key, amount, key) of
+        the rules up to it. Thresholds that do not improve on the one before
+        are dropped, so the tables stay short however many rules there are.
+        """
+
+        thresholds, tiers = [], []
+        percent, percent_key, amount, amount_key = 0, None, 0, None
+        for threshold, rule_percent, rule_amount, key in sorted(
+            rules, key=lambda rule: rule[0]
+        ):
+            if rule_percent > percent:
+                percent, percent_key = rule_percent, key
+            if rule_amount > amount:
+                amount, amount_key = rule_amount, key
+            tier = (percent, percent_key, amount, amount_key)
+
+            # Keep only the thresholds where the best rule changes
+            if tiers and tiers[-1] == tier:
+                continue
+            if thresholds and thresholds[-1] == threshold:
+                tiers[-1] = tier
+            else:
+                thresholds.append(threshold)
+                tiers.append(tier)
+        return thresholds, tiers
+
+    def price_bill(self, lines):
+        """
+        Price the lines of a bill in one pass and return a BillPrice. Each
+        line is (item_id, quantity, unit_price), the unit price being in cents
+        or None for the catalog price. Raises PricingError when some items
+        cannot be sold.
+        """
+
+        table = self.lines
+        priced, missing = [], []
+        subtotal = tax = total = 0
+        for item_id, quantity, unit_price in lines:
+            entry = table.get(item_id)
+            if entry is None:
+                missing.append((len(priced), item_id))
+                priced.append(None)
+                continue
+            price, rate, thresholds, tiers = entry
+            if unit_price is None:
+                unit_price = price
+
+            # Best discount of the quantity, then tax on the rest
+            gross = quantity * unit_price
+            discount = 0
+            if thresholds:
+                index = bisect_right(thresholds, quantity)
+                if index:
+                    percent, _, amount, _ = tiers[index - 1]
+                    discount = min(gross, max(share(gross, percent), quantity * amount))
+            line_tax = share(gross - discount, rate)
+            line_total = gross - discount + line_tax
+
+            priced.append(
+                LinePrice(item_id, quantity, unit_price, discount, line_tax, line_total)
+            )
+            subtotal += gross
+            tax += line_tax
+            total += line_total
+
+        if missing:
+            errors = [{} for _ in priced]
+            for index, item_id in missing:
+                errors[index] = {"item_id": [f"Item {item_id} is not in the catalog."]}
+            raise PricingError(errors)
+
+        discount, promotion = self.promote(total)
+        return BillPrice(priced, subtotal, discount, tax, total - discount, promotion)
+
+    def promote(self, total):
+        """
+        Return the (discount, promotion key) of the best promotion a bill
+        total in cents reaches, (0, None) when there is none.
+        """
+
+        index = bisect_right(self.promotion_thresholds, total)
+        if not index or total <= 0:
+            return 0, None
+        percent, percent_key, amount, amount_key = self.promotion_tiers[index - 1]
+        by_percent = share(total, percent)
+        discount, promotion = (
+            (by_percent, percent_key) if by_percent >= amount else (amount, amount_key)
+        )
+        discount = min(discount, total)
+        return (discount, promotion) if discount else (0, None)
+
+    def price_bills(self, bills):
+        """
+        Price many bills with the same rules, for audits and re-pricing. Takes
+        an iterable of line lists and yields a BillPrice, or the PricingError,
+        for each of them in order.
+        """
+
+        price_bill = self.price_bill
+        for lines in bills:
+            try:
+                yield price_bill(lines)
+            except PricingError as error:
+                yield error
+
+
+# Load and compile the pricing rules running now
+def compile_rules(using=None, now=None):
+    return PricingRules(
+        Item.objects.using(using).filter(is_active=True),
+        TaxRate.objects.using(using).all(),
+        Discount.objects.using(using).filter(is_active=True),
+        Promotion.objects.using(using).filter(is_active=True),
+        now=now,
+    )
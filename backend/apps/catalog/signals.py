@@ -0,0 +1,19 @@
+# Imports
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Discount, Item, Promotion, TaxRate
+from .prices import price_table
+
+
+# Reload the pricing rules of every process when a rule changes
+@receiver(post_save, sender=Item)
+@receiver(post_delete, sender=Item)
+@receiver(post_save, sender=TaxRate)
+@receiver(post_delete, sender=TaxRate)
+@receiver(post_save, sender=Discount)
+@receiver(post_delete, sender=Discount)
+@receiver(post_save, sender=Promotion)
+@receiver(post_delete, sender=Promotion)
+def invalidate_prices(sender, instance, using, **kwargs):
+    price_table.invalidate(using)
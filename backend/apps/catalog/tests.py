@@ -0,0 +1,173 @@
+# Imports
+import datetime
+from decimal import Decimal
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from .models import Discount, Item, Promotion, TaxRate
+from .prices import price_table
+from .pricing import PricingRules, hundredths, share
+
+
+# Tests of the process-local price table
+class PriceTableTests(TestCase):
+    def setUp(self):
+        # Start from a table loaded after the item exists
+        with self.captureOnCommitCallbacks(execute=True):
+            self.item = Item.objects.create(
+                item_id="ITEM0001", name="Tea", price=Decimal("10.00")
+            )
+
+    def price(self, item_id):
+        return price_table.items()[item_id].price
+
+    def test_saved_item_reloads_the_table(self):
+        self.assertEqual(self.price("ITEM0001"), Decimal("10.00"))
+
+        # The table is kept until the change is committed
+        with self.captureOnCommitCallbacks(execute=True):
+            self.item.price = Decimal("12.50")
+            self.item.save()
+            self.assertEqual(self.price("ITEM0001"), Decimal("10.00"))
+
+        self.assertEqual(self.price("ITEM0001"), Decimal("12.50"))
+
+    def test_deactivated_item_leaves_the_table(self):
+        self.assertIn("ITEM0001", price_table.items())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.item.is_active = False
+            self.item.save()
+
+        self.assertNotIn("ITEM0001", price_table.items())
+
+    def test_table_is_reloaded_past_the_end_of_a_rule(self):
+        now = timezone.now()
+        ends_at = now + datetime.timedelta(hours=1)
+        with self.captureOnCommitCallbacks(execute=True):
+            Promotion.objects.create(
+                name="Happy Hour", min_total=0, amount=Decimal("1.00"), ends_at=ends_at
+            )
+        self.assertEqual(price_table.rules().promote(1000), (100, mock.ANY))
+
+        # Without a new catalog version the ended promotion is still dropped
+        later = ends_at + datetime.timedelta(seconds=1)
+        with mock.patch("django.utils.timezone.now", return_value=later):
+            self.assertEqual(price_table.rules().promote(1000), (0, None))
+
+
+# Tests of the pricing rules compiled in memory
+class PricingRulesTests(SimpleTestCase):
+    def setUp(self):
+        self.now = timezone.now()
+        self.taxes = [
+            TaxRate(tax_class=Item.TaxClass.STANDARD, rate=Decimal("18")),
+            TaxRate(tax_class=Item.TaxClass.ZERO, rate=0),
+        ]
+
+    def rules(self, price="10.00", discounts=(), promotions=(), now=None):
+        item = Item(item_id="ITEM0001", name="Tea", price=Decimal(price))
+        free = Item(
+            item_id="ITEM0002",
+            name="Water",
+            price=0,
+            tax_class=Item.TaxClass.ZERO,
+        )
+        return PricingRules(
+            [item, free], self.taxes, discounts, promotions, now=now or self.now
+        )
+
+    def discount(self, min_quantity, percent=0, amount=0, **dates):
+        return Discount(
+            item_id="ITEM0001",
+            min_quantity=min_quantity,
+            percent=Decimal(percent),
+            amount=Decimal(amount),
+            **dates,
+        )
+
+    def line(self, rules, quantity, item_id="ITEM0001"):
+        return rules.price_bill([(item_id, quantity, None)]).lines[0]
+
+    def test_hundredths_round_half_up(self):
+        self.assertEqual(hundredths(Decimal("19.999")), 2000)
+        self.assertEqual(hundredths(Decimal("0.125")), 13)
+        self.assertEqual(hundredths(Decimal("0.124")), 12)
+        self.assertEqual(hundredths(Decimal("-0.125")), -13)
+        self.assertEqual(hundredths(0), 0)
+
+    def test_share_rounds_half_up(self):
+        # 10% of 5 and 15 cents are half a cent and a cent and a half
+        self.assertEqual(share(5, 1000), 1)
+        self.assertEqual(share(15, 1000), 2)
+        self.assertEqual(share(4, 1000), 0)
+        self.assertEqual(share(-5, 1000), -1)
+        self.assertEqual(share(0, 1800), 0)
+
+    def test_zero_and_negative_lines(self):
+        rules = self.rules(discounts=[self.discount(1, percent="10")])
+
+        self.assertEqual(self.line(rules, 0), ("ITEM0001", 0, 1000, 0, 0, 0))
+        self.assertEqual(self.line(rules, 3, "ITEM0002"), ("ITEM0002", 3, 0, 0, 0, 0))
+
+        # A returned line is refunded with its tax but without a discount
+        bill = rules.price_bill([("ITEM0001", -2, None)])
+        self.assertEqual(bill.lines[0], ("ITEM0001", -2, 1000, 0, -360, -2360))
+        self.assertEqual((bill.discount, bill.total), (0, -2360))
+
+    def test_discount_tier_boundary_against_amount_per_unit(self):
+        discounts = [
+            self.discount(5, amount="1.50"),
+            self.discount(10, percent="10"),
+        ]
+        rules = self.rules(discounts=discounts)
+
+        # Below the first tier, at it, and at the percent tier where the
+        # amount per unit is still the better discount
+        self.assertEqual(self.line(rules, 4).discount, 0)
+        self.assertEqual(self.line(rules, 5).discount, 750)
+        self.assertEqual(self.line(rules, 10).discount, 1500)
+
+        # With a dearer item the percent wins at the same quantity
+        rules = self.rules(price="20.00", discounts=discounts)
+        self.assertEqual(self.line(rules, 9).discount, 1350)
+        self.assertEqual(self.line(rules, 10).discount, 2000)
+
+    def test_promotion_comes_off_the_total_after_tax(self):
+        promotion = Promotion(
+            name="Big Basket", min_total=Decimal("118.00"), percent=10
+        )
+        rules = self.rules(promotions=[promotion])
+
+        # 100.00 before tax only reaches the promotion with its 18.00 tax
+        bill = rules.price_bill([("ITEM0001", 10, None)])
+        self.assertEqual((bill.subtotal, bill.tax), (10000, 1800))
+        self.assertEqual((bill.discount, bill.total), (1180, 10620))
+
+        bill = rules.price_bill([("ITEM0001", 9, None)])
+        self.assertEqual((bill.discount, bill.total), (0, 10620))
+
+    def test_rules_outside_their_dates_set_valid_until(self):
+        starts_at = self.now + datetime.timedelta(hours=2)
+        ends_at = self.now + datetime.timedelta(hours=1)
+        discounts = [
+            self.discount(1, percent="50", starts_at=starts_at),
+            self.discount(1, percent="10", ends_at=ends_at),
+            self.discount(1, percent="90", ends_at=self.now),
+        ]
+
+        # Only the running discount applies until the first date is reached
+        rules = self.rules(discounts=discounts)
+        self.assertEqual(rules.valid_until, ends_at)
+        self.assertEqual(self.line(rules, 1).discount, 100)
+
+        # Compiled again after it, the ended discount is gone
+        rules = self.rules(discounts=discounts, now=ends_at)
+        self.assertEqual(rules.valid_until, starts_at)
+        self.assertEqual(self.line(rules, 1).discount, 0)
+
+        rules = self.rules(discounts=discounts, now=starts_at)
+        self.assertIsNone(rules.valid_until)
+        self.assertEqual(self.line(rules, 1).discount, 500)
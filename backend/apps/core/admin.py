@@ -0,0 +1,9 @@
+# Imports
+from django.contrib import admin
+from .models import IDSequence, IdempotencyKey, ThrottleBucket
+
+
+# Register the models
+admin.site.register(IDSequence)
+admin.site.register(ThrottleBucket)
+admin.site.register(IdempotencyKey)
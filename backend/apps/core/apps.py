@@ -0,0 +1,8 @@
+# Imports
+from django.apps import AppConfig
+
+
+# App configuration
+class CoreConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "backend.apps.core"
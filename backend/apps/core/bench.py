@@ -0,0 +1,620 @@
+# Imports
+import json
+import random
+import threading
+import time
+import tracemalloc
+from contextlib import ExitStack, contextmanager
+from decimal import Decimal
+
+from asgiref.sync import async_to_sync, sync_to_async
+
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.test import Client
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from backend.apps.catalog.models import Item
+from backend.apps.catalog.prices import price_table
+from backend.apps.core.ids import allocate_ids
+from backend.apps.customers.models import Customer, build_search_text
+from backend.apps.employees.models import Employee
+from backend.apps.orders.models import CheckoutBill
+
+
+# Get the user model
+User = get_user_model()
+
+
+# Password of the seeded employees
+PASSWORD = "bench-password-123"
+
+
+# Registered scenarios by URL name
+SCENARIOS = {}
+
+
+# URL namespaces that are not benchmarked
+SKIPPED_NAMESPACES = {"admin"}
+
+
+# Decorator to register how to call an endpoint
+def scenario(name, method="get", status=200, auth=True):
+    """
+    The decorated function takes (dataset, iteration) and returns the
+    request as a dict with path and optionally data and content_type.
+    """
+
+    def decorator(build):
+        SCENARIOS[name] = {
+            "build": build,
+            "method": method,
+            "status": status,
+            "auth": auth,
+        }
+        return build
+
+    return decorator
+
+
+# Class holding the seeded rows the scenarios use
+class Dataset:
+    def __init__(self, customers, employees, bills, lines, seed=0):
+        self.random = random.Random(seed)
+        self.sizes = {
+            "customers": customers,
+            "employees": employees,
+            "bills": bills,
+            "lines": lines,
+        }
+
+    def seed(self):
+        # Employees, the first one is a superuser for the operation endpoints
+        self.employees = []
+        for index in range(self.sizes["employees"]):
+            user = User.objects.create_user(
+                username=f"bench-emp-{index}",
+                email=f"bench-emp-{index}@example.com",
+                password=PASSWORD,
+                first_name="Bench",
+                last_name=f"Employee{index}",
+                phone_number=f"+91-{900000000 + index}",
+                is_staff=True,
+                is_superuser=index == 0,
+            )
+            self.employees.append(self.new_employee(user))
+        self.superuser = self.employees[0].user
+
+        # Customers in one bulk insert
+        customers = []
+        for cust_id in allocate_ids(Customer, self.sizes["customers"]):
+            customer = self.customer_fields(cust_id)
+            customer["search_text"] = build_search_text(
+                customer["first_name"],
+                customer["last_name"],
+                customer["username"],
+                customer["email"],
+                customer["phone_number"],
+            )
+            customers.append(Customer(cust_id=cust_id, **customer))
+        Customer.objects.bulk_create(customers, batch_size=500)
+        self.customers = [customer.cust_id for customer in customers]
+
+        # Catalog the bills are priced from
+        self.prices = {
+            f"ITEM{number:04d}": Decimal(self.random.randrange(100, 50000)) / 100
+            for number in range(1, 500)
+        }
+        Item.objects.bulk_create(
+            Item(item_id=item_id, name=f"Item {item_id}", price=price)
+            for item_id, price in self.prices.items()
+        )
+        price_table.invalidate()
+        self.items = list(self.prices)
+
+        # Bills in batches of 500
+        self.bills = []
+        for start in range(0, self.sizes["bills"], 500):
+            count = min(500, self.sizes["bills"] - start)
+            bills = CheckoutBill.objects.create_bills(
+                self.bill_entry() for _ in range(count)
+            )
+            self.bills.extend(bill.bill_id for bill in bills)
+
+        # Tokens for the authenticated requests
+        refresh = RefreshToken.for_user(self.superuser)
+        self.refresh_token = str(refresh)
+        self.access_token = str(refresh.access_token)
+
+        # Bill sent again and again with the same idempotency key
+        self.replay_payload = self.bill_payload()
+
+    def new_employee(self, user=None):
+        if user is None:
+            index = self.random.randrange(10**9)
+            user = User.objects.create(
+                username=f"bench-tmp-{index}",
+                email=f"bench-tmp-{index}@example.com",
+                phone_number=f"+91-{100000000 + index % 10**8}",
+                is_staff=True,
+            )
+        return Employee.objects.create(
+            user=user,
+            address="Counter 1",
+            department="Sales",
+            position="Cashier",
+            salary=Decimal("25000.00"),
+            hire_date="2024-01-01",
+        )
+
+    def customer_fields(self, key):
+        first_name = self.random.choice(["Asha", "Ravi", "Meera", "John", "Sara"])
+        return {
+            "username": f"bench-{key}".lower(),
+            "email": f"bench-{key}@example.com".lower(),
+            "first_name": first_name,
+            "last_name": self.random.choice(["Patel", "Rao", "Smith", "Khan"]),
+            "phone_number": f"+91-{self.random.randrange(10**9, 10**10)}",
+            "address": "Market Road",
+        }
+
+    def bill_line(self):
+        item_id = self.random.choice(self.items)
+        return {
+            "item_id": item_id,
+            "quantity": self.random.randint(1, 5),
+            "unit_price": self.prices[item_id],
+        }
+
+    def bill_entry(self):
+        fields = {
+            "emp_id": self.random.choice(self.employees),
+            "cust_id_id": self.random.choice(self.customers),
+        }
+        return fields, [self.bill_line() for _ in range(self.sizes["lines"])]
+
+    def bill_payload(self):
+        return {
+            "emp_id": self.random.choice(self.employees).emp_id,
+            "cust_id": self.random.choice(self.customers),
+            "orders": [
+                {"item_id": line["item_id"], "quantity": line["quantity"]}
+                for line in (self.bill_line() for _ in range(self.sizes["lines"]))
+            ],
+        }
+
+    def pick(self, rows, iteration):
+        return rows[iteration % len(rows)]
+
+
+# Home, token and schema endpoints
+@scenario("restapi_home", auth=False)
+def home(dataset, iteration):
+    return {"path": reverse("restapi_home")}
+
+
+@scenario("restapi_home_async", auth=False)
+def home_async(dataset, iteration):
+    return {"path": reverse("restapi_home_async")}
+
+
+@scenario("token_obtain_pair", method="post", auth=False)
+def token_obtain(dataset, iteration):
+    user = dataset.pick(dataset.employees, iteration).user
+    return {
+        "path": reverse("token_obtain_pair"),
+        "data": {"username": user.username, "password": PASSWORD},
+    }
+
+
+@scenario("token_refresh", method="post", auth=False)
+def token_refresh(dataset, iteration):
+    return {
+        "path": reverse("token_refresh"),
+        "data": {"refresh": dataset.refresh_token},
+    }
+
+
+@scenario("token_verify", method="post", auth=False)
+def token_verify(dataset, iteration):
+    return {
+        "path": reverse("token_verify"),
+        "data": {"token": dataset.access_token},
+    }
+
+
+@scenario("schema-json", auth=False)
+def schema_json(dataset, iteration):
+    return {"path": reverse("schema-json", kwargs={"format": ".json"})}
+
+
+@scenario("schema-swagger-ui", auth=False)
+def schema_swagger_ui(dataset, iteration):
+    return {"path": reverse("schema-swagger-ui")}
+
+
+@scenario("schema-redoc", auth=False)
+def schema_redoc(dataset, iteration):
+    return {"path": reverse("schema-redoc")}
+
+
+# Employee endpoints
+@scenario("employee_search")
+def employee_search(dataset, iteration):
+    employee = dataset.pick(dataset.employees, iteration)
+    return {"path": reverse("employee_search", kwargs={"emp_id": employee.emp_id})}
+
+
+@scenario("employee_search_async")
+def employee_search_async(dataset, iteration):
+    employee = dataset.pick(dataset.employees, iteration)
+    return {
+        "path": reverse("employee_search_async", kwargs={"emp_id": employee.emp_id})
+    }
+
+
+@scenario("employee_create", method="post", status=201)
+def employee_create(dataset, iteration):
+    key = f"{iteration}-{dataset.random.randrange(10**9)}"
+    return {
+        "path": reverse("employee_create"),
+        "data": {
+            "user": {
+                "username": f"bench-new-{key}",
+                "email": f"bench-new-{key}@example.com",
+                "first_name": "New",
+                "last_name": "Employee",
+                "phone_number": f"+91-{dataset.random.randrange(10**9, 10**10)}",
+            },
+            "password": PASSWORD,
+            "confirm_password": PASSWORD,
+            "address": "Counter 2",
+            "department": "Sales",
+            "position": "Cashier",
+            "salary": "21000.00",
+            "hire_date": "2024-06-01",
+            "is_active": True,
+        },
+    }
+
+
+@scenario("employee_update", method="put")
+def employee_update(dataset, iteration):
+    employee = dataset.pick(dataset.employees, iteration)
+    return {
+        "path": reverse("employee_update", kwargs={"emp_id": employee.emp_id}),
+        "data": {"position": dataset.random.choice(["Cashier", "Supervisor"])},
+    }
+
+
+@scenario("employee_delete", method="delete", status=204)
+def employee_delete(dataset, iteration):
+    employee = dataset.new_employee()
+    return {"path": reverse("employee_delete", kwargs={"emp_id": employee.emp_id})}
+
+
+@scenario("employee_authenticate", method="post", auth=False)
+def employee_authenticate(dataset, iteration):
+    user = dataset.pick(dataset.employees, iteration).user
+    return {
+        "path": reverse("employee_authenticate"),
+        "data": {"username": user.username, "password": PASSWORD},
+    }
+
+
+@scenario("employee_login", method="post", auth=False)
+def employee_login(dataset, iteration):
+    user = dataset.pick(dataset.employees, iteration).user
+    return {
+        "path": reverse("employee_login"),
+        "data": {"username": user.username, "password": PASSWORD},
+    }
+
+
+# Customer endpoints
+@scenario("find_customer")
+def find_customer(dataset, iteration):
+    query = dataset.random.choice(["asha", "rav", "smith", "meer pat", "98"])
+    return {"path": reverse("find_customer"), "data": {"q": query}}
+
+
+@scenario("search_customer")
+def search_customer(dataset, iteration):
+    cust_id = dataset.pick(dataset.customers, iteration)
+    return {"path": reverse("search_customer", kwargs={"cust_id": cust_id})}
+
+
+@scenario("search_customer_async")
+def search_customer_async(dataset, iteration):
+    cust_id = dataset.pick(dataset.customers, iteration)
+    return {"path": reverse("search_customer_async", kwargs={"cust_id": cust_id})}
+
+
+@scenario("create_customer", method="post", status=201)
+def create_customer(dataset, iteration):
+    key = f"new-{iteration}-{dataset.random.randrange(10**9)}"
+    return {"path": reverse("create_customer"), "data": dataset.customer_fields(key)}
+
+
+@scenario("update_customer", method="put")
+def update_customer(dataset, iteration):
+    cust_id = dataset.pick(dataset.customers, iteration)
+    data = Customer.objects.filter(cust_id=cust_id).values(
+        "username", "email", "first_name", "last_name", "phone_number", "address"
+    )[0]
+    data["address"] = f"Shop {iteration}"
+    return {
+        "path": reverse("update_customer", kwargs={"cust_id": cust_id}),
+        "data": data,
+    }
+
+
+@scenario("delete_customer", method="delete", status=204)
+def delete_customer(dataset, iteration):
+    key = f"del-{iteration}-{dataset.random.randrange(10**9)}"
+    customer = Customer.objects.create(**dataset.customer_fields(key))
+    return {"path": reverse("delete_customer", kwargs={"cust_id": customer.cust_id})}
+
+
+# Bill endpoints
+@scenario("bill_list")
+def bill_list(dataset, iteration):
+    return {"path": reverse("bill_list")}
+
+
+@scenario("bill_create", method="post", status=201)
+def bill_create(dataset, iteration):
+    return {"path": reverse("bill_create"), "data": dataset.bill_payload()}
+
+
+@scenario("bill_create_replay", method="post", status=201)
+def bill_create_replay(dataset, iteration):
+    # Every request after the first is answered from the idempotency key
+    return {
+        "path": reverse("bill_create"),
+        "data": dataset.replay_payload,
+        "headers": {"Idempotency-Key": "bench-replay"},
+    }
+
+
+@scenario("bill_bulk_create", method="post")
+def bill_bulk_create(dataset, iteration):
+    return {
+        "path": reverse("bill_bulk_create"),
+        "data": "".join(json.dumps(dataset.bill_payload()) + "\n" for _ in range(20)),
+        "content_type": "application/x-ndjson",
+    }
+
+
+@scenario("bill_export")
+def bill_export(dataset, iteration):
+    return {"path": reverse("bill_export"), "data": {"output": "csv"}}
+
+
+@scenario("bill_search")
+def bill_search(dataset, iteration):
+    bill_id = dataset.pick(dataset.bills, iteration)
+    return {"path": reverse("bill_search", kwargs={"bill_id": bill_id})}
+
+
+@scenario("bill_search_async")
+def bill_search_async(dataset, iteration):
+    bill_id = dataset.pick(dataset.bills, iteration)
+    return {"path": reverse("bill_search_async", kwargs={"bill_id": bill_id})}
+
+
+# Report endpoints
+@scenario("report_daily")
+def report_daily(dataset, iteration):
+    return {"path": reverse("report_daily")}
+
+
+@scenario("report_employees")
+def report_employees(dataset, iteration):
+    return {"path": reverse("report_employees")}
+
+
+@scenario("report_customers")
+def report_customers(dataset, iteration):
+    return {"path": reverse("report_customers")}
+
+
+@scenario("report_items")
+def report_items(dataset, iteration):
+    return {"path": reverse("report_items")}
+
+
+# Operation endpoints
+@scenario("cache_stats")
+def cache_stats(dataset, iteration):
+    return {"path": reverse("cache_stats")}
+
+
+@scenario("db_pool_stats")
+def db_pool_stats(dataset, iteration):
+    return {"path": reverse("db_pool_stats")}
+
+
+@scenario("password_pool_stats")
+def password_pool_stats(dataset, iteration):
+    return {"path": reverse("password_pool_stats")}
+
+
+@scenario("metrics")
+def metrics(dataset, iteration):
+    return {"path": reverse("metrics")}
+
+
+# Get the names of the routed URLs outside the skipped namespaces
+def url_names(resolver=None):
+    names = set()
+    for pattern in (resolver or get_resolver()).url_patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.namespace not in SKIPPED_NAMESPACES:
+                names |= url_names(pattern)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            names.add(pattern.name)
+    return names
+
+
+# Class to count the queries of a request
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        with self._lock:
+            self.count += 1
+        return execute(sql, params, many, context)
+
+    @contextmanager
+    def installed(self):
+        """
+        Count the queries of the current thread and of the thread running the
+        thread sensitive code of the async views, which is another thread
+        once an event loop runs them. Each connection is wrapped once.
+        """
+
+        wrapped = set()
+        with ExitStack() as stack:
+
+            def install():
+                for connection in connections.all():
+                    if id(connection) not in wrapped:
+                        wrapped.add(id(connection))
+                        stack.enter_context(connection.execute_wrapper(self))
+
+            install()
+            async_to_sync(sync_to_async(install, thread_sensitive=True))()
+            yield self
+
+
+# Get a percentile of sorted samples by nearest rank
+def percentile(samples, q):
+    return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+# Class to run the scenarios against the test client
+class Runner:
+    """
+    Calls each scenario `requests` times after `warmup` untimed calls and
+    then `alloc_requests` more times under tracemalloc, so the timings are
+    not slowed down by the allocation tracing.
+    """
+
+    def __init__(self, dataset, requests, warmup, alloc_requests):
+        self.dataset = dataset
+        self.requests = requests
+        self.warmup = warmup
+        self.alloc_requests = alloc_requests
+        self.client = Client()
+
+    def call(self, name, iteration):
+        spec = SCENARIOS[name]
+        request = spec["build"](self.dataset, iteration)
+        kwargs = {}
+        if spec["auth"]:
+            kwargs["HTTP_AUTHORIZATION"] = f"Bearer {self.dataset.access_token}"
+        if "headers" in request:
+            kwargs["headers"] = request["headers"]
+        data = request.get("data")
+        if spec["method"] != "get":
+            kwargs["content_type"] = request.get("content_type", "application/json")
+
+        # Send the request and read a streamed body to the end
+        def send():
+            response = getattr(self.client, spec["method"])(
+                request["path"], data, **kwargs
+            )
+            if response.streaming:
+                for _ in response.streaming_content:
+                    pass
+            return response
+
+        return spec, send
+
+    def run(self, name):
+        counter = QueryCounter()
+        latencies = []
+        queries = 0
+        errors = 0
+
+        # Warm the caches and the code paths up
+        for iteration in range(self.warmup):
+            self.call(name, iteration)[1]()
+
+        # Time the requests
+        with counter.installed():
+            started = time.perf_counter()
+            for iteration in range(self.warmup, self.warmup + self.requests):
+                spec, send = self.call(name, iteration)
+                counter.count = 0
+                request_started = time.perf_counter()
+                response = send()
+                latencies.append(time.perf_counter() - request_started)
+                queries += counter.count
+                errors += response.status_code != spec["status"]
+            elapsed = time.perf_counter() - started
+
+        # Measure the allocations of a few more requests
+        allocations = []
+        tracemalloc.start()
+        try:
+            for iteration in range(self.alloc_requests):
+                _, send = self.call(name, self.warmup + self.requests + iteration)
+                tracemalloc.reset_peak()
+                baseline = tracemalloc.get_traced_memory()[0]
+                send()
+                allocations.append(tracemalloc.get_traced_memory()[1] - baseline)
+        finally:
+            tracemalloc.stop()
+
+        latencies.sort()
+        return {
+            "requests": self.requests,
+            "errors": errors,
+            "requests_per_second": round(self.requests / elapsed, 1),
+            "latency_ms": {
+                "p50": round(percentile(latencies, 0.5) * 1000, 3),
+                "p95": round(percentile(latencies, 0.95) * 1000, 3),
+                "p99": round(percentile(latencies, 0.99) * 1000, 3),
+                "max": round(latencies[-1] * 1000, 3),
+            },
+            "queries_per_request": round(queries / self.requests, 2),
+            "alloc_peak_kib": (
+                round(sum(allocations) / len(allocations) / 1024, 1)
+                if allocations
+                else None
+            ),
+        }
+
+
+# Compare results against a baseline
+def find_regressions(results, baseline, threshold):
+    """
+    Return a message for each endpoint whose p95 latency or allocation peak
+    grew by more than `threshold` (0.25 is 25%) or whose query count grew.
+    """
+
+    regressions = []
+    for name, result in sorted(results.items()):
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result["errors"]:
+            regressions.append(f"{name}: {result['errors']} unexpected responses")
+        checks = [
+            ("p95 latency", result["latency_ms"]["p95"], base["latency_ms"]["p95"]),
+            ("allocation peak", result["alloc_peak_kib"], base["alloc_peak_kib"]),
+        ]
+        for label, value, before in checks:
+            if value is not None and before and value > before * (1 + threshold):
+                regressions.append(f"{name}: {label} {before} -> {value}")
+        if result["queries_per_request"] > base["queries_per_request"]:
+            regressions.append(
+                f"{name}: queries per request {base['queries_per_request']}"
+                f" -> {result['queries_per_request']}"
+            )
+    return regressions
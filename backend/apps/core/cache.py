@@ -0,0 +1,227 @@
+# Imports
+import functools
+import hashlib
+import inspect
+import json
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponseNotModified
+from django.utils.http import quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from .responses import json_response
+from .versioning import etag_matches
+
+
+# Default settings for the response cache
+DEFAULTS = {
+    # Django cache alias used to store the responses
+    "ALIAS": "default",
+    # Seconds a response is kept, None keeps it until invalidated
+    "TIMEOUT": 300,
+    # Turn the cache off without touching the views
+    "ENABLED": True,
+}
+
+
+# Read a response cache setting
+def get_setting(name):
+    return getattr(settings, "RESPONSE_CACHE", {}).get(name, DEFAULTS[name])
+
+
+# Class to cache the responses of the search endpoints
+class ResponseCache:
+    """
+    Read-through cache of serialized responses keyed by resource and ID.
+
+    Entries hold the response data and its ETag, and are stored in any Django
+    cache backend (locmem, file based, memcached, redis). They are removed by
+    the post_save / post_delete receivers of each app once the transaction
+    commits. Hits and misses are counted per process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = Counter()
+
+    @property
+    def cache(self):
+        return caches[get_setting("ALIAS")]
+
+    def key(self, resource, pk):
+        return f"response:{resource}:{pk}"
+
+    def count(self, resource, entry):
+        # Count a lookup as a hit or a miss
+        with self._lock:
+            self._counters[(resource, "hits" if entry else "misses")] += 1
+        return entry
+
+    def entry(self, data, etag=None):
+        # Build an entry of plain JSON data together with its ETag, the hash
+        # of the data when the row version is not given
+        content = json.dumps(data, cls=JSONEncoder)
+        return {
+            "etag": etag or quote_etag(hashlib.md5(content.encode()).hexdigest()),
+            "data": json.loads(content),
+        }
+
+    def get(self, resource, pk):
+        return self.count(resource, self.cache.get(self.key(resource, pk)))
+
+    def set(self, resource, pk, data, etag=None):
+        entry = self.entry(data, etag)
+        self.cache.set(self.key(resource, pk), entry, get_setting("TIMEOUT"))
+        return entry
+
+    async def aget(self, resource, pk):
+        return self.count(resource, await self.cache.aget(self.key(resource, pk)))
+
+    async def aset(self, resource, pk, data, etag=None):
+        entry = self.entry(data, etag)
+        await self.cache.aset(self.key(resource, pk), entry, get_setting("TIMEOUT"))
+        return entry
+
+    def invalidate(self, resource, *pks):
+        # Drop the entries once the current transaction is committed
+        keys = [self.key(resource, pk) for pk in pks]
+        if keys:
+            transaction.on_commit(lambda: self.cache.delete_many(keys))
+
+    def stats(self):
+        # Get the hit and miss counters per resource
+        with self._lock:
+            counters = dict(self._counters)
+        resources = sorted({resource for resource, _ in counters})
+        return {
+            resource: {
+                "hits": counters.get((resource, "hits"), 0),
+                "misses": counters.get((resource, "misses"), 0),
+            }
+            for resource in resources
+        }
+
+
+# Shared response cache instance
+response_cache = ResponseCache()
+
+
+# Check whether the client already has the cached version
+def not_modified(request, entry):
+    return etag_matches(request, entry["etag"])
+
+
+# Decorator to serve a view method through the response cache
+def cached_response(resource, lookup, version=None):
+    """
+    Cache the 200 responses of a GET method under resource and the URL
+    keyword argument named by lookup, and answer If-None-Match with 304.
+    Given a RowVersion, the ETag is the row version, read with one query on
+    every request: If-None-Match is answered from it before the cache or the
+    view, and a cached entry is only served while its ETag is still the
+    current one. The invalidation of a save only reaches the cache of the
+    worker that made it unless the cache is shared, the version check keeps
+    the other workers from serving the old entry. Works on the sync methods
+    of DRF views and on the async methods of plain Django views returning
+    JSON.
+    """
+
+    def decorator(method):
+        if inspect.iscoroutinefunction(method):
+            return async_decorator(method)
+
+        @functools.wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            pk = kwargs[lookup]
+
+            # Read the row version before the data, so a concurrent save can
+            # only make the ETag older than the data
+            etag = version.get(pk) if version is not None else None
+
+            # Answer a conditional request from the row version alone
+            if etag is not None and etag_matches(request, etag):
+                return Response(
+                    status=status.HTTP_304_NOT_MODIFIED,
+                    headers={"ETag": etag},
+                )
+
+            # Call the view directly when the cache is off
+            if not get_setting("ENABLED"):
+                response = method(self, request, *args, **kwargs)
+                if etag is not None and response.status_code == status.HTTP_200_OK:
+                    response["ETag"] = etag
+                return response
+
+            # Get the cached entry or build it from the view
+            entry = response_cache.get(resource, pk)
+            if entry is not None and version is not None and entry["etag"] != etag:
+                entry = None
+            if entry is None:
+                response = method(self, request, *args, **kwargs)
+                if response.status_code != status.HTTP_200_OK:
+                    return response
+                entry = response_cache.set(resource, pk, response.data, etag)
+
+            # The client already has this version
+            if not_modified(request, entry):
+                return Response(
+                    status=status.HTTP_304_NOT_MODIFIED,
+                    headers={"ETag": entry["etag"]},
+                )
+
+            # Return the cached data
+            return Response(
+                entry["data"],
+                status=status.HTTP_200_OK,
+                headers={"ETag": entry["etag"]},
+            )
+
+        return wrapper
+
+    def async_decorator(method):
+        @functools.wraps(method)
+        async def wrapper(self, request, *args, **kwargs):
+            pk = kwargs[lookup]
+
+            # Read the row version before the data
+            etag = await version.aget(pk) if version is not None else None
+
+            # Answer a conditional request from the row version alone
+            if etag is not None and etag_matches(request, etag):
+                return HttpResponseNotModified(headers={"ETag": etag})
+
+            # Call the view directly when the cache is off
+            if not get_setting("ENABLED"):
+                response = await method(self, request, *args, **kwargs)
+                if etag is not None and response.status_code == status.HTTP_200_OK:
+                    response["ETag"] = etag
+                return response
+
+            # Get the cached entry or build it from the view
+            entry = await response_cache.aget(resource, pk)
+            if entry is not None and version is not None and entry["etag"] != etag:
+                entry = None
+            if entry is None:
+                response = await method(self, request, *args, **kwargs)
+                if response.status_code != status.HTTP_200_OK:
+                    return response
+                entry = await response_cache.aset(
+                    resource, pk, json.loads(response.content), etag
+                )
+
+            # The client already has this version
+            if not_modified(request, entry):
+                return HttpResponseNotModified(headers={"ETag": entry["etag"]})
+
+            # Return the cached data
+            return json_response(entry["data"], headers={"ETag": entry["etag"]})
+
+        return wrapper
+
+    return decorator
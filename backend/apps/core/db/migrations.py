@@ -0,0 +1,150 @@
+# Imports
+from django.db import NotSupportedError
+from django.db.migrations.operations import AddIndex, AlterField, RemoveIndex, RunSQL
+from django.db.models import Index
+
+
+# Refuse to run a concurrent operation inside a transaction
+def ensure_not_in_transaction(schema_editor):
+    if schema_editor.connection.in_atomic_block:
+        raise NotSupportedError(
+            "Indexes are built and dropped concurrently outside a transaction, "
+            "set atomic = False on the migration."
+        )
+
+
+# Migration operation adding an index without blocking the writes
+class AddIndexConcurrently(AddIndex):
+    """
+    AddIndex that runs CREATE INDEX CONCURRENTLY on PostgreSQL, so the table
+    keeps taking writes while the index is built, and a plain AddIndex on the
+    other databases. PostgreSQL cannot build an index concurrently inside a
+    transaction, so the migration must set atomic = False.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        if schema_editor.connection.vendor == "postgresql":
+            ensure_not_in_transaction(schema_editor)
+            schema_editor.add_index(model, self.index, concurrently=True)
+        else:
+            schema_editor.add_index(model, self.index)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        if schema_editor.connection.vendor == "postgresql":
+            ensure_not_in_transaction(schema_editor)
+            schema_editor.remove_index(model, self.index, concurrently=True)
+        else:
+            schema_editor.remove_index(model, self.index)
+
+    def describe(self):
+        return f"Concurrently create index {self.index.name} on {self.model_name}"
+
+
+# Migration operation removing an index without blocking the writes
+class RemoveIndexConcurrently(RemoveIndex):
+    """
+    RemoveIndex that runs DROP INDEX CONCURRENTLY on PostgreSQL and a plain
+    RemoveIndex on the other databases. The migration must set
+    atomic = False.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        index = from_state.models[app_label, self.model_name_lower].get_index_by_name(
+            self.name
+        )
+        if schema_editor.connection.vendor == "postgresql":
+            ensure_not_in_transaction(schema_editor)
+            schema_editor.remove_index(model, index, concurrently=True)
+        else:
+            schema_editor.remove_index(model, index)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        index = to_state.models[app_label, self.model_name_lower].get_index_by_name(
+            self.name
+        )
+        if schema_editor.connection.vendor == "postgresql":
+            ensure_not_in_transaction(schema_editor)
+            schema_editor.add_index(model, index, concurrently=True)
+        else:
+            schema_editor.add_index(model, index)
+
+    def describe(self):
+        return f"Concurrently remove index {self.name} from {self.model_name}"
+
+
+# Migration operation dropping the index of a field without blocking the writes
+class DropFieldIndexConcurrently(AlterField):
+    """
+    AlterField for a field whose db_index goes from True to False, when a
+    composite index now serves its queries. A plain AlterField drops and
+    recreates the foreign key constraint of the field, which checks the whole
+    table on PostgreSQL. This operation only drops the single column index, with
+    DROP INDEX CONCURRENTLY on PostgreSQL, so the migration must set
+    atomic = False.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        field = model._meta.get_field(self.name)
+        concurrently = schema_editor.connection.vendor == "postgresql"
+        if concurrently:
+            ensure_not_in_transaction(schema_editor)
+        for name in schema_editor._constraint_names(
+            model, [field.column], index=True, type_=Index.suffix
+        ):
+            if concurrently:
+                schema_editor.execute(
+                    schema_editor._delete_index_sql(model, name, concurrently=True)
+                )
+            else:
+                schema_editor.execute(schema_editor._delete_index_sql(model, name))
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        field = model._meta.get_field(self.name)
+        if schema_editor.connection.vendor == "postgresql":
+            ensure_not_in_transaction(schema_editor)
+            schema_editor.execute(
+                schema_editor._create_index_sql(
+                    model, fields=[field], concurrently=True
+                )
+            )
+        else:
+            schema_editor.execute(
+                schema_editor._create_index_sql(model, fields=[field])
+            )
+
+    def describe(self):
+        return f"Concurrently drop the index of {self.model_name}.{self.name}"
+
+
+# Migration operation running SQL on PostgreSQL only
+class RunSQLOnPostgres(RunSQL):
+    """
+    RunSQL skipped on every database but PostgreSQL, for the indexes and
+    extensions the other databases do not have.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
@@ -0,0 +1,358 @@
+# Imports
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+from django.db import connections
+
+
+# Get the logger
+logger = logging.getLogger(__name__)
+
+
+# Default settings of a pool, overridden by the POOL key of a database
+DEFAULTS = {
+    # Connections opened when the worker starts
+    "MIN_SIZE": 1,
+    # Connections open at the same time, in use or idle
+    "MAX_SIZE": 10,
+    # Seconds to wait for a free connection before giving up
+    "TIMEOUT": 10,
+    # Seconds after which a connection is closed and replaced
+    "MAX_LIFETIME": 3600,
+    # Seconds an idle connection is kept
+    "MAX_IDLE": 600,
+    # Seconds a connection may sit idle before it is checked again on reuse
+    "CHECK_AFTER": 5,
+}
+
+
+# Error raised when no connection is freed in time
+class PoolTimeout(Exception):
+    pass
+
+
+# Class holding a raw connection and its timestamps
+class PooledConnection:
+    __slots__ = ("raw", "created_at", "released_at", "needs_check")
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.created_at = self.released_at = time.monotonic()
+        self.needs_check = False
+
+
+# Class for a bounded pool of raw database connections
+class ConnectionPool:
+    """
+    Thread safe pool of DB-API connections for one database.
+
+    At most MAX_SIZE connections are open at once. Idle connections are
+    reused newest first, checked with SELECT 1 when they sat idle longer
+    than CHECK_AFTER or had an error, and replaced once they are older than
+    MAX_LIFETIME. A forked worker starts with an empty pool.
+    """
+
+    def __init__(self, alias, options, check, close):
+        self.alias = alias
+        self.options = {**DEFAULTS, **options}
+        self.check = check
+        self.close_raw = close
+        self.closed = False
+        self._cond = threading.Condition()
+        self._reset()
+
+    def _reset(self):
+        # Connections of the parent process are left alone after a fork
+        self._pid = os.getpid()
+        self._idle = deque()
+        self._in_use = {}
+        self._size = 0
+        self._waiting = 0
+        self._counters = dict.fromkeys(
+            ["created", "reconnects", "timeouts", "waits"], 0
+        )
+        self._wait_time = 0.0
+        self._wait_time_max = 0.0
+
+    def _expired(self, record, now):
+        return (
+            now - record.created_at > self.options["MAX_LIFETIME"]
+            or now - record.released_at > self.options["MAX_IDLE"]
+        )
+
+    def _discard(self, record):
+        # Close a connection outside the lock and free its slot
+        self.close_raw(record.raw)
+        with self._cond:
+            self._size -= 1
+            self._counters["reconnects"] += 1
+            self._cond.notify()
+
+    def acquire(self, connect):
+        """
+        Return an idle connection, or a new one from `connect()` while the
+        pool is below MAX_SIZE, waiting up to TIMEOUT seconds otherwise.
+        """
+
+        started = time.monotonic()
+        waited = False
+        while True:
+            record = None
+            with self._cond:
+                if self._pid != os.getpid():
+                    self._reset()
+
+                # Take the newest idle connection, or reserve a new slot
+                if self._idle:
+                    record = self._idle.pop()
+                elif self._size < self.options["MAX_SIZE"]:
+                    self._size += 1
+                else:
+                    remaining = self.options["TIMEOUT"] - (time.monotonic() - started)
+                    if remaining <= 0:
+                        self._counters["timeouts"] += 1
+                        raise PoolTimeout(
+                            f"No connection to the {self.alias!r} database was "
+                            f"freed within {self.options['TIMEOUT']}s"
+                        )
+                    waited = True
+                    self._waiting += 1
+                    self._cond.wait(remaining)
+                    self._waiting -= 1
+                    continue
+
+            # Open a new connection in the reserved slot
+            if record is None:
+                try:
+                    record = PooledConnection(connect())
+                except BaseException:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._counters["created"] += 1
+
+            # Replace an idle connection that is too old or does not answer
+            else:
+                now = time.monotonic()
+                if self._expired(record, now) or (
+                    (
+                        record.needs_check
+                        or now - record.released_at > self.options["CHECK_AFTER"]
+                    )
+                    and not self.check(record.raw)
+                ):
+                    self._discard(record)
+                    continue
+
+            # Hand the connection out
+            with self._cond:
+                self._in_use[id(record.raw)] = record
+                if waited:
+                    wait_time = time.monotonic() - started
+                    self._counters["waits"] += 1
+                    self._wait_time += wait_time
+                    self._wait_time_max = max(self._wait_time_max, wait_time)
+            return record.raw
+
+    def release(self, raw, reuse=True, check=False):
+        """
+        Give a connection back. It is closed instead of kept when `reuse` is
+        false, and checked before its next use when `check` is true.
+        """
+
+        with self._cond:
+            record = self._in_use.pop(id(raw), None)
+            keep = record is not None and reuse and not self.closed
+            if keep:
+                record.released_at = time.monotonic()
+                record.needs_check = check
+                self._idle.append(record)
+            elif record is not None:
+                self._size -= 1
+            self._cond.notify()
+
+        if not keep:
+            self.close_raw(raw)
+
+    def fill(self, connect):
+        """
+        Open connections until MIN_SIZE are idle or in use.
+        """
+
+        while True:
+            with self._cond:
+                if self._size >= min(
+                    self.options["MIN_SIZE"], self.options["MAX_SIZE"]
+                ):
+                    return
+                self._size += 1
+            try:
+                record = PooledConnection(connect())
+            except BaseException:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._counters["created"] += 1
+                self._idle.append(record)
+                self._cond.notify()
+
+    def close(self):
+        # Close the idle connections, those in use are closed on release
+        with self._cond:
+            self.closed = True
+            idle, self._idle = self._idle, deque()
+            self._size -= len(idle)
+        for record in idle:
+            self.close_raw(record.raw)
+
+    def stats(self):
+        with self._cond:
+            waits = self._counters["waits"]
+            return {
+                "max_size": self.options["MAX_SIZE"],
+                "size": self._size,
+                "in_use": len(self._in_use),
+                "idle": len(self._idle),
+                "waiting": self._waiting,
+                "connections_created": self._counters["created"],
+                "reconnects": self._counters["reconnects"],
+                "timeouts": self._counters["timeouts"],
+                "waits": waits,
+                "wait_time_avg_ms": (
+                    round(self._wait_time / waits * 1000, 3) if waits else 0.0
+                ),
+                "wait_time_max_ms": round(self._wait_time_max * 1000, 3),
+            }
+
+
+# Pools of this process by database alias and name
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+# Get the pool of a database connection, creating it on first use
+def get_pool(connection):
+    key = (connection.alias, connection.settings_dict["NAME"])
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None or pool.closed:
+            pool = _pools[key] = ConnectionPool(
+                connection.alias,
+                connection.settings_dict.get("POOL", {}),
+                check=connection.check_pooled_connection,
+                close=connection.close_pooled_connection,
+            )
+    return pool
+
+
+# Close a pool and forget it
+def close_pool(connection):
+    key = (connection.alias, connection.settings_dict["NAME"])
+    with _pools_lock:
+        pool = _pools.pop(key, None)
+    if pool is not None:
+        pool.close()
+
+
+# Get the stats of every pool of this process
+def pool_stats():
+    with _pools_lock:
+        pools = list(_pools.items())
+    return {alias: {"name": str(name), **pool.stats()} for (alias, name), pool in pools}
+
+
+# Open the minimum connections of every pooled database
+def warm_up():
+    """
+    Called when a worker starts so the first requests do not pay for the
+    connection setup. Failures are logged and left to the first request.
+    """
+
+    for alias in connections:
+        connection = connections[alias]
+        if not isinstance(connection, PooledDatabaseWrapperMixin):
+            continue
+        try:
+            connection.warm_up_pool()
+        except Exception:
+            logger.exception("Could not warm up the %r database pool", alias)
+
+
+# Mixin for database backends that take their connections from a pool
+class PooledDatabaseWrapperMixin:
+    """
+    Replaces opening and closing the DB-API connection with taking it from
+    and giving it back to the pool of the database. Everything Django does
+    on top of the raw connection (autocommit, time zone, CONN_MAX_AGE,
+    CONN_HEALTH_CHECKS) is unchanged.
+    """
+
+    @property
+    def pool(self):
+        return get_pool(self)
+
+    def get_new_connection(self, conn_params):
+        try:
+            return self.pool.acquire(
+                lambda: super(PooledDatabaseWrapperMixin, self).get_new_connection(
+                    conn_params
+                )
+            )
+        except PoolTimeout as error:
+            raise self.Database.OperationalError(str(error)) from error
+
+    def _close(self):
+        if self.connection is None:
+            return
+
+        # A connection left inside a transaction is not reused, one that had
+        # an error is checked before its next use
+        with self.wrap_database_errors:
+            self.pool.release(
+                self.connection,
+                reuse=self.autocommit and not self.in_atomic_block,
+                check=self.errors_occurred,
+            )
+
+    def warm_up_pool(self):
+        conn_params = self.get_connection_params()
+        self.pool.fill(
+            lambda: super(PooledDatabaseWrapperMixin, self).get_new_connection(
+                conn_params
+            )
+        )
+
+    @staticmethod
+    def check_pooled_connection(raw):
+        # Check a raw connection still answers
+        try:
+            cursor = raw.cursor()
+            try:
+                cursor.execute("SELECT 1")
+            finally:
+                cursor.close()
+        except Exception:
+            return False
+        return True
+
+    @staticmethod
+    def close_pooled_connection(raw):
+        try:
+            raw.close()
+        except Exception:
+            logger.debug("Could not close a pooled connection", exc_info=True)
+
+
+# Mixin for the creation class of the pooled backends
+class PooledDatabaseCreationMixin:
+    def destroy_test_db(self, *args, **kwargs):
+        # Close the pooled connections so the test database can be dropped
+        close_pool(self.connection)
+        return super().destroy_test_db(*args, **kwargs)
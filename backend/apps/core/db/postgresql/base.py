@@ -0,0 +1,19 @@
+# Imports
+from django.db.backends.postgresql.base import (
+    DatabaseWrapper as PostgreSQLDatabaseWrapper,
+)
+from django.db.backends.postgresql.creation import (
+    DatabaseCreation as PostgreSQLDatabaseCreation,
+)
+
+from ..pool import PooledDatabaseCreationMixin, PooledDatabaseWrapperMixin
+
+
+# Creation class closing the pool before the test database is dropped
+class DatabaseCreation(PooledDatabaseCreationMixin, PostgreSQLDatabaseCreation):
+    pass
+
+
+# PostgreSQL backend with pooled connections
+class DatabaseWrapper(PooledDatabaseWrapperMixin, PostgreSQLDatabaseWrapper):
+    creation_class = DatabaseCreation
@@ -0,0 +1,19 @@
+# Imports
+from django.db.backends.sqlite3.base import (
+    DatabaseWrapper as SQLiteDatabaseWrapper,
+)
+from django.db.backends.sqlite3.creation import (
+    DatabaseCreation as SQLiteDatabaseCreation,
+)
+
+from ..pool import PooledDatabaseCreationMixin, PooledDatabaseWrapperMixin
+
+
+# Creation class closing the pool before the test database is dropped
+class DatabaseCreation(PooledDatabaseCreationMixin, SQLiteDatabaseCreation):
+    pass
+
+
+# SQLite backend with pooled connections
+class DatabaseWrapper(PooledDatabaseWrapperMixin, SQLiteDatabaseWrapper):
+    creation_class = DatabaseCreation
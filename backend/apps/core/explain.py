@@ -0,0 +1,252 @@
+# Imports
+import datetime
+import json
+import re
+
+from django.db import connections, transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from backend.apps.catalog.models import Item
+from backend.apps.customers.search import trigram_queryset
+from backend.apps.orders.exports import BillExporter
+from backend.apps.orders.models import CheckoutBill, Order
+from backend.apps.orders.pagination import BillKeysetPagination
+from backend.apps.reports.models import (
+    DailyCustomerSales,
+    DailyEmployeeSales,
+    DailyItemSales,
+    DailySales,
+)
+
+from .models import IdempotencyKey, ThrottleBucket
+
+
+# Registered hot queries, by name
+HOT_QUERIES = {}
+
+
+# Decorator to register a query shape the API runs often
+def hot_query(name, vendors=None, ordered=False):
+    """
+    The decorated function takes the database alias and returns the queryset
+    to explain. `vendors` limits the query to some database vendors, and
+    `ordered` allows a whole index to be walked in order, for the queries
+    that stop after a page of rows.
+    """
+
+    def decorator(build):
+        HOT_QUERIES[name] = {"build": build, "vendors": vendors, "ordered": ordered}
+        return build
+
+    return decorator
+
+
+# Values the queries filter on, the plans do not depend on them
+TODAY = datetime.date(2024, 1, 31)
+MONTH_AGO = TODAY - datetime.timedelta(days=30)
+EMP_ID = "EMP0001"
+CUST_ID = "CUST0001"
+ITEM_ID = "ITEM0001"
+BILL_ID = "BILL0001"
+CREATED_AT = datetime.datetime(2024, 1, 31, 12, tzinfo=datetime.timezone.utc)
+
+
+# Bills of a page of the bill list
+def bill_page(bills, size=BillKeysetPagination.page_size):
+    return bills.order_by(*BillKeysetPagination.ordering)[: size + 1]
+
+
+@hot_query("bill_list", ordered=True)
+def bill_list(using):
+    return bill_page(CheckoutBill.objects.using(using))
+
+
+@hot_query("bill_list_cursor")
+def bill_list_cursor(using):
+    return bill_page(
+        BillKeysetPagination().after(
+            CheckoutBill.objects.using(using), TODAY, CREATED_AT, BILL_ID
+        )
+    )
+
+
+@hot_query("bill_list_dates")
+def bill_list_dates(using):
+    return bill_page(
+        CheckoutBill.objects.using(using).filter(bill_date__range=(MONTH_AGO, TODAY))
+    )
+
+
+@hot_query("bill_list_customer")
+def bill_list_customer(using):
+    return bill_page(CheckoutBill.objects.using(using).filter(cust_id=CUST_ID))
+
+
+@hot_query("bill_list_employee")
+def bill_list_employee(using):
+    return bill_page(CheckoutBill.objects.using(using).filter(emp_id=EMP_ID))
+
+
+@hot_query("bill_export_incremental")
+def bill_export_incremental(using):
+    since = datetime.datetime.combine(MONTH_AGO, datetime.time(), datetime.timezone.utc)
+    return BillExporter(since=since, using=using).get_queryset()
+
+
+@hot_query("rollup_rebuild_days")
+def rollup_rebuild_days(using):
+    return (
+        CheckoutBill.objects.using(using)
+        .filter(bill_date__range=(MONTH_AGO, TODAY))
+        .order_by()
+        .values("bill_date", "emp_id")
+        .annotate(bill_count=Count("pk"), revenue=Sum("total_price"))
+    )
+
+
+@hot_query("rollup_rebuild_items")
+def rollup_rebuild_items(using):
+    return (
+        CheckoutBill.orders.through.objects.using(using)
+        .filter(checkoutbill__bill_date__range=(MONTH_AGO, TODAY))
+        .order_by()
+        .values("checkoutbill__bill_date", "order__item_id")
+        .annotate(quantity=Sum("order__quantity"), revenue=Sum("order__total_price"))
+    )
+
+
+@hot_query("report_days")
+def report_days(using):
+    return DailySales.objects.using(using).filter(date__range=(MONTH_AGO, TODAY))
+
+
+@hot_query("report_employee")
+def report_employee(using):
+    return DailyEmployeeSales.objects.using(using).filter(
+        emp_id=EMP_ID, date__range=(MONTH_AGO, TODAY)
+    )
+
+
+@hot_query("report_customer")
+def report_customer(using):
+    return DailyCustomerSales.objects.using(using).filter(
+        cust_id=CUST_ID, date__range=(MONTH_AGO, TODAY)
+    )
+
+
+@hot_query("report_item")
+def report_item(using):
+    return DailyItemSales.objects.using(using).filter(
+        item_id=ITEM_ID, date__range=(MONTH_AGO, TODAY)
+    )
+
+
+@hot_query("report_items_of_day")
+def report_items_of_day(using):
+    return DailyItemSales.objects.using(using).filter(date=TODAY)
+
+
+@hot_query("customer_search", vendors={"postgresql"})
+def customer_search(using):
+    return trigram_queryset("asha patel", using)[:10]
+
+
+@hot_query("item_latest_price")
+def item_latest_price(using):
+    return (
+        Order.objects.using(using)
+        .filter(item_id=ITEM_ID)
+        .order_by("-order_date", "-order_id")
+        .values("unit_price")[:1]
+    )
+
+
+@hot_query("catalog_items")
+def catalog_items(using):
+    return Item.objects.using(using).filter(item_id__in=[ITEM_ID, "ITEM0002"])
+
+
+@hot_query("throttle_prune")
+def throttle_prune(using):
+    return ThrottleBucket.objects.using(using).filter(updated_at__lt=0.0)
+
+
+@hot_query("idempotency_prune")
+def idempotency_prune(using):
+    return IdempotencyKey.objects.using(using).filter(expires_at__lte=timezone.now())
+
+
+# Matches a table or index scan in the SQLite query plans
+SQLITE_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)(.*)$")
+
+
+# Class to explain the hot queries and find the full scans
+class PlanChecker:
+    """
+    Runs EXPLAIN on each hot query and reports the tables it reads in full,
+    with a sequential scan or by walking a whole index.
+
+    On PostgreSQL the query is explained with enable_seqscan off, so a
+    sequential scan left in the plan means no index can serve the query
+    rather than the table being small. An index scan without an index
+    condition reads the whole index. On SQLite every SCAN is a full read,
+    SEARCH being the bounded one.
+    """
+
+    def __init__(self, using):
+        self.using = using
+        self.connection = connections[using]
+
+    def supports(self, query):
+        vendors = query["vendors"]
+        return vendors is None or self.connection.vendor in vendors
+
+    def explain(self, query):
+        """
+        Return (plan text, tables read in full) for a registered query.
+        """
+
+        queryset = query["build"](self.using)
+        vendor = self.connection.vendor
+        if vendor == "postgresql":
+            with transaction.atomic(using=self.using):
+                with self.connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL enable_seqscan = off")
+                plan = json.loads(queryset.explain(format="json"))
+            scans = self.postgresql_scans(plan, query["ordered"])
+            return json.dumps(plan, indent=2), sorted(scans)
+        if vendor == "sqlite":
+            plan = queryset.explain()
+            return plan, sorted(self.sqlite_scans(plan, query["ordered"]))
+        raise NotImplementedError(f"Plans of {vendor} are not checked")
+
+    def postgresql_scans(self, plan, ordered):
+        scans = set()
+        nodes = [entry["Plan"] for entry in plan]
+        while nodes:
+            node = nodes.pop()
+            if node["Node Type"] == "Seq Scan":
+                scans.add(node["Relation Name"])
+            elif (
+                node["Node Type"] in ("Index Scan", "Index Only Scan")
+                and "Index Cond" not in node
+                and not ordered
+            ):
+                scans.add(node["Relation Name"])
+            nodes.extend(node.get("Plans", []))
+        return scans
+
+    def sqlite_scans(self, plan, ordered):
+        tables = set(self.connection.introspection.table_names())
+        scans = set()
+        for line in plan.splitlines():
+            # Lines are "id parent notused detail"
+            detail = line.split(" ", 3)[-1].strip()
+            match = SQLITE_SCAN.match(detail)
+            if not match or match.group(1) not in tables:
+                continue
+            if ordered and "INDEX" in match.group(2):
+                continue
+            scans.add(match.group(1))
+        return scans
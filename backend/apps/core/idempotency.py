@@ -0,0 +1,159 @@
+# Imports
+import datetime
+import functools
+import hashlib
+import json
+import threading
+
+from django.conf import settings
+from django.db import IntegrityError, router, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from .models import IdempotencyKey
+
+
+# Default settings for the idempotency keys
+DEFAULTS = {
+    # Seconds a key keeps its response
+    "TTL": 86400,
+    # Longest key accepted from the clients
+    "MAX_KEY_LENGTH": 128,
+    # Keys stored by a process between two deletions of the expired ones
+    "PRUNE_EVERY": 1000,
+}
+
+
+# Name of the request header
+HEADER = "Idempotency-Key"
+
+
+# Read an idempotency setting
+def get_setting(name):
+    return getattr(settings, "IDEMPOTENCY", {}).get(name, DEFAULTS[name])
+
+
+# Hash the data of a request the same way whatever the key order
+def request_hash(data):
+    content = json.dumps(data, cls=JSONEncoder, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+# Class to store the responses of the requests sent with an idempotency key
+class IdempotencyStore:
+    """
+    Stores each key in the IdempotencyKey table in the same transaction as
+    the work of its first request. A concurrent request with the same key
+    blocks on the primary key until that transaction ends, then replays the
+    stored response, or does the work itself if the first one rolled back.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._claims = 0
+
+    def claim(self, key, digest, using):
+        """
+        Return (record, created) for a key, the record being locked until the
+        current transaction ends.
+        """
+
+        keys = IdempotencyKey.objects.using(using)
+        now = timezone.now()
+        expires_at = now + datetime.timedelta(seconds=get_setting("TTL"))
+
+        # Delete the expired keys now and then
+        with self._lock:
+            self._claims += 1
+            prune = self._claims % get_setting("PRUNE_EVERY") == 0
+        if prune:
+            keys.filter(expires_at__lte=now).delete()
+
+        while True:
+            try:
+                with transaction.atomic(using=using):
+                    return (
+                        keys.create(
+                            key=key, request_hash=digest, expires_at=expires_at
+                        ),
+                        True,
+                    )
+            except IntegrityError:
+                pass
+
+            # The key is taken, reuse it unless it expired
+            record = keys.select_for_update().filter(key=key).first()
+            if record is None:
+                continue
+            if record.expires_at > now:
+                return record, False
+            record.delete()
+
+    def save(self, record, response, using):
+        # Keep the response data as plain JSON
+        record.status_code = response.status_code
+        record.response_body = json.loads(json.dumps(response.data, cls=JSONEncoder))
+        record.save(using=using, update_fields=["status_code", "response_body"])
+
+
+# Shared idempotency store
+idempotency_store = IdempotencyStore()
+
+
+# Decorator to make a create method of a DRF view idempotent
+def idempotent(scope):
+    """
+    Honour the Idempotency-Key header on a POST method. The first request
+    with a key runs the method and stores its response; a retry with the same
+    key and data gets that response back (with Idempotent-Replayed: true)
+    without running the method, and the same key with other data gets 422.
+    Responses with a 5xx status are not stored so they can be retried.
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            # Requests without a key are not tracked
+            client_key = request.headers.get(HEADER)
+            if not client_key:
+                return method(self, request, *args, **kwargs)
+            if len(client_key) > get_setting("MAX_KEY_LENGTH"):
+                return Response(
+                    {"error": f"{HEADER} is too long"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            # Keys are separate per endpoint and per user
+            key = f"{scope}:{request.user.pk or ''}:{client_key}"
+            digest = request_hash(request.data)
+            using = router.db_for_write(IdempotencyKey)
+
+            with transaction.atomic(using=using):
+                record, created = idempotency_store.claim(key, digest, using)
+
+                # Replay the stored response
+                if not created:
+                    if record.request_hash != digest:
+                        return Response(
+                            {"error": f"{HEADER} was used for another request"},
+                            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                        )
+                    return Response(
+                        record.response_body,
+                        status=record.status_code,
+                        headers={"Idempotent-Replayed": "true"},
+                    )
+
+                # Do the work and store its response with the key
+                response = method(self, request, *args, **kwargs)
+                if response.status_code >= 500:
+                    transaction.set_rollback(True, using=using)
+                    return response
+                idempotency_store.save(record, response, using)
+                return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,223 @@
+# Imports
+import functools
+import os
+import threading
+from collections import deque
+
+from django.conf import settings
+from django.db import IntegrityError, connections, router, transaction
+from django.db.models import BigIntegerField, F, Max
+from django.db.models.functions import Cast, Substr
+
+from .models import IDSequence
+
+
+# Default settings for the ID allocator
+DEFAULTS = {
+    # Numbers reserved per database round trip
+    "BLOCK_SIZE": 20,
+    # Minimum number of digits after the prefix (ORD0001)
+    "WIDTH": 4,
+}
+
+
+# Read an ID allocator setting
+def get_setting(name):
+    return getattr(settings, "ID_ALLOCATOR", {}).get(name, DEFAULTS[name])
+
+
+# Format a number as an ID for the given prefix
+def format_id(prefix, number, width=None):
+    if width is None:
+        width = get_setting("WIDTH")
+    return f"{prefix}{number:0{width}d}"
+
+
+# Name of the native sequence of a prefix
+def sequence_name(prefix):
+    return f"core_idseq_{prefix.lower()}"
+
+
+# Class to allocate string primary keys
+class IDAllocator:
+    """
+    Hands out primary keys of the form <prefix><number> (ORD0001, CUST0042).
+
+    Numbers come from a per-prefix sequence: a native sequence on PostgreSQL
+    and the IDSequence table everywhere else. Each database round trip
+    reserves a whole block of numbers which is then served from memory, so
+    most inserts do not need an extra query. The next number never depends on
+    how the existing keys sort.
+
+    The IDSequence update is part of the caller's transaction, so a block
+    reserved inside one is only kept in memory once it commits: after a
+    rollback the row is back to its old value and the numbers must not be
+    handed out again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        # Blocks are per process, a forked worker must not reuse its parent's
+        self._pid = os.getpid()
+        self._blocks = {}
+        self._native_ready = set()
+
+    def allocate(self, model, count=1, using=None):
+        """
+        Return a list of `count` new IDs for the given model.
+        """
+
+        # Get the prefix and database alias
+        prefix = model.id_prefix
+        using = using or router.db_for_write(model)
+
+        with self._lock:
+            # Drop the blocks inherited from a parent process
+            if self._pid != os.getpid():
+                self._reset()
+
+            # Get the numbers reserved for this prefix
+            block = self._blocks.setdefault((using, prefix), deque())
+
+            # Reserve everything that is missing in a single round trip
+            if len(block) < count:
+                needed = count - len(block)
+                reserved = list(
+                    self._reserve(
+                        model, prefix, using, needed + get_setting("BLOCK_SIZE")
+                    )
+                )
+                block.extend(reserved[:needed])
+
+                # A table reservation made inside a transaction is undone
+                # with it, keep the spare numbers only once it commits
+                if self._transactional(using):
+                    transaction.on_commit(
+                        functools.partial(
+                            self._keep, self._pid, using, prefix, reserved[needed:]
+                        ),
+                        using=using,
+                    )
+                else:
+                    block.extend(reserved[needed:])
+
+            # Take the numbers from the block
+            numbers = [block.popleft() for _ in range(count)]
+
+        width = get_setting("WIDTH")
+        return [format_id(prefix, number, width) for number in numbers]
+
+    def _transactional(self, using):
+        # Native sequences are not rolled back, the IDSequence row is
+        connection = connections[using]
+        return connection.vendor != "postgresql" and connection.in_atomic_block
+
+    def _keep(self, pid, using, prefix, numbers):
+        # Add the spare numbers of a committed reservation to the block
+        with self._lock:
+            if self._pid == pid:
+                self._blocks.setdefault((using, prefix), deque()).extend(numbers)
+
+    def _reserve(self, model, prefix, using, count):
+        # Use native sequences where the database has them
+        if connections[using].vendor == "postgresql":
+            return self._reserve_native(model, prefix, using, count)
+        return self._reserve_table(model, prefix, using, count)
+
+    def _reserve_native(self, model, prefix, using, count):
+        # Sequences are not transactional, so concurrent callers never wait
+        connection = connections[using]
+        name = connection.ops.quote_name(sequence_name(prefix))
+
+        # Create the sequence the first time the prefix is used, a sequence
+        # created inside the caller's transaction is gone again if it rolls
+        # back, so the prefix is only marked ready once it commits
+        if (using, prefix) not in self._native_ready:
+            created = self.create_sequence(model, prefix, using)
+            if created and connection.in_atomic_block:
+                transaction.on_commit(
+                    functools.partial(self._mark_ready, self._pid, using, prefix),
+                    using=using,
+                )
+            else:
+                self._native_ready.add((using, prefix))
+
+        # Fetch the whole block at once
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT nextval('{name}') FROM generate_series(1, %s)", [count]
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def _mark_ready(self, pid, using, prefix):
+        with self._lock:
+            if self._pid == pid:
+                self._native_ready.add((using, prefix))
+
+    def create_sequence(self, model, prefix, using):
+        """
+        Create the native sequence of a prefix, continuing after the model's
+        existing keys. Return whether it had to be created.
+        """
+
+        connection = connections[using]
+        name = connection.ops.quote_name(sequence_name(prefix))
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT to_regclass(%s)", [name])
+            if cursor.fetchone()[0] is not None:
+                return False
+            start = self._current_max(model, prefix, using) + 1
+            cursor.execute(f"CREATE SEQUENCE IF NOT EXISTS {name} START WITH {start}")
+        return True
+
+    def _reserve_table(self, model, prefix, using, count):
+        sequences = IDSequence.objects.using(using)
+
+        while True:
+            with transaction.atomic(using=using):
+                # The update locks the row until the block is read back
+                if sequences.filter(prefix=prefix).update(
+                    last_value=F("last_value") + count
+                ):
+                    last = sequences.values_list("last_value", flat=True).get(
+                        prefix=prefix
+                    )
+                    return range(last - count + 1, last + 1)
+
+            # First use of the prefix, continue from the existing keys
+            start = self._current_max(model, prefix, using)
+            try:
+                with transaction.atomic(using=using):
+                    sequences.create(prefix=prefix, last_value=start)
+
+            # Another worker created the row first
+            except IntegrityError:
+                pass
+
+    def _current_max(self, model, prefix, using):
+        # Highest number already used by the model's keys
+        pk_name = model._meta.pk.attname
+        result = (
+            model._default_manager.using(using)
+            .filter(**{f"{pk_name}__startswith": prefix})
+            .annotate(number=Cast(Substr(pk_name, len(prefix) + 1), BigIntegerField()))
+            .aggregate(last=Max("number"))
+        )
+        return result["last"] or 0
+
+
+# Shared allocator instance
+allocator = IDAllocator()
+
+
+# Allocate a single ID for the model
+def next_id(model, using=None):
+    return allocator.allocate(model, 1, using=using)[0]
+
+
+# Allocate several IDs for the model in one go
+def allocate_ids(model, count, using=None):
+    return allocator.allocate(model, count, using=using)
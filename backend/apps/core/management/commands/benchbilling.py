@@ -0,0 +1,150 @@
+# Imports
+import json
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+
+from backend.apps.core.bench import (
+    SCENARIOS,
+    Dataset,
+    Runner,
+    find_regressions,
+    url_names,
+)
+
+
+# Command to benchmark the API endpoints in process
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database and drive every API endpoint through "
+        "the Django test client. Prints requests/s, latency percentiles, "
+        "queries and allocations per endpoint as JSON, and fails when the "
+        "results regress past --threshold against a --baseline file."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--customers", type=int, default=1000)
+        parser.add_argument("--employees", type=int, default=5)
+        parser.add_argument("--bills", type=int, default=2000)
+        parser.add_argument("--lines", type=int, default=3, help="Lines per bill")
+        parser.add_argument(
+            "--requests", type=int, default=100, help="Timed requests per endpoint"
+        )
+        parser.add_argument(
+            "--warmup", type=int, default=5, help="Untimed requests per endpoint"
+        )
+        parser.add_argument(
+            "--alloc-requests",
+            type=int,
+            default=10,
+            help="Requests per endpoint traced for allocations",
+        )
+        parser.add_argument(
+            "--endpoint",
+            action="append",
+            dest="endpoints",
+            metavar="URL_NAME",
+            help="Only run this endpoint, can be repeated",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed")
+        parser.add_argument("--output", help="Write the JSON results to this file")
+        parser.add_argument("--baseline", help="JSON results to compare against")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.25,
+            help="Allowed growth of p95 latency and allocations (0.25 is 25%%)",
+        )
+        parser.add_argument(
+            "--throttle",
+            action="store_true",
+            help="Keep the throttles on, most endpoints then answer 429 quickly",
+        )
+        parser.add_argument(
+            "--save-baseline",
+            action="store_true",
+            help="Write the results to --baseline instead of comparing",
+        )
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1:
+            raise CommandError("--requests must be at least 1")
+        if options["save_baseline"] and not options["baseline"]:
+            raise CommandError("--save-baseline needs --baseline")
+
+        # Pick the endpoints
+        names = sorted(options["endpoints"] or SCENARIOS)
+        unknown = set(names) - set(SCENARIOS)
+        if unknown:
+            raise CommandError(f"Unknown endpoints: {', '.join(sorted(unknown))}")
+
+        # The benchmark sends far more requests than the rates allow
+        throttle = dict(getattr(settings, "THROTTLE", {}))
+        throttle["ENABLED"] = options["throttle"]
+
+        # Run against a throwaway test database
+        setup_test_environment()
+        throttling = override_settings(THROTTLE=throttle)
+        throttling.enable()
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        try:
+            dataset = Dataset(
+                options["customers"],
+                options["employees"],
+                options["bills"],
+                options["lines"],
+                seed=options["seed"],
+            )
+            dataset.seed()
+            runner = Runner(
+                dataset,
+                options["requests"],
+                options["warmup"],
+                options["alloc_requests"],
+            )
+            results = {}
+            for name in names:
+                self.stderr.write(f"Running {name}")
+                results[name] = runner.run(name)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            throttling.disable()
+            teardown_test_environment()
+
+        report = {
+            "dataset": dataset.sizes,
+            "endpoints": results,
+            "not_benchmarked": sorted(url_names() - set(SCENARIOS)),
+        }
+
+        # Write the results
+        content = json.dumps(report, indent=2, sort_keys=True) + "\n"
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                file.write(content)
+        else:
+            sys.stdout.write(content)
+
+        # Save or compare the baseline
+        if options["save_baseline"]:
+            with open(options["baseline"], "w", encoding="utf-8") as file:
+                file.write(content)
+            return
+        if options["baseline"]:
+            with open(options["baseline"], encoding="utf-8") as file:
+                baseline = json.load(file)["endpoints"]
+            regressions = find_regressions(results, baseline, options["threshold"])
+            if regressions:
+                raise CommandError(
+                    "Regressions against the baseline:\n" + "\n".join(regressions)
+                )
+            self.stderr.write("No regressions against the baseline")
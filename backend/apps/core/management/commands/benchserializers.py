@@ -0,0 +1,152 @@
+# Imports
+import json
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from backend.apps.core.bench import Dataset
+from backend.apps.core.responses import renderer
+from backend.apps.customers.models import Customer
+from backend.apps.customers.serializers import CustomerSearchSerializer, customer_values
+from backend.apps.employees.models import Employee
+from backend.apps.employees.serializers import EmployeeSearchSerializer, employee_values
+from backend.apps.orders.models import CheckoutBill
+from backend.apps.orders.serializers import CheckoutBillSerializer, bill_values
+
+
+# Command to benchmark the values() serializers against the DRF ones
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database with one bill of --lines lines and "
+        "serialize the bill, an employee and a customer with the DRF "
+        "serializers and with the values() serializers the views use. Prints "
+        "the time to serialize loaded rows and the time of the whole fetch, "
+        "serialize and render as JSON. Fails when the outputs differ by a "
+        "byte or the bill is serialized less than --min-speedup times faster."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lines", type=int, default=1000, help="Lines of the bill")
+        parser.add_argument(
+            "--repeat", type=int, default=50, help="Timed runs per serializer"
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed")
+        parser.add_argument(
+            "--min-speedup",
+            type=float,
+            default=5.0,
+            help="Required speedup of the values() serializer on the bill",
+        )
+        parser.add_argument("--output", help="Write the JSON results to this file")
+
+    def handle(self, *args, **options):
+        if options["lines"] < 1 or options["repeat"] < 1:
+            raise CommandError("--lines and --repeat must be at least 1")
+
+        # Run against a throwaway test database
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        try:
+            dataset = Dataset(1, 1, 1, options["lines"], seed=options["seed"])
+            dataset.seed()
+
+            # The DRF serializer, how its views load the object, and the
+            # values() serializer of each case
+            cases = {
+                "bill": (
+                    CheckoutBillSerializer,
+                    CheckoutBill.objects.filter(
+                        bill_id=dataset.bills[0]
+                    ).prefetch_related("orders"),
+                    bill_values,
+                ),
+                "employee": (
+                    EmployeeSearchSerializer,
+                    Employee.objects.filter(
+                        emp_id=dataset.employees[0].emp_id
+                    ).select_related("user"),
+                    employee_values,
+                ),
+                "customer": (
+                    CustomerSearchSerializer,
+                    Customer.objects.filter(cust_id=dataset.customers[0]),
+                    customer_values,
+                ),
+            }
+            results, mismatches = {}, []
+            for name, case in cases.items():
+                results[name] = self.run(*case, options["repeat"])
+                if not results[name].pop("identical"):
+                    mismatches.append(name)
+                self.stderr.write(
+                    f"{name}: {results[name]['serialize_speedup']}x to serialize, "
+                    f"{results[name]['request_speedup']}x with the query"
+                )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        report = {"lines": options["lines"], "serializers": results}
+
+        # Write the results
+        content = json.dumps(report, indent=2, sort_keys=True) + "\n"
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                file.write(content)
+        else:
+            sys.stdout.write(content)
+
+        if mismatches:
+            raise CommandError(
+                "The values() serializers render other JSON for: "
+                + ", ".join(mismatches)
+            )
+        speedup = results["bill"]["serialize_speedup"]
+        if speedup < options["min_speedup"]:
+            raise CommandError(
+                f"The bill is serialized {speedup} times faster, less than "
+                f"--min-speedup {options['min_speedup']}"
+            )
+
+    def run(self, serializer_class, queryset, values, repeat):
+        # Load the object and the rows once for the serialize timings
+        instances = list(queryset.all())
+        rows = list(values.queryset(queryset))
+        children = values.fetch(rows)
+
+        def drf_request():
+            return renderer.render(
+                serializer_class(list(queryset.all()), many=True).data
+            )
+
+        def values_request():
+            return renderer.render(values.serialize(values.queryset(queryset)))
+
+        drf_ms = self.best(lambda: serializer_class(instances, many=True).data, repeat)
+        values_ms = self.best(lambda: values.assemble(rows, children), repeat)
+        drf_request_ms = self.best(drf_request, repeat)
+        values_request_ms = self.best(values_request, repeat)
+        return {
+            "identical": drf_request() == values_request(),
+            "drf_serialize_ms": round(drf_ms, 3),
+            "values_serialize_ms": round(values_ms, 3),
+            "serialize_speedup": round(drf_ms / values_ms, 2),
+            "drf_request_ms": round(drf_request_ms, 3),
+            "values_request_ms": round(values_request_ms, 3),
+            "request_speedup": round(drf_request_ms / values_request_ms, 2),
+        }
+
+    def best(self, function, repeat):
+        # Fastest of the runs in ms
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            function()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best * 1000
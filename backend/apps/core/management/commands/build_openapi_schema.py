@@ -0,0 +1,31 @@
+# Imports
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from backend.apps.core.schema import SCHEMA_DIR, SCHEMA_FILES, render_schema
+
+
+# Command to write the OpenAPI schema to static files
+class Command(BaseCommand):
+    help = (
+        "Render the OpenAPI schema of every endpoint to JSON and YAML files in "
+        "the static files of the core app. Run it before collectstatic, which "
+        "stores them under content hashed names for swagger.json/ to redirect to."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output-dir",
+            type=Path,
+            default=SCHEMA_DIR,
+            help="Directory the openapi/ files are written to",
+        )
+
+    def handle(self, *args, **options):
+        for format, (name, _, _) in SCHEMA_FILES.items():
+            path = options["output_dir"] / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            content = render_schema(format)
+            path.write_bytes(content)
+            self.stdout.write(f"Wrote {path} ({len(content)} bytes)")
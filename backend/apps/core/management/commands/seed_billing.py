@@ -0,0 +1,123 @@
+# Imports
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from backend.apps.core.seeding import PASSWORD, BillingSeeder
+from backend.apps.reports.rollups import rebuild
+
+
+# Command to generate synthetic billing data
+class Command(BaseCommand):
+    help = (
+        "Generate synthetic employees, customers, bills and order lines for "
+        "scale testing. Rows are written in chunks with COPY on PostgreSQL and "
+        "executemany() elsewhere, with IDs reserved up front. Customers and "
+        "items are drawn from Zipf-like distributions, set the skew to 0 for "
+        "uniform draws. SQLite durability and foreign key checks are relaxed "
+        "and the secondary indexes are rebuilt after loading, so seed a "
+        "database you can recreate. Seeded employees log in with "
+        f"{PASSWORD!r}."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--employees", type=int, default=0)
+        parser.add_argument("--customers", type=int, default=0)
+        parser.add_argument("--bills", type=int, default=0)
+        parser.add_argument(
+            "--lines-min", type=int, default=1, help="Fewest order lines per bill"
+        )
+        parser.add_argument(
+            "--lines-max", type=int, default=5, help="Most order lines per bill"
+        )
+        parser.add_argument(
+            "--items", type=int, default=1000, help="Number of distinct items"
+        )
+        parser.add_argument(
+            "--item-skew",
+            type=float,
+            default=1.1,
+            help="Zipf exponent of the item popularity",
+        )
+        parser.add_argument(
+            "--customer-skew",
+            type=float,
+            default=0.8,
+            help="Zipf exponent of the bills per customer",
+        )
+        parser.add_argument(
+            "--days", type=int, default=365, help="Days the bills are spread over"
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=10000,
+            help="Rows generated per transaction",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed")
+        parser.add_argument(
+            "--skip-rollups",
+            action="store_true",
+            help="Do not rebuild the sales rollups of the seeded days",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database to seed",
+        )
+
+    def progress(self, table, rows):
+        # Show the rows written so far on one line
+        self.stderr.write(f"\r{table}: {rows}", ending="")
+
+    def handle(self, *args, **options):
+        for name in ("employees", "customers", "bills", "items"):
+            if options[name] < 0:
+                raise CommandError(f"--{name} cannot be negative")
+        if not 1 <= options["lines_min"] <= options["lines_max"]:
+            raise CommandError("Need 1 <= --lines-min <= --lines-max")
+        if options["days"] < 1 or options["chunk_size"] < 1 or options["items"] < 1:
+            raise CommandError("--days, --chunk-size and --items must be at least 1")
+
+        seeder = BillingSeeder(
+            customers=options["customers"],
+            employees=options["employees"],
+            bills=options["bills"],
+            lines=(options["lines_min"], options["lines_max"]),
+            items=options["items"],
+            item_skew=options["item_skew"],
+            customer_skew=options["customer_skew"],
+            days=options["days"],
+            chunk_size=options["chunk_size"],
+            seed=options["seed"],
+            using=options["database"],
+            progress=self.progress if self.stderr.isatty() else None,
+        )
+
+        # Write the rows
+        started = time.perf_counter()
+        try:
+            rows = seeder.run()
+        except ValueError as error:
+            raise CommandError(str(error))
+        elapsed = time.perf_counter() - started
+        if self.stderr.isatty():
+            self.stderr.write("")
+
+        # Report the throughput
+        total = sum(rows.values())
+        for table, count in sorted(rows.items()):
+            self.stdout.write(f"{table}: {count} rows")
+        self.stdout.write(
+            f"Wrote {total} rows in {elapsed:.2f}s "
+            f"({total / elapsed if elapsed else 0:,.0f} rows/s)"
+        )
+
+        # Bring the sales rollups of the seeded days up to date
+        if seeder.date_range and not options["skip_rollups"]:
+            started = time.perf_counter()
+            rebuild(*seeder.date_range, using=options["database"])
+            self.stdout.write(
+                f"Rebuilt the rollups in {time.perf_counter() - started:.2f}s"
+            )
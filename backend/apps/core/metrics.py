@@ -0,0 +1,195 @@
+# Imports
+import threading
+from bisect import bisect_left
+
+from django.conf import settings
+
+
+# Default settings for the performance instrumentation
+DEFAULTS = {
+    # Turn the instrumentation off without touching the middleware list
+    "ENABLED": True,
+    # Share of the requests that are measured, from 0 to 1
+    "SAMPLE_RATE": 1.0,
+    # Queries slower than this many milliseconds are logged
+    "SLOW_QUERY_MS": 200,
+    # Upper bounds of the latency histogram buckets in seconds
+    "BUCKETS": (
+        0.001,
+        0.0025,
+        0.005,
+        0.0075,
+        0.01,
+        0.015,
+        0.02,
+        0.03,
+        0.05,
+        0.075,
+        0.1,
+        0.15,
+        0.25,
+        0.5,
+        0.75,
+        1.0,
+        2.5,
+        5.0,
+        10.0,
+    ),
+}
+
+
+# Quantiles reported for every histogram
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+# Read a performance setting
+def get_setting(name):
+    return getattr(settings, "PERFORMANCE", {}).get(name, DEFAULTS[name])
+
+
+# Class for a latency histogram with fixed buckets
+class Histogram:
+    """
+    Cumulative bucket counts in the Prometheus layout: counts[i] is the
+    number of observations <= buckets[i], the last count covers +Inf.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total = 0
+        for count in self.counts:
+            total += count
+            yield total
+
+    def quantile(self, q):
+        """
+        Estimate a quantile by linear interpolation inside its bucket, the
+        way PromQL histogram_quantile() does.
+        """
+
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        lower = 0.0
+        previous = 0
+        for index, total in enumerate(self.cumulative()):
+            if total >= rank:
+                # Observations above the last bucket report its bound
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                upper = self.buckets[index]
+                in_bucket = total - previous
+                return lower + (upper - lower) * (rank - previous) / in_bucket
+            lower = self.buckets[index]
+            previous = total
+        return self.buckets[-1]
+
+
+# Class for the request metrics of one URL name
+class ViewMetrics:
+    def __init__(self, buckets):
+        self.duration = Histogram(buckets)
+        self.db_duration = Histogram(buckets)
+        self.queries = 0
+        self.slow_queries = 0
+
+
+# Class collecting the request metrics of this process
+class MetricsRegistry:
+    """
+    Per URL name wall time and database time histograms, query counts and
+    slow query counts, kept in memory for this process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+
+    def observe(self, view, duration, db_duration, queries, slow_queries):
+        with self._lock:
+            metrics = self._views.get(view)
+            if metrics is None:
+                metrics = self._views[view] = ViewMetrics(get_setting("BUCKETS"))
+            metrics.duration.observe(duration)
+            metrics.db_duration.observe(db_duration)
+            metrics.queries += queries
+            metrics.slow_queries += slow_queries
+
+    def reset(self):
+        with self._lock:
+            self._views = {}
+
+    def prometheus(self):
+        """
+        Render the metrics in the Prometheus text exposition format.
+        """
+
+        lines = []
+        with self._lock:
+            views = sorted(self._views.items())
+
+            # Latency histograms
+            for name, attribute, help_text in (
+                (
+                    "billing_request_duration_seconds",
+                    "duration",
+                    "Wall time of the requests",
+                ),
+                (
+                    "billing_request_db_duration_seconds",
+                    "db_duration",
+                    "Time spent in database queries per request",
+                ),
+            ):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} histogram")
+                for view, metrics in views:
+                    histogram = getattr(metrics, attribute)
+                    bounds = [repr(float(bound)) for bound in histogram.buckets]
+                    for bound, total in zip(bounds + ["+Inf"], histogram.cumulative()):
+                        lines.append(
+                            f'{name}_bucket{{view="{view}",le="{bound}"}} {total}'
+                        )
+                    lines.append(f'{name}_sum{{view="{view}"}} {histogram.sum!r}')
+                    lines.append(f'{name}_count{{view="{view}"}} {histogram.count}')
+
+            # Quantiles estimated from the wall time histograms
+            name = "billing_request_duration_quantile_seconds"
+            lines.append(f"# HELP {name} Estimated quantiles of the request wall time")
+            lines.append(f"# TYPE {name} gauge")
+            for view, metrics in views:
+                for q in QUANTILES:
+                    value = metrics.duration.quantile(q)
+                    lines.append(f'{name}{{view="{view}",quantile="{q}"}} {value!r}')
+
+            # Query counters
+            for name, attribute, help_text in (
+                ("billing_request_queries_total", "queries", "Database queries run"),
+                (
+                    "billing_request_slow_queries_total",
+                    "slow_queries",
+                    "Database queries slower than the slow query threshold",
+                ),
+            ):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} counter")
+                for view, metrics in views:
+                    lines.append(
+                        f'{name}{{view="{view}"}} {getattr(metrics, attribute)}'
+                    )
+
+        return "\n".join(lines) + "\n"
+
+
+# Shared registry instance
+metrics_registry = MetricsRegistry()
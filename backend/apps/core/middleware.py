@@ -0,0 +1,159 @@
+# Imports
+import logging
+import math
+import random
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.db import connections
+
+from .metrics import get_setting, metrics_registry
+
+
+# Get the logger
+logger = logging.getLogger(__name__)
+
+
+# Class to time the queries run during a request
+class QueryTimer:
+    def __init__(self, path, slow_query_ms):
+        self.path = path
+        self.slow_query = slow_query_ms / 1000
+        self.count = 0
+        self.slow_count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.count += 1
+            self.duration += duration
+            if duration >= self.slow_query:
+                self.slow_count += 1
+                logger.warning(
+                    "Slow query (%.1f ms) in %s on %s: %s",
+                    duration * 1000,
+                    self.path,
+                    context["connection"].alias,
+                    sql,
+                )
+
+
+# Middleware to measure the requests per resolved URL name
+class PerformanceMiddleware:
+    """
+    Records the wall time, database time and query count of the sampled
+    requests under their URL name, logs slow queries and adds a
+    Server-Timing header. Requests that are not sampled go straight through.
+    Runs in sync and async mode.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = get_setting("ENABLED")
+        self.sample_rate = get_setting("SAMPLE_RATE")
+        self.slow_query_ms = get_setting("SLOW_QUERY_MS")
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def sampled(self):
+        return self.enabled and (
+            self.sample_rate >= 1 or random.random() < self.sample_rate
+        )
+
+    def wrap_queries(self, stack, timer):
+        # Time the queries on every database of the current thread
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(timer))
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        # Skip the requests that are not sampled
+        if not self.sampled():
+            return self.get_response(request)
+
+        # Time the request and its queries
+        timer = QueryTimer(request.path, self.slow_query_ms)
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            self.wrap_queries(stack, timer)
+            response = self.get_response(request)
+        return self.record(request, response, time.perf_counter() - started, timer)
+
+    async def __acall__(self, request):
+        # Skip the requests that are not sampled
+        if not self.sampled():
+            return await self.get_response(request)
+
+        # The ORM calls of a request run in its thread sensitive executor,
+        # so the query wrappers are installed there
+        timer = QueryTimer(request.path, self.slow_query_ms)
+        started = time.perf_counter()
+        stack = ExitStack()
+        await sync_to_async(self.wrap_queries)(stack, timer)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self.record(request, response, time.perf_counter() - started, timer)
+
+    def record(self, request, response, duration, timer):
+        # Record the metrics under the URL name
+        match = request.resolver_match
+        view = (match.url_name or match.view_name) if match else "unresolved"
+        metrics_registry.observe(
+            view, duration, timer.duration, timer.count, timer.slow_count
+        )
+
+        response["Server-Timing"] = (
+            f"total;dur={duration * 1000:.1f}, "
+            f'db;dur={timer.duration * 1000:.1f};desc="{timer.count} queries"'
+        )
+        return response
+
+
+# Middleware adding the rate limit headers of the throttled requests
+class RateLimitHeadersMiddleware:
+    """
+    Adds RateLimit-Limit, RateLimit-Remaining and RateLimit-Reset (seconds
+    until the bucket is full again) to the responses of throttled views, and
+    Retry-After once the bucket is empty. The state is left on the request
+    by the token bucket throttles. Runs in sync and async mode.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.add_headers(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.add_headers(request, await self.get_response(request))
+
+    def add_headers(self, request, response):
+        state = getattr(request, "rate_limit", None)
+        if state is None:
+            return response
+        response.headers["RateLimit-Limit"] = str(state.limit)
+        response.headers["RateLimit-Remaining"] = str(state.remaining)
+        response.headers["RateLimit-Reset"] = str(math.ceil(state.reset))
+        if not state.allowed or not state.remaining:
+            wait = state.wait if not state.allowed else state.reset / state.limit
+            response.headers.setdefault("Retry-After", str(math.ceil(wait)))
+        return response
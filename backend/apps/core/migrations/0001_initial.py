@@ -0,0 +1,98 @@
+# Generated by Django 4.2.11 on 2026-10-18 13:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="IdempotencyKey",
+            fields=[
+                (
+                    "key",
+                    models.CharField(
+                        max_length=255,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="Key",
+                    ),
+                ),
+                (
+                    "request_hash",
+                    models.CharField(max_length=64, verbose_name="Request Hash"),
+                ),
+                (
+                    "status_code",
+                    models.PositiveSmallIntegerField(
+                        null=True, verbose_name="Status Code"
+                    ),
+                ),
+                (
+                    "response_body",
+                    models.JSONField(null=True, verbose_name="Response Body"),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Created At"),
+                ),
+                (
+                    "expires_at",
+                    models.DateTimeField(db_index=True, verbose_name="Expires At"),
+                ),
+            ],
+            options={
+                "verbose_name": "Idempotency Key",
+                "verbose_name_plural": "Idempotency Keys",
+            },
+        ),
+        migrations.CreateModel(
+            name="IDSequence",
+            fields=[
+                (
+                    "prefix",
+                    models.CharField(
+                        max_length=10,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="Prefix",
+                    ),
+                ),
+                (
+                    "last_value",
+                    models.BigIntegerField(default=0, verbose_name="Last Value"),
+                ),
+            ],
+            options={
+                "verbose_name": "ID Sequence",
+                "verbose_name_plural": "ID Sequences",
+            },
+        ),
+        migrations.CreateModel(
+            name="ThrottleBucket",
+            fields=[
+                (
+                    "key",
+                    models.CharField(
+                        max_length=255,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="Key",
+                    ),
+                ),
+                ("tokens", models.FloatField(verbose_name="Tokens")),
+                (
+                    "updated_at",
+                    models.FloatField(db_index=True, verbose_name="Updated At"),
+                ),
+            ],
+            options={
+                "verbose_name": "Throttle Bucket",
+                "verbose_name_plural": "Throttle Buckets",
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.11 on 2026-10-18 15:10
+
+from django.db import migrations
+
+from backend.apps.core.ids import allocator, sequence_name
+
+
+# Models allocating their keys from a native sequence, with their prefix
+SEQUENCES = [
+    ("customers", "Customer", "CUST"),
+    ("employees", "Employee", "EMP"),
+    ("orders", "Order", "ORD"),
+    ("orders", "CheckoutBill", "BILL"),
+]
+
+
+# Create the sequences on PostgreSQL, continuing after the existing keys
+def create_sequences(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for app_label, model_name, prefix in SEQUENCES:
+        model = apps.get_model(app_label, model_name)
+        allocator.create_sequence(model, prefix, schema_editor.connection.alias)
+
+
+# Drop the sequences
+def drop_sequences(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    quote_name = schema_editor.connection.ops.quote_name
+    for _, _, prefix in SEQUENCES:
+        schema_editor.execute(
+            f"DROP SEQUENCE IF EXISTS {quote_name(sequence_name(prefix))}"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0001_initial"),
+        ("customers", "0001_initial"),
+        ("employees", "0001_initial"),
+        ("orders", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_sequences, drop_sequences),
+    ]
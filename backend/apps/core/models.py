@@ -0,0 +1,165 @@
+# Imports
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+# Class based model for the ID sequences
+class IDSequence(models.Model):
+    """
+    Model for storing the last allocated number of each ID prefix.
+    Used by the ID allocator on databases without native sequences.
+    Attributes:
+        prefix (CharField): A CharField that stores the ID prefix (ORD, BILL, CUST, EMP).
+        last_value (BigIntegerField): A BigIntegerField that stores the highest number handed out so far.
+    """
+
+    prefix = models.CharField(
+        max_length=10,
+        primary_key=True,
+        verbose_name=_("Prefix"),
+    )
+    last_value = models.BigIntegerField(
+        default=0,
+        verbose_name=_("Last Value"),
+    )
+
+    # Meta class for the IDSequence model
+    class Meta:
+        verbose_name = _("ID Sequence")
+        verbose_name_plural = _("ID Sequences")
+
+    # String representation of the IDSequence model
+    def __str__(self):
+        return f"{self.prefix} ({self.last_value})"
+
+
+# Class based model for the throttle token buckets
+class ThrottleBucket(models.Model):
+    """
+    Model for storing the token bucket of each throttle scope and client.
+    Shared by every worker, it is updated with a single atomic upsert.
+    Attributes:
+        key (CharField): A CharField that stores the throttle scope and client (user:42, anon:10.0.0.1).
+        tokens (FloatField): A FloatField that stores the tokens left at the last update.
+        updated_at (FloatField): A FloatField that stores the Unix time of the last update.
+    """
+
+    key = models.CharField(
+        max_length=255,
+        primary_key=True,
+        verbose_name=_("Key"),
+    )
+    tokens = models.FloatField(
+        verbose_name=_("Tokens"),
+    )
+    updated_at = models.FloatField(
+        db_index=True,
+        verbose_name=_("Updated At"),
+    )
+
+    # Meta class for the ThrottleBucket model
+    class Meta:
+        verbose_name = _("Throttle Bucket")
+        verbose_name_plural = _("Throttle Buckets")
+
+    # String representation of the ThrottleBucket model
+    def __str__(self):
+        return f"{self.key} ({self.tokens:.2f})"
+
+
+# Class based model for the idempotency keys of the create endpoints
+class IdempotencyKey(models.Model):
+    """
+    Model for storing the response given to a request sent with an
+    Idempotency-Key header, so a retry gets the same response back.
+    Attributes:
+        key (CharField): A CharField that stores the endpoint, the user and the key sent by the client.
+        request_hash (CharField): A CharField that stores the SHA-256 of the request data.
+        status_code (PositiveSmallIntegerField): A PositiveSmallIntegerField that stores the status of the stored response.
+        response_body (JSONField): A JSONField that stores the data of the stored response.
+        created_at (DateTimeField): A DateTimeField that stores when the key was first used.
+        expires_at (DateTimeField): A DateTimeField that stores when the key can be used again for a new request.
+    """
+
+    key = models.CharField(
+        max_length=255,
+        primary_key=True,
+        verbose_name=_("Key"),
+    )
+    request_hash = models.CharField(
+        max_length=64,
+        verbose_name=_("Request Hash"),
+    )
+    status_code = models.PositiveSmallIntegerField(
+        null=True,
+        verbose_name=_("Status Code"),
+    )
+    response_body = models.JSONField(
+        null=True,
+        verbose_name=_("Response Body"),
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name=_("Created At"),
+    )
+    expires_at = models.DateTimeField(
+        db_index=True,
+        verbose_name=_("Expires At"),
+    )
+
+    # Meta class for the IdempotencyKey model
+    class Meta:
+        verbose_name = _("Idempotency Key")
+        verbose_name_plural = _("Idempotency Keys")
+
+    # String representation of the IdempotencyKey model
+    def __str__(self):
+        return self.key
+
+
+# Abstract model for the rows served with conditional requests
+class VersionedModel(models.Model):
+    """
+    Abstract model adding a version bumped on every save, so the ETag of a
+    row can be read without loading or serializing it.
+    Attributes:
+        version (PositiveIntegerField): A PositiveIntegerField that stores the number of saves of the row, starting at 1.
+        updated_at (DateTimeField): A DateTimeField that stores when the row was last saved.
+    """
+
+    version = models.PositiveIntegerField(
+        default=1,
+        editable=False,
+        verbose_name=_("Version"),
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name=_("Updated At"),
+    )
+
+    # Meta class for the VersionedModel model
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        # Bump the version of an existing row in the UPDATE itself, so
+        # concurrent saves never write the same version
+        update_fields = kwargs.get("update_fields")
+        bump = not self._state.adding and (update_fields is None or update_fields)
+        if bump:
+            version = self.version
+            self.version = models.F("version") + 1
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "version", "updated_at"}
+
+        # Call the save method of the parent class
+        try:
+            super().save(*args, **kwargs)
+        except BaseException:
+            if bump:
+                self.version = version
+            raise
+
+        # Read back the version the UPDATE wrote
+        if bump:
+            self.refresh_from_db(fields=["version"])
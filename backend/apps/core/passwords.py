@@ -0,0 +1,292 @@
+# Imports
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from .metrics import QUANTILES, Histogram
+
+
+# Logger for the password pool
+logger = logging.getLogger(__name__)
+
+
+# Default settings for the password pool
+DEFAULTS = {
+    # Hash in the request thread instead of the pool
+    "ENABLED": True,
+    # Worker processes, None uses the number of CPUs
+    "WORKERS": None,
+    # Jobs allowed to wait for a free worker before new ones are rejected
+    "MAX_QUEUE": 16,
+    # Seconds a request waits for its job before giving up
+    "TIMEOUT": 5,
+}
+
+
+# Upper bounds of the job duration histogram buckets in seconds
+BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+# Read a password pool setting
+def get_setting(name):
+    return getattr(settings, "PASSWORD_POOL", {}).get(name, DEFAULTS[name])
+
+
+# Exception raised when the pool cannot take another job
+class PasswordPoolSaturated(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many logins in progress, try again shortly."
+    default_code = "password_pool_saturated"
+
+    # Sent back as the Retry-After header by the DRF exception handler
+    wait = 1
+
+
+# Set up Django in a new worker process
+def _start_worker(settings_module):
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+
+    import django
+
+    django.setup()
+
+
+# Verify a password in a worker process
+def _verify(password, encoded):
+    """
+    Return whether the password matches and whether the hash should be
+    upgraded to the preferred hasher and its configured cost.
+    """
+
+    preferred = hashers.get_hasher("default")
+    hasher = hashers.identify_hasher(encoded)
+    must_update = hasher.algorithm != preferred.algorithm or preferred.must_update(
+        encoded
+    )
+    return hasher.verify(password, encoded), must_update
+
+
+# Class for the process pool hashing and verifying the passwords
+class PasswordPool:
+    """
+    Bounded process pool for the password hashers, so a burst of logins
+    does not hold the GIL of the web workers.
+
+    At most WORKERS jobs run and MAX_QUEUE more wait; a job beyond that is
+    rejected at once with PasswordPoolSaturated (503) instead of queueing
+    behind the others. The workers are started on first use from a clean
+    forkserver so they never share a database connection of the web worker.
+    Where processes cannot be started (some serverless runtimes) the jobs
+    run in the calling thread.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._slots = None
+        self._pid = None
+        self._disabled = False
+        self._reset_counters()
+
+    def _reset_counters(self):
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.in_flight = 0
+        self.duration = Histogram(BUCKETS)
+
+    @property
+    def workers(self):
+        return get_setting("WORKERS") or os.cpu_count() or 1
+
+    def _get_executor(self):
+        """
+        Return the executor and the semaphore of its job slots. A new
+        executor gets new slots, the jobs of a replaced one release theirs.
+        """
+
+        with self._lock:
+            # A forked web worker starts its own pool
+            if self._pid != os.getpid():
+                self._executor = None
+                self._pid = os.getpid()
+
+            if self._executor is None and not self._disabled:
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context(
+                    "forkserver" if "forkserver" in methods else "spawn"
+                )
+                try:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=context,
+                        initializer=_start_worker,
+                        initargs=(os.environ.get("DJANGO_SETTINGS_MODULE", ""),),
+                    )
+                except (OSError, NotImplementedError, ImportError) as error:
+                    logger.warning(
+                        "Password pool unavailable, hashing in the request thread: %s",
+                        error,
+                    )
+                    self._disabled = True
+                self._slots = threading.BoundedSemaphore(
+                    self.workers + get_setting("MAX_QUEUE")
+                )
+            return self._executor, self._slots
+
+    def _broken(self, executor):
+        # A worker died, start a new pool for the next jobs
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+
+    def run(self, function, *args):
+        """
+        Run a hashing function in the pool and return its result. A job
+        holds its slot until it finishes, also when the request stopped
+        waiting for it.
+        """
+
+        executor, slots = (
+            self._get_executor() if get_setting("ENABLED") else (None, None)
+        )
+        if executor is None:
+            return function(*args)
+
+        # Reject the job when every worker is busy and the queue is full
+        if not slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordPoolSaturated()
+
+        started = time.perf_counter()
+        with self._lock:
+            self.submitted += 1
+            self.in_flight += 1
+
+        # Free the slot of the executor the job ran on once it is done
+        def done(future):
+            slots.release()
+            with self._lock:
+                self.in_flight -= 1
+                self.completed += 1
+                self.duration.observe(time.perf_counter() - started)
+
+        try:
+            future = executor.submit(function, *args)
+        except BrokenProcessPool:
+            done(None)
+            self._broken(executor)
+            return function(*args)
+        except BaseException:
+            done(None)
+            raise
+        future.add_done_callback(done)
+
+        try:
+            return future.result(timeout=get_setting("TIMEOUT"))
+        except FutureTimeoutError:
+            future.cancel()
+            with self._lock:
+                self.timeouts += 1
+            raise PasswordPoolSaturated()
+        except BrokenProcessPool:
+            self._broken(executor)
+            return function(*args)
+
+    def verify(self, password, encoded):
+        """
+        Return (valid, must_update) for a password against its stored hash.
+        """
+
+        if password is None or not hashers.is_password_usable(encoded):
+            return False, False
+        try:
+            return self.run(_verify, password, encoded)
+        except ValueError:
+            # The hash was made by a hasher that is no longer configured
+            return False, False
+
+    def make(self, password):
+        return self.run(hashers.make_password, password)
+
+    def check_password(self, user, password):
+        """
+        Check the password of a user and save it with the configured hasher
+        and cost when its hash is outdated, like AbstractBaseUser does.
+        """
+
+        valid, must_update = self.verify(password, user.password)
+        if valid and must_update:
+            user.password = self.make(password)
+            user.save(update_fields=["password"])
+        return valid
+
+    def warm_up(self):
+        # Start the workers before the first login
+        executor = self._get_executor()[0] if get_setting("ENABLED") else None
+        if executor is not None:
+            for future in [executor.submit(os.getpid) for _ in range(self.workers)]:
+                future.result()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "enabled": bool(get_setting("ENABLED")) and not self._disabled,
+                "workers": self.workers,
+                "max_queue": get_setting("MAX_QUEUE"),
+                "in_flight": self.in_flight,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "timeouts": self.timeouts,
+                "duration_seconds": {
+                    str(q): round(self.duration.quantile(q), 4) for q in QUANTILES
+                },
+            }
+
+    def prometheus(self):
+        """
+        Render the pool metrics in the Prometheus text exposition format.
+        """
+
+        stats = self.stats()
+        lines = [
+            "# HELP billing_password_pool_in_flight Password jobs running or waiting",
+            "# TYPE billing_password_pool_in_flight gauge",
+            f"billing_password_pool_in_flight {stats['in_flight']}",
+        ]
+        for name, help_text in (
+            ("submitted", "Password jobs sent to the pool"),
+            ("rejected", "Password jobs rejected because the pool was full"),
+            ("timeouts", "Password jobs that did not finish in time"),
+        ):
+            lines.append(f"# HELP billing_password_pool_{name}_total {help_text}")
+            lines.append(f"# TYPE billing_password_pool_{name}_total counter")
+            lines.append(f"billing_password_pool_{name}_total {stats[name]}")
+
+        name = "billing_password_pool_duration_seconds"
+        lines.append(f"# HELP {name} Wall time of the password jobs")
+        lines.append(f"# TYPE {name} histogram")
+        with self._lock:
+            bounds = [repr(float(bound)) for bound in self.duration.buckets]
+            for bound, total in zip(bounds + ["+Inf"], self.duration.cumulative()):
+                lines.append(f'{name}_bucket{{le="{bound}"}} {total}')
+            lines.append(f"{name}_sum {self.duration.sum!r}")
+            lines.append(f"{name}_count {self.duration.count}")
+        return "\n".join(lines) + "\n"
+
+
+# Shared password pool instance
+password_pool = PasswordPool()
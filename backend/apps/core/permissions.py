@@ -0,0 +1,13 @@
+# Imports
+from rest_framework.permissions import BasePermission
+
+
+# Permission class for the operations endpoints
+class IsSuperUser(BasePermission):
+    """
+    Allows access only to superusers. IsAdminUser is not enough here because
+    every employee account is created with is_staff set.
+    """
+
+    def has_permission(self, request, view):
+        return bool(request.user and request.user.is_superuser)
@@ -0,0 +1,17 @@
+# Imports
+from django.http import HttpResponse
+from rest_framework.renderers import JSONRenderer
+
+
+# Renderer of the DRF views, it keeps no state between calls
+renderer = JSONRenderer()
+
+
+# Build a JSON response rendered byte for byte like the DRF views
+def json_response(data, status=200, headers=None):
+    return HttpResponse(
+        renderer.render(data),
+        status=status,
+        headers=headers,
+        content_type="application/json",
+    )
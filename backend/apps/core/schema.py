@@ -0,0 +1,128 @@
+# Imports
+import hashlib
+import threading
+from pathlib import Path
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.http import Http404, HttpResponse, HttpResponseNotModified
+from django.shortcuts import redirect
+from django.utils.cache import patch_cache_control
+from django.utils.http import quote_etag
+from django.views import View
+from drf_yasg import openapi
+from drf_yasg.codecs import OpenAPICodecJson, OpenAPICodecYaml
+from drf_yasg.views import get_schema_view
+from rest_framework import permissions
+
+from .cache import not_modified
+
+
+# Information about the API shown in the schema
+API_INFO = openapi.Info(
+    title="Django REST API - On Counter Billing System Backend API",
+    default_version="v1",
+    description="A Django REST API - On Counter Billing System Backend API",
+    contact=openapi.Contact(email="rohit.vilas.ingole@gmail.com"),
+    license=openapi.License(name="GPL-3.0 license"),
+)
+
+
+# Swagger settings
+schema_view = get_schema_view(
+    API_INFO,
+    public=True,
+    permission_classes=(permissions.AllowAny,),
+)
+
+
+# Schema files by format, relative to the static files of the core app
+SCHEMA_FILES = {
+    ".json": ("openapi/swagger.json", OpenAPICodecJson, "application/json"),
+    ".yaml": ("openapi/swagger.yaml", OpenAPICodecYaml, "application/yaml"),
+}
+
+
+# Directory the build writes the schema files to, collectstatic picks them up
+# from there like the other static files of the app
+SCHEMA_DIR = Path(__file__).resolve().parent / "static"
+
+
+# Render the schema of every endpoint in a format, the same for every request
+def render_schema(format):
+    _, codec_class, _ = SCHEMA_FILES[format]
+    generator = schema_view.generator_class(API_INFO)
+    schema = generator.get_schema(request=None, public=True)
+    return codec_class(validators=[]).encode(schema)
+
+
+# Class to keep the rendered schema of each format in memory
+class SchemaCache:
+    """
+    Renders each format once per process and keeps it with its ETag, for the
+    workers that were deployed without the schema files.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def get(self, format):
+        entry = self._entries.get(format)
+        if entry is None:
+            with self._lock:
+                entry = self._entries.get(format)
+                if entry is None:
+                    content = render_schema(format)
+                    entry = self._entries[format] = {
+                        "etag": quote_etag(hashlib.md5(content).hexdigest()),
+                        "content": content,
+                    }
+        return entry
+
+
+# Shared schema cache instance
+schema_cache = SchemaCache()
+
+
+# Get the hashed URL of a built schema file, None when it was not collected
+def static_schema_url(format):
+    name = SCHEMA_FILES[format][0]
+    try:
+        # The manifest lists the files collectstatic stored
+        staticfiles_storage.stored_name(name)
+    except ValueError:
+        return None
+    return staticfiles_storage.url(name)
+
+
+# View to serve the schema as JSON or YAML
+class SchemaFileView(View):
+    """
+    Redirects to the schema file written by build_openapi_schema, which the
+    static files serve under a content hashed name. Without it the schema is
+    rendered once per process and answered with an ETag.
+    """
+
+    def get(self, request, format):
+        if format not in SCHEMA_FILES:
+            raise Http404("Unknown schema format")
+
+        # Send the client to the built file
+        url = static_schema_url(format)
+        if url is not None:
+            return redirect(url)
+
+        # The client already has this version
+        entry = schema_cache.get(format)
+        if not_modified(request, entry):
+            response = HttpResponseNotModified(headers={"ETag": entry["etag"]})
+        else:
+            response = HttpResponse(
+                entry["content"],
+                content_type=SCHEMA_FILES[format][2],
+                headers={"ETag": entry["etag"]},
+            )
+
+        # Let the client keep it but check the ETag on every use
+        patch_cache_control(response, public=True, no_cache=True)
+        return response
@@ -0,0 +1,680 @@
+# Imports
+import contextlib
+import csv
+import datetime
+import io
+import itertools
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connections, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from backend.apps.catalog.models import Item
+from backend.apps.catalog.prices import price_table
+from backend.apps.catalog.pricing import compile_rules
+from backend.apps.core.ids import allocate_ids
+from backend.apps.core.models import VersionedModel
+from backend.apps.customers.models import Customer, build_search_text
+from backend.apps.employees.models import Employee
+from backend.apps.orders.models import CheckoutBill, Order
+
+
+# Get the user model
+User = get_user_model()
+
+
+# Password of the seeded employees
+PASSWORD = "seed-password-123"
+
+
+# Names the seeded people are made of
+FIRST_NAMES = [
+    "Aarav",
+    "Aditi",
+    "Amit",
+    "Ananya",
+    "Arjun",
+    "Asha",
+    "Deepak",
+    "Divya",
+    "Farhan",
+    "Gita",
+    "Ishaan",
+    "John",
+    "Kavya",
+    "Kiran",
+    "Lakshmi",
+    "Maria",
+    "Meera",
+    "Mohan",
+    "Neha",
+    "Nikhil",
+    "Pooja",
+    "Priya",
+    "Rahul",
+    "Ravi",
+    "Rohit",
+    "Sara",
+    "Sneha",
+    "Suresh",
+    "Tanvi",
+    "Vikram",
+    "Yash",
+    "Zoya",
+]
+LAST_NAMES = [
+    "Agarwal",
+    "Bose",
+    "Chopra",
+    "Das",
+    "D'Souza",
+    "Gupta",
+    "Iyer",
+    "Jain",
+    "Joshi",
+    "Kapoor",
+    "Khan",
+    "Kulkarni",
+    "Kumar",
+    "Mehta",
+    "Menon",
+    "Nair",
+    "Patel",
+    "Pillai",
+    "Rao",
+    "Reddy",
+    "Shah",
+    "Sharma",
+    "Singh",
+    "Smith",
+]
+STREETS = ["MG Road", "Station Road", "Market Street", "Lake View", "Park Lane"]
+
+# Names and tax classes the seeded items are made of
+PRODUCTS = ["Rice", "Tea", "Soap", "Biscuits", "Oil", "Flour", "Sugar", "Shampoo"]
+TAX_CLASSES = [choice for choice, _ in Item.TaxClass.choices]
+
+
+# Format an amount in cents as a decimal string
+def cents(amount):
+    return f"{amount // 100}.{amount % 100:02d}"
+
+
+# Class to draw values with a Zipf-like skew
+class Distribution:
+    """
+    Draws from `population` with weight 1 / rank ** skew, a skew of 0 draws
+    uniformly. The population is shuffled first so the popular values are
+    spread over the whole ID range.
+    """
+
+    def __init__(self, population, skew, rng):
+        self.population = list(population)
+        self.rng = rng
+        self.cum_weights = None
+        if skew > 0:
+            rng.shuffle(self.population)
+            self.cum_weights = list(
+                itertools.accumulate(
+                    1 / rank**skew for rank in range(1, len(self.population) + 1)
+                )
+            )
+
+    def sample(self, count, rng=None):
+        return (rng or self.rng).choices(
+            self.population, cum_weights=self.cum_weights, k=count
+        )
+
+
+# Class to write rows the fastest way the database allows
+class RowWriter:
+    """
+    Writes plain tuples: COPY ... FROM STDIN on PostgreSQL, a single
+    executemany() INSERT elsewhere. Rows skip model instances, signals and
+    per-field conversion, so values must already be in database form.
+    """
+
+    # SQLite settings used while loading, traded for durability on a crash
+    SQLITE_PRAGMAS = {
+        "synchronous": "OFF",
+        "journal_mode": "MEMORY",
+        "cache_size": "-262144",
+        "temp_store": "MEMORY",
+    }
+
+    def __init__(self, using):
+        self.connection = connections[using]
+
+    @contextlib.contextmanager
+    def bulk_load(self, models=()):
+        """
+        Relax the SQLite durability settings, turn off the foreign key
+        checks and drop the secondary indexes of the models while loading,
+        then recreate the indexes in one pass and restore the settings. The
+        primary keys and unique constraints stay in place, the seeded rows
+        only ever reference rows that exist.
+        """
+
+        if self.connection.vendor != "sqlite":
+            yield
+            return
+        tables = [model._meta.db_table for model in models]
+        with self.connection.cursor() as cursor:
+            saved = {}
+            for name, value in self.SQLITE_PRAGMAS.items():
+                cursor.execute(f"PRAGMA {name}")
+                saved[name] = cursor.fetchone()[0]
+                cursor.execute(f"PRAGMA {name} = {value}")
+
+            # Indexes created with CREATE INDEX, not by the table definition
+            cursor.execute(
+                "SELECT name, sql FROM sqlite_master WHERE type = 'index' "
+                "AND sql IS NOT NULL AND tbl_name IN (%s)"
+                % ", ".join(["%s"] * len(tables)),
+                tables,
+            )
+            indexes = cursor.fetchall()
+            for name, _ in indexes:
+                cursor.execute(f"DROP INDEX {self.connection.ops.quote_name(name)}")
+        try:
+            with self.connection.constraint_checks_disabled():
+                yield
+        finally:
+            with self.connection.cursor() as cursor:
+                for _, sql in indexes:
+                    cursor.execute(sql)
+                for name, value in saved.items():
+                    cursor.execute(f"PRAGMA {name} = {value}")
+
+    def write(self, model, names, rows):
+        if not rows:
+            return
+
+        # Start the versioned rows at their first version
+        if issubclass(model, VersionedModel):
+            now = self.connection.ops.adapt_datetimefield_value(timezone.now())
+            names = [*names, "version", "updated_at"]
+            rows = [(*row, 1, now) for row in rows]
+
+        quote = self.connection.ops.quote_name
+        table = quote(model._meta.db_table)
+        columns = ", ".join(quote(model._meta.get_field(name).column) for name in names)
+
+        with self.connection.cursor() as cursor:
+            # Stream the rows as CSV into COPY on PostgreSQL
+            if self.connection.vendor == "postgresql":
+                buffer = io.StringIO()
+                csv.writer(buffer).writerows(rows)
+                buffer.seek(0)
+                cursor.copy_expert(
+                    f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer
+                )
+
+            # Insert them with one executemany() elsewhere
+            else:
+                placeholders = ", ".join(["%s"] * len(names))
+                cursor.executemany(
+                    f"INSERT INTO {table} ({columns}) VALUES ({placeholders})", rows
+                )
+
+
+# Class to generate the synthetic billing data
+class BillingSeeder:
+    """
+    Generates employees, customers, bills and order lines in chunks, one
+    transaction per chunk. Primary keys are reserved up front through the ID
+    allocator so the seeded rows never collide with the ones the API creates.
+    Bills pick their customer and items from skewed distributions and are
+    spread over the last `days` days. The items missing from the catalog are
+    created first and the lines are priced from it, taxes, discounts and
+    promotions included.
+    """
+
+    def __init__(
+        self,
+        customers=0,
+        employees=0,
+        bills=0,
+        lines=(1, 5),
+        items=1000,
+        item_skew=1.1,
+        customer_skew=0.8,
+        days=365,
+        chunk_size=10000,
+        seed=0,
+        using="default",
+        progress=None,
+    ):
+        self.sizes = {"customers": customers, "employees": employees, "bills": bills}
+        self.lines = lines
+        self.items = items
+        self.item_skew = item_skew
+        self.customer_skew = customer_skew
+        self.days = days
+        self.chunk_size = chunk_size
+        self.rng = random.Random(seed)
+        self.using = using
+        self.progress = progress or (lambda table, rows: None)
+        self.date_range = None
+        self.writer = RowWriter(using)
+        self.connection = connections[using]
+
+        # Rows written per table
+        self.rows = {}
+
+    def run(self):
+        with self.writer.bulk_load(self.models()):
+            self.seed_employees()
+            self.seed_customers()
+            self.seed_bills()
+        return self.rows
+
+    def models(self):
+        # Tables written to, the catalog is left alone
+        models = []
+        if self.sizes["employees"]:
+            models += [User, Employee]
+        if self.sizes["customers"]:
+            models.append(Customer)
+        if self.sizes["bills"]:
+            models += [Order, CheckoutBill, CheckoutBill.orders.through]
+        return models
+
+    def chunks(self, total):
+        # Sizes of the chunks of `total` rows
+        for start in range(0, total, self.chunk_size):
+            yield min(self.chunk_size, total - start)
+
+    def write(self, model, names, rows):
+        self.writer.write(model, names, rows)
+        label = model._meta.label
+        self.rows[label] = self.rows.get(label, 0) + len(rows)
+        self.progress(label, self.rows[label])
+
+    def store(self, tables):
+        # Write the (model, names, rows) of a chunk in one transaction
+        with transaction.atomic(using=self.using):
+            for model, names, rows in tables:
+                self.write(model, names, rows)
+
+    def pipeline(self, batches, build):
+        """
+        Call build(*batch) for each batch in a thread and store its rows,
+        so the next chunk is generated while the current one is written:
+        sqlite3 and psycopg2 release the GIL while the database works. The
+        batches are drawn in this thread, which keeps the database to it,
+        and each carries its own random generator so a seed gives the same
+        rows whatever the timing.
+        """
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pending = None
+            for batch in batches:
+                future = pool.submit(build, *batch)
+                if pending is not None:
+                    self.store(pending.result())
+                pending = future
+            if pending is not None:
+                self.store(pending.result())
+
+    def chunk_rng(self):
+        # Random generator of a chunk, seeded from the seeder's one
+        return random.Random(self.rng.getrandbits(64))
+
+    def person(self, number, rng=None):
+        rng = rng or self.rng
+        first_name = rng.choice(FIRST_NAMES)
+        last_name = rng.choice(LAST_NAMES)
+        handle = f"{first_name}.{last_name}.{number}".lower().replace("'", "")
+        phone_number = f"+91-{rng.randrange(6 * 10**9, 10**10)}"
+        return first_name, last_name, handle, f"{handle}@example.com", phone_number
+
+    def seed_employees(self):
+        total = self.sizes["employees"]
+        if not total:
+            return
+
+        # Every seeded employee shares one password hash
+        password = make_password(PASSWORD)
+        joined = self.connection.ops.adapt_datetimefield_value(timezone.now())
+        next_user_id = (
+            User.objects.using(self.using).aggregate(last=Max("id"))["last"] or 0
+        ) + 1
+
+        for count in self.chunks(total):
+            users, employees = [], []
+            for emp_id in allocate_ids(Employee, count, using=self.using):
+                first_name, last_name, handle, email, phone = self.person(emp_id)
+                users.append(
+                    (
+                        next_user_id,
+                        password,
+                        False,
+                        True,
+                        True,
+                        joined,
+                        f"emp.{handle}",
+                        f"emp.{email}",
+                        first_name,
+                        last_name,
+                        phone,
+                    )
+                )
+                hired = datetime.date.today() - datetime.timedelta(
+                    days=self.rng.randrange(30, 3650)
+                )
+                hired = hired.isoformat()
+                employees.append(
+                    (
+                        emp_id,
+                        next_user_id,
+                        self.rng.choice(STREETS),
+                        self.rng.choice(["Sales", "Billing", "Stores"]),
+                        self.rng.choice(["Cashier", "Supervisor", "Manager"]),
+                        cents(self.rng.randrange(15000_00, 90000_00)),
+                        hired,
+                        True,
+                    )
+                )
+                next_user_id += 1
+
+            with transaction.atomic(using=self.using):
+                self.write(
+                    User,
+                    [
+                        "id",
+                        "password",
+                        "is_superuser",
+                        "is_staff",
+                        "is_active",
+                        "date_joined",
+                        "username",
+                        "email",
+                        "first_name",
+                        "last_name",
+                        "phone_number",
+                    ],
+                    users,
+                )
+                self.write(
+                    Employee,
+                    [
+                        "emp_id",
+                        "user",
+                        "address",
+                        "department",
+                        "position",
+                        "salary",
+                        "hire_date",
+                        "is_active",
+                    ],
+                    employees,
+                )
+
+        # Move the user sequence past the explicit IDs
+        self.reset_sequences([User])
+
+    def seed_customers(self):
+        batches = (
+            (allocate_ids(Customer, count, using=self.using), self.chunk_rng())
+            for count in self.chunks(self.sizes["customers"])
+        )
+        self.pipeline(batches, self.customer_rows)
+
+    def customer_rows(self, cust_ids, rng):
+        rows = []
+        for cust_id in cust_ids:
+            first_name, last_name, handle, email, phone = self.person(cust_id, rng)
+            rows.append(
+                (
+                    cust_id,
+                    handle,
+                    email,
+                    first_name,
+                    last_name,
+                    phone,
+                    f"{rng.randrange(1, 500)} {rng.choice(STREETS)}",
+                    True,
+                    build_search_text(first_name, last_name, handle, email, phone),
+                )
+            )
+        return [
+            (
+                Customer,
+                [
+                    "cust_id",
+                    "username",
+                    "email",
+                    "first_name",
+                    "last_name",
+                    "phone_number",
+                    "address",
+                    "is_active",
+                    "search_text",
+                ],
+                rows,
+            )
+        ]
+
+    def seed_items(self):
+        """
+        Create the items ITEM0001 to ITEM<items> missing from the catalog and
+        return the prices in cents of the active ones.
+        """
+
+        item_ids = [f"ITEM{number:04d}" for number in range(1, self.items + 1)]
+        existing = dict(
+            Item.objects.using(self.using)
+            .filter(item_id__in=item_ids)
+            .values_list("item_id", "is_active")
+        )
+
+        rows, prices = [], {}
+        for number, item_id in enumerate(item_ids, start=1):
+            price = self.rng.randrange(10_00, 2000_00)
+            if item_id not in existing:
+                prices[item_id] = price
+                rows.append(
+                    (
+                        item_id,
+                        f"{self.rng.choice(PRODUCTS)} {number}",
+                        cents(price),
+                        self.rng.choice(TAX_CLASSES),
+                        True,
+                    )
+                )
+        if rows:
+            with transaction.atomic(using=self.using):
+                self.write(
+                    Item, ["item_id", "name", "price", "tax_class", "is_active"], rows
+                )
+                price_table.invalidate(self.using)
+
+        # Items already in the catalog keep their price
+        prices.update(
+            (item_id, int(price * 100))
+            for item_id, price in Item.objects.using(self.using)
+            .filter(item_id__in=list(existing), is_active=True)
+            .values_list("item_id", "price")
+        )
+        return {item_id: prices[item_id] for item_id in item_ids if item_id in prices}
+
+    def seed_bills(self):
+        total = self.sizes["bills"]
+        if not total:
+            return
+
+        # Bills go to existing employees and customers, seeded or not
+        employees = list(
+            Employee.objects.using(self.using).values_list("emp_id", flat=True)
+        )
+        customer_ids = list(
+            Customer.objects.using(self.using).values_list("cust_id", flat=True)
+        )
+        if not employees or not customer_ids:
+            raise ValueError("Bills need at least one employee and one customer")
+        customers = Distribution(customer_ids, self.customer_skew, self.rng)
+
+        # Bills are priced from the catalog, popular items are drawn more often
+        prices = self.seed_items()
+        if not prices:
+            raise ValueError("Bills need at least one active catalog item")
+        items = Distribution(prices, self.item_skew, self.rng)
+
+        # Bills are spread over the last days, opening hours 8:00 to 22:00
+        today = datetime.date.today()
+        midnight = datetime.datetime.combine(
+            today, datetime.time(), tzinfo=datetime.timezone.utc
+        )
+
+        # Backends keeping datetimes as text get the opening time of each day
+        # adapted once and the creation times formatted from it
+        adapt = self.connection.ops.adapt_datetimefield_value
+        text_times = isinstance(adapt(midnight), str)
+        days = []
+        for day in range(self.days):
+            opening = midnight - datetime.timedelta(days=day, hours=-8)
+            if text_times:
+                opening = datetime.datetime.fromisoformat(adapt(opening))
+            days.append(((today - datetime.timedelta(days=day)).isoformat(), opening))
+
+        # Lines pay the taxes and discounts of the catalog, priced once for
+        # every item and quantity so each line is a lookup of its row values
+        rules = compile_rules(self.using)
+        quantities = range(1, 6)
+        line_rows = {}
+        for item_id in prices:
+            for quantity in quantities:
+                line = rules.price_bill([(item_id, quantity, None)]).lines[0]
+                line_rows[item_id, quantity] = (
+                    (
+                        item_id,
+                        quantity,
+                        cents(line.unit_price),
+                        cents(line.discount),
+                        cents(line.tax),
+                        cents(line.total),
+                    ),
+                    line.total,
+                )
+        promote = rules.promote
+
+        # Draw the line counts and reserve the IDs of each chunk here, the
+        # rest of the chunk is drawn while the previous one is written
+        def batches():
+            for count in self.chunks(total):
+                line_counts = self.rng.choices(
+                    range(self.lines[0], self.lines[1] + 1), k=count
+                )
+                yield (
+                    allocate_ids(CheckoutBill, count, using=self.using),
+                    allocate_ids(Order, sum(line_counts), using=self.using),
+                    line_counts,
+                    self.chunk_rng(),
+                )
+
+        def build(bill_ids, order_ids, line_counts, rng):
+            # Draw everything the chunk needs at once
+            count, line_total = len(bill_ids), len(order_ids)
+            lines = list(
+                map(
+                    line_rows.__getitem__,
+                    zip(
+                        items.sample(line_total, rng),
+                        rng.choices(quantities, k=line_total),
+                    ),
+                )
+            )
+            bill_days = rng.choices(days, k=count)
+            bill_employees = rng.choices(employees, k=count)
+            bill_customers = customers.sample(count, rng)
+
+            # Order lines and links, each line goes to the bill it is drawn for
+            line_dates = itertools.chain.from_iterable(
+                map(itertools.repeat, [day[0] for day in bill_days], line_counts)
+            )
+            orders = [
+                (order_id, bill_date, *values)
+                for order_id, bill_date, (values, _) in zip(
+                    order_ids, line_dates, lines
+                )
+            ]
+            links = list(
+                zip(
+                    itertools.chain.from_iterable(
+                        map(itertools.repeat, bill_ids, line_counts)
+                    ),
+                    order_ids,
+                )
+            )
+
+            # Bill totals, the best promotion of each comes off after tax
+            line_prices = iter([price for _, price in lines])
+            bills = []
+            for bill_id, line_count, cust_id, (bill_date, opening), emp_id in zip(
+                bill_ids, line_counts, bill_customers, bill_days, bill_employees
+            ):
+                total = sum(itertools.islice(line_prices, line_count))
+                discount = promote(total)[0]
+                created_at = opening + datetime.timedelta(
+                    seconds=int(rng.random() * 14 * 3600)
+                )
+                bills.append(
+                    (
+                        bill_id,
+                        bill_date,
+                        str(created_at) if text_times else created_at,
+                        emp_id,
+                        cust_id,
+                        cents(discount),
+                        cents(total - discount),
+                    )
+                )
+
+            return [
+                (
+                    Order,
+                    [
+                        "order_id",
+                        "order_date",
+                        "item_id",
+                        "quantity",
+                        "unit_price",
+                        "discount",
+                        "tax",
+                        "total_price",
+                    ],
+                    orders,
+                ),
+                (
+                    CheckoutBill,
+                    [
+                        "bill_id",
+                        "bill_date",
+                        "created_at",
+                        "emp_id",
+                        "cust_id",
+                        "discount",
+                        "total_price",
+                    ],
+                    bills,
+                ),
+                (CheckoutBill.orders.through, ["checkoutbill", "order"], links),
+            ]
+
+        self.pipeline(batches(), build)
+
+        # Return the range of seeded days for the rollup rebuild
+        self.date_range = (today - datetime.timedelta(days=self.days - 1), today)
+
+    def reset_sequences(self, models):
+        statements = self.connection.ops.sequence_reset_sql(no_style(), models)
+        if statements:
+            with self.connection.cursor() as cursor:
+                for statement in statements:
+                    cursor.execute(statement)
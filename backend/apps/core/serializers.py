@@ -0,0 +1,324 @@
+# Imports
+import datetime
+import decimal
+import threading
+from collections import defaultdict
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import models
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+
+# Encoder of the decimal fields rendered like DRF, as fixed point strings
+def decimal_encoder(field, model_field):
+    coerce_to_string = getattr(
+        field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING
+    )
+    if (
+        not coerce_to_string
+        or field.localize
+        or field.normalize_output
+        or field.decimal_places is None
+    ):
+        return field.to_representation
+
+    # The database returns the column at its scale, quantizing would not
+    # change it, and str() only switches to exponents past 6 places
+    if (
+        isinstance(model_field, models.DecimalField)
+        and model_field.decimal_places == field.decimal_places
+        and field.decimal_places <= 6
+    ):
+        return str
+
+    # Quantize with the same exponent, precision and rounding as DRF
+    quantum = decimal.Decimal(1).scaleb(-field.decimal_places)
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+    rounding = field.rounding
+
+    def encode(value):
+        return format(value.quantize(quantum, rounding=rounding, context=context), "f")
+
+    return encode
+
+
+# Encoder of the date fields, ISO 8601 unless the field sets another format
+def date_encoder(field, model_field):
+    output_format = getattr(field, "format", api_settings.DATE_FORMAT)
+    if output_format is None or output_format.lower() != ISO_8601:
+        return field.to_representation
+    return datetime.date.isoformat
+
+
+# Encoder of the primary key of a related object
+def primary_key_encoder(field, model_field):
+    if field.pk_field is not None:
+        return field.pk_field.to_representation
+    return None
+
+
+# Encoder converting to a Python type, unless the column already has that type
+def native_encoder(python_type, *internal_types):
+    def encoder(field, model_field):
+        if (
+            model_field is not None
+            and model_field.get_internal_type() in internal_types
+        ):
+            return None
+        return python_type
+
+    return encoder
+
+
+# Encoders by DRF field class, None leaves the value as the database gave it
+ENCODERS = [
+    (serializers.DecimalField, decimal_encoder),
+    (serializers.DateTimeField, lambda field, model_field: field.to_representation),
+    (serializers.DateField, date_encoder),
+    (serializers.BooleanField, native_encoder(bool, "BooleanField")),
+    (
+        serializers.IntegerField,
+        native_encoder(
+            int,
+            "AutoField",
+            "BigAutoField",
+            "SmallAutoField",
+            "IntegerField",
+            "BigIntegerField",
+            "SmallIntegerField",
+            "PositiveIntegerField",
+            "PositiveBigIntegerField",
+            "PositiveSmallIntegerField",
+        ),
+    ),
+    (serializers.FloatField, native_encoder(float, "FloatField")),
+    (serializers.CharField, native_encoder(str, "CharField", "TextField", "SlugField")),
+    (serializers.PrimaryKeyRelatedField, primary_key_encoder),
+]
+
+
+# Class based read-only serializer working on values() rows
+class ValuesSerializer:
+    """
+    Read-only twin of a DRF ModelSerializer that renders the same JSON from
+    values_list() rows instead of model instances.
+
+    The fields of the DRF serializer are compiled once into a function that
+    builds the dict of a row by index, calling an encoder only where the
+    column does not already hold the JSON value. No model instance, field
+    copy or attribute lookup is made per row. Nested serializers of a forward
+    relation read their columns through the join, and many=True serializers
+    are loaded with one query for all the rows. Fields it cannot read from a
+    column raise ImproperlyConfigured when it is compiled.
+    """
+
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+        self._lock = threading.Lock()
+        self._compiled = None
+
+    @property
+    def compiled(self):
+        # Compile on first use, the models must be loaded
+        if self._compiled is None:
+            with self._lock:
+                if self._compiled is None:
+                    self._compiled = self.compile()
+        return self._compiled
+
+    def compile(self):
+        serializer = self.serializer_class()
+        model = serializer.Meta.model
+        paths = ["pk"]
+        many = [
+            (key, self.compile_many(model, field))
+            for key, field in serializer.fields.items()
+            if isinstance(field, serializers.ListSerializer) and not field.write_only
+        ]
+        entries = self.compile_fields(model, serializer, "", paths, False, top=True)
+        return {"paths": paths, "build": self.builder(entries), "many": many}
+
+    def compile_fields(self, model, serializer, prefix, paths, nullable, top=False):
+        """
+        Return the (key, index, encoder, nested, nullable) entries of the
+        readable fields of a serializer, adding the columns they read to
+        paths. The many=True fields of the top serializer get an entry with
+        no column that keeps their place in the output.
+        """
+
+        def column(path):
+            if path not in paths:
+                paths.append(path)
+            return paths.index(path)
+
+        entries = []
+        for key, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, serializers.ListSerializer):
+                if not top:
+                    raise ImproperlyConfigured(
+                        f"{type(serializer).__name__}.{key} is a nested list"
+                    )
+                entries.append((key, None, None, None, False))
+                continue
+            if field.source == "*" or not field.source_attrs:
+                raise ImproperlyConfigured(
+                    f"{type(serializer).__name__}.{key} is not read from a column"
+                )
+            path = prefix + "__".join(field.source_attrs)
+
+            # Model field of the column, through the relations of the source
+            related, model_field, column_nullable = model, None, nullable
+            for attr in field.source_attrs:
+                model_field = related._meta.get_field(attr)
+                column_nullable = column_nullable or model_field.null
+                related = model_field.related_model
+
+            # Nested serializer of a forward relation, None when it is not set
+            if isinstance(field, serializers.ModelSerializer):
+                nested = self.compile_fields(
+                    related, field, path + "__", paths, column_nullable
+                )
+                entries.append((key, column(path), None, nested, column_nullable))
+                continue
+
+            for field_class, encoder in ENCODERS:
+                if isinstance(field, field_class):
+                    entries.append(
+                        (
+                            key,
+                            column(path),
+                            encoder(field, model_field),
+                            None,
+                            column_nullable,
+                        )
+                    )
+                    break
+            else:
+                raise ImproperlyConfigured(
+                    f"{type(serializer).__name__}.{key} has no values encoder"
+                )
+        return entries
+
+    def compile_many(self, model, field):
+        # Related model, reverse lookup and row builder of a many=True relation
+        relation = model._meta.get_field(field.source)
+        if relation.concrete:
+            lookup = relation.related_query_name()
+        else:
+            lookup = relation.field.name
+        paths = [lookup]
+        entries = self.compile_fields(
+            relation.related_model, field.child, "", paths, False
+        )
+        return {
+            "model": relation.related_model,
+            "lookup": lookup,
+            "paths": paths,
+            "build": self.builder(entries),
+        }
+
+    def builder(self, entries):
+        """
+        Generate the function building the dict of a row, a single dict
+        display with the encoders bound as globals.
+        """
+
+        namespace = {}
+
+        def expression(entries):
+            items = []
+            for key, index, encode, nested, nullable in entries:
+                if index is None:
+                    items.append(f"{key!r}: []")
+                    continue
+                value = f"row[{index}]"
+                if nested is not None:
+                    value = expression(nested)
+                elif encode is not None:
+                    name = f"encode_{len(namespace)}"
+                    namespace[name] = encode
+                    value = f"{name}({value})"
+                if nullable:
+                    value = f"None if row[{index}] is None else {value}"
+                items.append(f"{key!r}: {value}")
+            return "{" + ", ".join(items) + "}"
+
+        source = f"def build(row):\n    return {expression(entries)}\n"
+        filename = f"<{self.serializer_class.__name__} values>"
+        exec(compile(source, filename, "exec"), namespace)
+        return namespace["build"]
+
+    def queryset(self, queryset, *extra):
+        """
+        Return the named values_list() rows of a queryset of the model, for
+        serialize(). The rows can be paginated like model instances since
+        each field is an attribute of the row. The extra columns, such as the
+        key of a cursor, come after the fields and are left out of the data.
+        """
+
+        return queryset.values_list(*self.compiled["paths"], *extra, named=True)
+
+    def related(self, rows, using=None):
+        # Queries of the many=True relations of the rows
+        pks = [row[0] for row in rows]
+        for key, relation in self.compiled["many"]:
+            model = relation["model"]
+            queryset = (
+                model._default_manager.db_manager(using)
+                .filter(**{f"{relation['lookup']}__in": pks})
+                .order_by(*model._meta.ordering)
+                .values_list(*relation["paths"])
+            )
+            yield key, relation, queryset
+
+    def assemble(self, rows, children):
+        # Dicts of the rows, then the lists of their related rows in place
+        data = list(map(self.compiled["build"], rows))
+        for key, relation, related_rows in children:
+            grouped = defaultdict(list)
+            build = relation["build"]
+            for related_row in related_rows:
+                grouped[related_row[0]].append(build(related_row))
+            for row, item in zip(rows, data):
+                item[key] = grouped.get(row[0], [])
+        return data
+
+    def fetch(self, rows, using=None):
+        # Load the related rows of the many=True relations of the rows
+        return [
+            (key, relation, list(queryset))
+            for key, relation, queryset in self.related(rows, using)
+        ]
+
+    def serialize(self, rows, using=None):
+        """
+        Return the list of dicts of rows from queryset(), as the DRF
+        serializer with many=True would.
+        """
+
+        rows = list(rows)
+        if not rows:
+            return []
+        return self.assemble(rows, self.fetch(rows, using))
+
+    def get(self, queryset, **lookup):
+        """
+        Return the dict of the single object matching lookup, raising
+        DoesNotExist like QuerySet.get().
+        """
+
+        row = self.queryset(queryset).get(**lookup)
+        return self.serialize([row], using=queryset.db)[0]
+
+    async def aget(self, queryset, **lookup):
+        # Async version of get() with the async ORM
+        row = await self.queryset(queryset).aget(**lookup)
+        children = []
+        for key, relation, related in self.related([row], using=queryset.db):
+            children.append((key, relation, [child async for child in related]))
+        return self.assemble([row], children)[0]
@@ -0,0 +1,34 @@
+# Imports
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+
+# Middleware serving the static files in sync and async mode
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise only ships a sync middleware, which makes Django run every
+    async view in a thread under ASGI. This serves the files the same way
+    and awaits the rest of the chain when it is async.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None):
+        super().__init__(get_response)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = self.find_file(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return self.serve(static_file, request)
+        return await self.get_response(request)
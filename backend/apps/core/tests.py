@@ -0,0 +1,472 @@
+# Imports
+import datetime
+import json
+import os
+import tempfile
+import threading
+import time
+from unittest import skipIf, skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import OperationalError, connection, connections, transaction
+from django.db.utils import ConnectionHandler
+from django.test import (
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework.views import APIView
+
+from backend.apps.catalog.models import Item
+from backend.apps.customers.models import Customer
+from backend.apps.employees.models import Employee
+from backend.apps.orders.models import CheckoutBill
+
+from .db.pool import close_pool
+from .explain import HOT_QUERIES, PlanChecker
+from .idempotency import idempotent
+from .ids import allocate_ids, allocator, next_id, sequence_name
+from .models import IdempotencyKey, IDSequence
+from .passwords import PasswordPool, PasswordPoolSaturated
+
+
+# Build the fields of a customer with a unique username and email
+def customer_fields(number):
+    return {
+        "username": f"customer{number}",
+        "email": f"customer{number}@example.com",
+        "first_name": "Test",
+        "last_name": "Customer",
+        "phone_number": "+91-9876543210",
+        "address": "1 Test Street",
+    }
+
+
+# Get the user model
+User = get_user_model()
+
+
+# Whether the keys come from native sequences rather than the IDSequence table
+NATIVE_SEQUENCES = connection.vendor == "postgresql"
+
+
+# Tests of the ID allocator
+class IDAllocatorTests(TransactionTestCase):
+    def setUp(self):
+        # The blocks kept in memory belong to the previous test's database
+        allocator._reset()
+
+    @skipIf(NATIVE_SEQUENCES, "The IDSequence table is not used")
+    def test_ids_do_not_depend_on_sort_order(self):
+        IDSequence.objects.create(prefix="CUST", last_value=9999)
+        self.assertEqual(allocate_ids(Customer, 2), ["CUST10000", "CUST10001"])
+        self.assertEqual(next_id(Customer), "CUST10002")
+
+    @skipIf(NATIVE_SEQUENCES, "Native sequences are not rolled back")
+    def test_rolled_back_reservation_is_not_reused(self):
+        # Reserve a block in a transaction that is rolled back
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                first = next_id(Customer)
+                raise RuntimeError
+
+        # The row is back to its old value and the block was dropped, so the
+        # numbers handed out next are the ones that were never committed
+        self.assertEqual(next_id(Customer), first)
+        Customer.objects.create(**customer_fields(1))
+        Customer.objects.create(**customer_fields(2))
+        ids = list(Customer.objects.values_list("cust_id", flat=True))
+        self.assertEqual(len(set(ids)), 2)
+        self.assertNotIn(first, ids)
+
+    @skipUnless(NATIVE_SEQUENCES, "Only PostgreSQL has native sequences")
+    def test_sequence_created_in_a_rolled_back_transaction(self):
+        name = connection.ops.quote_name(sequence_name(Customer.id_prefix))
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP SEQUENCE {name}")
+
+        # The sequence is created in the transaction and dropped with it
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                next_id(Customer)
+                raise RuntimeError
+
+        # The prefix was not marked ready, so the sequence is created again
+        Customer.objects.create(**customer_fields(1))
+        Customer.objects.create(**customer_fields(2))
+        self.assertEqual(Customer.objects.count(), 2)
+
+    def test_committed_reservation_keeps_spare_numbers(self):
+        with transaction.atomic():
+            first = next_id(Customer)
+
+        # The spare numbers of the committed block are served from memory
+        with self.assertNumQueries(0):
+            second = next_id(Customer)
+        self.assertNotEqual(first, second)
+
+    def test_concurrent_inserts_get_unique_ids(self):
+        threads, per_thread = 8, 25
+        errors = []
+        start = threading.Barrier(threads)
+
+        def insert(worker):
+            try:
+                start.wait()
+                for number in range(per_thread):
+                    # Half of the inserts run in a transaction, some rolled back
+                    if number % 2:
+                        Customer.objects.create(
+                            **customer_fields(worker * per_thread + number)
+                        )
+                        continue
+                    try:
+                        with transaction.atomic():
+                            Customer.objects.create(
+                                **customer_fields(worker * per_thread + number)
+                            )
+                            if number % 6 == 0:
+                                raise RuntimeError
+                    except RuntimeError:
+                        pass
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connections.close_all()
+
+        workers = [
+            threading.Thread(target=insert, args=(worker,)) for worker in range(threads)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual(errors, [])
+        rolled_back = len([n for n in range(per_thread) if n % 6 == 0])
+        self.assertEqual(Customer.objects.count(), threads * (per_thread - rolled_back))
+
+        # A new process continues after every committed ID
+        last = max(
+            int(cust_id[len("CUST") :])
+            for cust_id in Customer.objects.values_list("cust_id", flat=True)
+        )
+        allocator._reset()
+        self.assertGreater(int(next_id(Customer)[len("CUST") :]), last)
+        connection.close()
+
+
+# Tests of the query plans of the hot queries
+class HotQueryPlanTests(TestCase):
+    def test_hot_queries_are_served_by_indexes(self):
+        checker = PlanChecker(connection.alias)
+        for name, query in HOT_QUERIES.items():
+            with self.subTest(query=name):
+                if not checker.supports(query):
+                    self.skipTest(f"{name} does not run on {connection.vendor}")
+                try:
+                    plan, scans = checker.explain(query)
+                except NotImplementedError as error:
+                    self.skipTest(str(error))
+                self.assertEqual(scans, [], f"Full scan in the plan:\n{plan}")
+
+
+# Tests of the row versions
+class VersionedModelTests(TestCase):
+    def test_concurrent_saves_get_their_own_version(self):
+        customer = Customer.objects.create(**customer_fields(1))
+        first = Customer.objects.get(pk=customer.pk)
+        second = Customer.objects.get(pk=customer.pk)
+
+        # Both copies were read at version 1 without a lock
+        first.first_name = "First"
+        first.save()
+        second.last_name = "Second"
+        second.save(update_fields=["last_name"])
+
+        self.assertEqual((first.version, second.version), (2, 3))
+        customer.refresh_from_db()
+        self.assertEqual(customer.version, 3)
+
+    def test_save_without_fields_keeps_the_version(self):
+        customer = Customer.objects.create(**customer_fields(1))
+        customer.save(update_fields=[])
+        customer.refresh_from_db()
+        self.assertEqual(customer.version, 1)
+
+
+# Tests of the password process pool
+@override_settings(
+    PASSWORD_POOL={"ENABLED": True, "WORKERS": 1, "MAX_QUEUE": 0, "TIMEOUT": 30}
+)
+class PasswordPoolTests(SimpleTestCase):
+    def setUp(self):
+        self.pool = PasswordPool()
+        self.pool.warm_up()
+
+    def tearDown(self):
+        self.pool._executor.shutdown()
+
+    def test_timed_out_job_keeps_its_slot(self):
+        # The request gives up on the running job, which keeps the only worker
+        # busy
+        with override_settings(
+            PASSWORD_POOL={
+                "ENABLED": True,
+                "WORKERS": 1,
+                "MAX_QUEUE": 0,
+                "TIMEOUT": 0.5,
+            }
+        ):
+            with self.assertRaises(PasswordPoolSaturated):
+                self.pool.run(time.sleep, 2)
+
+        with self.assertRaises(PasswordPoolSaturated):
+            self.pool.run(os.getpid)
+        self.assertEqual(self.pool.stats()["rejected"], 1)
+        self.assertEqual(self.pool.stats()["in_flight"], 1)
+
+        # The slot is free again once the job is done
+        deadline = time.monotonic() + 30
+        while self.pool.stats()["in_flight"] and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertNotEqual(self.pool.run(os.getpid), os.getpid())
+        self.assertEqual(self.pool.stats()["completed"], 2)
+
+
+# Tests of the database connection pool, on a SQLite file of their own
+class ConnectionPoolTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "pool.sqlite3")
+        self.options = {"MIN_SIZE": 0, "MAX_SIZE": 1, "TIMEOUT": 0.2}
+
+    def connect(self, **options):
+        # Get a new pooled connection wrapper, every wrapper shares the pool
+        handler = ConnectionHandler(
+            {
+                "default": {
+                    "ENGINE": "backend.apps.core.db.sqlite3",
+                    "NAME": self.path,
+                    "POOL": {**self.options, **options},
+                }
+            }
+        )
+        wrapper = handler["default"]
+        self.addCleanup(close_pool, wrapper)
+        self.addCleanup(wrapper.close)
+        return wrapper
+
+    def test_checkout_times_out_when_the_pool_is_exhausted(self):
+        first, second = self.connect(), self.connect()
+        first.ensure_connection()
+
+        with self.assertRaises(OperationalError):
+            second.ensure_connection()
+        self.assertEqual(first.pool.stats()["timeouts"], 1)
+
+        # The connection is handed over once it is given back
+        raw = first.connection
+        first.close()
+        second.ensure_connection()
+        self.assertIs(second.connection, raw)
+
+    def test_connection_failing_the_check_is_replaced(self):
+        first, second = self.connect(CHECK_AFTER=0), self.connect(CHECK_AFTER=0)
+        first.ensure_connection()
+        raw = first.connection
+        first.close()
+
+        # The idle connection stops answering
+        raw.close()
+
+        with second.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            self.assertEqual(cursor.fetchone(), (1,))
+        self.assertIsNot(second.connection, raw)
+        stats = second.pool.stats()
+        self.assertEqual((stats["reconnects"], stats["size"]), (1, 1))
+
+    def test_connection_returned_in_a_transaction_is_not_reused(self):
+        first, second = self.connect(), self.connect()
+        with first.cursor() as cursor:
+            cursor.execute("CREATE TABLE lines (value INTEGER)")
+
+        # Given back with an uncommitted insert
+        first.set_autocommit(False)
+        with first.cursor() as cursor:
+            cursor.execute("INSERT INTO lines VALUES (1)")
+        raw = first.connection
+        first.close()
+        self.assertEqual(first.pool.stats()["size"], 0)
+
+        with second.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM lines")
+            self.assertEqual(cursor.fetchone(), (0,))
+        self.assertIsNot(second.connection, raw)
+
+    @skipUnless(hasattr(os, "fork"), "needs os.fork")
+    def test_forked_worker_starts_with_an_empty_pool(self):
+        parent = self.connect()
+        parent.ensure_connection()
+        raw = parent.connection
+        parent.close()
+        self.assertEqual(parent.pool.stats()["idle"], 1)
+
+        read, write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            # The child opens its own connection, never the parent's
+            try:
+                child = self.connect()
+                child.ensure_connection()
+                stats = child.pool.stats()
+                stats["reused"] = child.connection is raw
+                os.write(write, json.dumps(stats).encode())
+            finally:
+                os._exit(0)
+
+        os.close(write)
+        with os.fdopen(read) as pipe:
+            stats = json.loads(pipe.read() or "{}")
+        os.waitpid(pid, 0)
+
+        self.assertFalse(stats["reused"])
+        self.assertEqual(stats["connections_created"], 1)
+        self.assertEqual((stats["in_use"], stats["idle"]), (1, 0))
+        self.assertEqual(parent.pool.stats()["idle"], 1)
+
+
+# View creating a customer and then failing with a 5xx status
+class FailingCreateView(APIView):
+    permission_classes = [AllowAny]
+    calls = 0
+
+    @idempotent("failing_create")
+    def post(self, request):
+        FailingCreateView.calls += 1
+        Customer.objects.create(**customer_fields(request.data["number"]))
+        return Response({"error": "Upstream failed"}, status=503)
+
+
+# Tests of the Idempotency-Key header of the create endpoints
+class IdempotencyTests(TransactionTestCase):
+    def setUp(self):
+        allocator._reset()
+        self.user = User.objects.create_user(
+            username="cashier",
+            email="cashier@example.com",
+            password="secret",
+            first_name="Test",
+            last_name="Cashier",
+            phone_number="+91-9876543210",
+        )
+        employee = Employee.objects.create(
+            user=self.user,
+            address="1 Test Street",
+            department="Billing",
+            position="Cashier",
+            salary="1000.00",
+            hire_date=datetime.date(2020, 1, 1),
+        )
+        customer = Customer.objects.create(**customer_fields(0))
+        Item.objects.create(item_id="ITEM0001", name="Tea", price="10.00")
+        self.bill = {
+            "emp_id": employee.emp_id,
+            "cust_id": customer.cust_id,
+            "orders": [{"item_id": "ITEM0001", "quantity": 2}],
+        }
+
+    def create_bill(self, key, data=None):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.post(
+            reverse("bill_create"),
+            data or self.bill,
+            format="json",
+            HTTP_IDEMPOTENCY_KEY=key,
+        )
+        client.logout()
+        return response
+
+    def test_retry_replays_the_stored_response(self):
+        first = self.create_bill("retry")
+        self.assertEqual(first.status_code, 201)
+        self.assertNotIn("Idempotent-Replayed", first)
+
+        retry = self.create_bill("retry")
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(CheckoutBill.objects.count(), 1)
+
+    def test_same_key_with_other_data_is_rejected(self):
+        self.create_bill("reused")
+        other = {**self.bill, "orders": [{"item_id": "ITEM0001", "quantity": 3}]}
+
+        response = self.create_bill("reused", other)
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(CheckoutBill.objects.count(), 1)
+
+    def test_server_error_is_rolled_back_and_retried(self):
+        FailingCreateView.calls = 0
+        view = FailingCreateView.as_view()
+        factory = APIRequestFactory()
+
+        for _ in range(2):
+            request = factory.post(
+                "/", {"number": 1}, format="json", HTTP_IDEMPOTENCY_KEY="failing"
+            )
+            self.assertEqual(view(request).status_code, 503)
+
+        # Neither the work nor the key were kept, so the retry ran again
+        self.assertEqual(FailingCreateView.calls, 2)
+        self.assertEqual(Customer.objects.count(), 1)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_expired_key_can_be_reused(self):
+        self.create_bill("expired")
+        IdempotencyKey.objects.update(expires_at=timezone.now())
+
+        # Other data under the expired key makes a new bill
+        other = {**self.bill, "orders": [{"item_id": "ITEM0001", "quantity": 3}]}
+        response = self.create_bill("expired", other)
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn("Idempotent-Replayed", response)
+        self.assertEqual(CheckoutBill.objects.count(), 2)
+
+    def test_concurrent_requests_with_one_key_create_one_bill(self):
+        threads = 2
+        responses, errors = [], []
+        start = threading.Barrier(threads)
+
+        def create():
+            try:
+                start.wait()
+                responses.append(self.create_bill("concurrent"))
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connections.close_all()
+
+        workers = [threading.Thread(target=create) for _ in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual([response.status_code for response in responses], [201, 201])
+        self.assertEqual(
+            sorted(response.get("Idempotent-Replayed", "") for response in responses),
+            ["", "true"],
+        )
+        self.assertEqual(responses[0].json(), responses[1].json())
+        self.assertEqual(CheckoutBill.objects.count(), 1)
@@ -0,0 +1,296 @@
+# Imports
+import functools
+import threading
+import time
+from collections import namedtuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from .models import ThrottleBucket
+from .responses import json_response
+
+
+# Default settings for the throttles
+DEFAULTS = {
+    # Turn the throttling off without touching the throttle classes
+    "ENABLED": True,
+    # Database alias holding the token buckets
+    "DATABASE": DEFAULT_DB_ALIAS,
+    # Rates per username and scope that replace the default rates
+    "EMPLOYEE_RATES": {},
+    # Buckets unused for this many seconds are deleted
+    "PRUNE_AFTER": 86400,
+    # Checks made by a process between two prunes
+    "PRUNE_EVERY": 1000,
+}
+
+
+# Seconds in each period of a rate
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+# Read a throttle setting
+def get_setting(name):
+    return getattr(settings, "THROTTLE", {}).get(name, DEFAULTS[name])
+
+
+# Parse a rate written the DRF way (100/min, 10/hour)
+def parse_rate(rate):
+    num, period = rate.split("/")
+    return int(num), PERIODS[period[0]]
+
+
+# Outcome of a bucket check
+BucketState = namedtuple("BucketState", "allowed limit remaining reset wait")
+
+
+# Class for the token buckets shared by all the workers
+class TokenBucketStore:
+    """
+    Token buckets stored in the ThrottleBucket table.
+
+    A bucket holds up to `capacity` tokens and gains `rate` tokens a second.
+    Taking a token is one INSERT ... ON CONFLICT DO UPDATE statement on
+    PostgreSQL and SQLite, which refills the bucket from its last update and
+    takes the token only when one is left, so concurrent workers never race.
+    A refused request leaves the row untouched and costs one more SELECT to
+    know how long to wait.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checks = 0
+
+    def take(self, key, capacity, rate):
+        using = get_setting("DATABASE")
+        connection = connections[using]
+        now = time.time()
+
+        if connection.vendor in ("postgresql", "sqlite"):
+            tokens = self._take_upsert(connection, key, capacity, rate, now)
+        else:
+            tokens = self._take_locked(using, key, capacity, rate, now)
+
+        # Delete the buckets nobody used for a while now and then
+        with self._lock:
+            self._checks += 1
+            prune = self._checks % get_setting("PRUNE_EVERY") == 0
+        if prune:
+            self.prune(now - get_setting("PRUNE_AFTER"))
+
+        if tokens is not None:
+            return BucketState(
+                True, capacity, int(tokens), (capacity - tokens) / rate, 0.0
+            )
+
+        # Refused, read the bucket to know when the next token comes
+        row = (
+            ThrottleBucket.objects.using(using)
+            .values_list("tokens", "updated_at")
+            .filter(key=key)
+            .first()
+        )
+        tokens = capacity if row is None else self._refill(*row, capacity, rate, now)
+        return BucketState(
+            False,
+            capacity,
+            0,
+            (capacity - tokens) / rate,
+            max(0.0, (1 - tokens) / rate),
+        )
+
+    def _refill(self, tokens, updated_at, capacity, rate, now):
+        return min(capacity, tokens + max(0.0, now - updated_at) * rate)
+
+    def _take_upsert(self, connection, key, capacity, rate, now):
+        # Return the tokens left once one is taken, None when none was left
+        table = connection.ops.quote_name(ThrottleBucket._meta.db_table)
+        least, greatest = (
+            ("LEAST", "GREATEST")
+            if connection.vendor == "postgresql"
+            else ("MIN", "MAX")
+        )
+        refill = (
+            f"{least}(%s, {table}.tokens + "
+            f"{greatest}(0, excluded.updated_at - {table}.updated_at) * %s)"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} (key, tokens, updated_at) VALUES (%s, %s, %s) "
+                f"ON CONFLICT (key) DO UPDATE SET "
+                f"tokens = {refill} - 1, updated_at = excluded.updated_at "
+                f"WHERE {refill} >= 1 "
+                f"RETURNING tokens",
+                [key, capacity - 1, now, capacity, rate, capacity, rate],
+            )
+            row = cursor.fetchone()
+        return None if row is None else row[0]
+
+    def _take_locked(self, using, key, capacity, rate, now):
+        # Other databases lock the row for the read and the write
+        buckets = ThrottleBucket.objects.using(using)
+        with transaction.atomic(using=using):
+            bucket, created = buckets.select_for_update().get_or_create(
+                key=key, defaults={"tokens": capacity - 1, "updated_at": now}
+            )
+            if created:
+                return bucket.tokens
+            tokens = self._refill(bucket.tokens, bucket.updated_at, capacity, rate, now)
+            if tokens < 1:
+                return None
+            bucket.tokens, bucket.updated_at = tokens - 1, now
+            bucket.save(update_fields=["tokens", "updated_at"])
+            return bucket.tokens
+
+    def prune(self, before):
+        ThrottleBucket.objects.using(get_setting("DATABASE")).filter(
+            updated_at__lt=before
+        ).delete()
+
+
+# Shared token bucket store
+bucket_store = TokenBucketStore()
+
+
+# Base throttle taking its tokens from the shared buckets
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Token bucket throttle with the rates of DEFAULT_THROTTLE_RATES.
+
+    The rate of a scope can be replaced per employee with
+    THROTTLE["EMPLOYEE_RATES"] = {username: {scope: rate}}. The state of the
+    bucket is kept on the request for RateLimitHeadersMiddleware.
+    """
+
+    scope = None
+
+    def get_scope(self, request, view):
+        return self.scope
+
+    def get_client(self, request):
+        # Authenticated users are counted by user, the others by address
+        if request.user and request.user.is_authenticated:
+            return f"user:{request.user.pk}"
+        return f"anon:{self.get_ident(request)}"
+
+    def get_rate(self, request, scope):
+        user = request.user
+        if user and user.is_authenticated:
+            employee_rates = get_setting("EMPLOYEE_RATES").get(user.get_username(), {})
+            if scope in employee_rates:
+                return employee_rates[scope]
+        return api_settings.DEFAULT_THROTTLE_RATES.get(scope)
+
+    def allow_request(self, request, view):
+        self.state = None
+        if not get_setting("ENABLED"):
+            return True
+
+        # Views outside every configured scope are not throttled
+        scope = self.get_scope(request, view)
+        rate = self.get_rate(request, scope) if scope else None
+        if rate is None:
+            return True
+
+        num, duration = parse_rate(rate)
+        self.state = bucket_store.take(
+            f"{scope}:{self.get_client(request)}", num, num / duration
+        )
+
+        # Keep the most limiting state for the response headers
+        http_request = request._request
+        current = getattr(http_request, "rate_limit", None)
+        if current is None or (self.state.allowed, self.state.remaining) < (
+            current.allowed,
+            current.remaining,
+        ):
+            http_request.rate_limit = self.state
+        return self.state.allowed
+
+    def wait(self):
+        return self.state.wait if self.state else None
+
+
+# Throttle for every request, at the user rate or the anon rate
+class UserTokenBucketThrottle(TokenBucketThrottle):
+    def get_scope(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return "user"
+        return "anon"
+
+    def get_client(self, request):
+        # The scope already tells users and addresses apart
+        if request.user and request.user.is_authenticated:
+            return str(request.user.pk)
+        return self.get_ident(request)
+
+
+# Throttle for the views naming a throttle_scope
+class ScopedTokenBucketThrottle(TokenBucketThrottle):
+    def get_scope(self, request, view):
+        return getattr(view, "throttle_scope", None)
+
+
+# Run the throttles of a view on a plain Django request
+def check_throttles(view, request):
+    """
+    Authenticate the request and take a token from every throttle of the
+    view like APIView.initial does. Return None when the request may go on,
+    else the APIException the DRF view would have answered with.
+    """
+
+    authenticators = [auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+    drf_request = Request(request, authenticators=authenticators)
+    throttle_classes = getattr(
+        view, "throttle_classes", api_settings.DEFAULT_THROTTLE_CLASSES
+    )
+    try:
+        drf_request.user
+        waits = []
+        for throttle in [throttle() for throttle in throttle_classes]:
+            if not throttle.allow_request(drf_request, view):
+                waits.append(throttle.wait())
+    except exceptions.APIException as error:
+        # A bad token is answered with the challenge of the authenticator
+        if isinstance(error, exceptions.AuthenticationFailed) and authenticators:
+            error.auth_header = authenticators[0].authenticate_header(drf_request)
+        return error
+
+    if waits:
+        waits = [wait for wait in waits if wait is not None]
+        return exceptions.Throttled(max(waits, default=None))
+    return None
+
+
+# Decorator to throttle the async methods of the plain Django views
+def throttled(method):
+    """
+    Apply the throttle classes and throttle_scope of the view to an async
+    method, so the async endpoints share the buckets of their DRF views. The
+    checks run in the thread of the ORM calls, a refused request gets the
+    response of the DRF exception handler and RateLimitHeadersMiddleware
+    adds the rate limit headers.
+    """
+
+    @functools.wraps(method)
+    async def wrapper(self, request, *args, **kwargs):
+        error = await sync_to_async(check_throttles)(self, request)
+        if error is None:
+            return await method(self, request, *args, **kwargs)
+
+        headers = {}
+        if getattr(error, "auth_header", None):
+            headers["WWW-Authenticate"] = error.auth_header
+        if getattr(error, "wait", None):
+            headers["Retry-After"] = "%d" % error.wait
+        return json_response(
+            {"detail": error.detail}, status=error.status_code, headers=headers
+        )
+
+    return wrapper
@@ -0,0 +1,20 @@
+# Imports
+from django.urls import path
+from . import views
+
+
+# Set the url patterns for the core app
+urlpatterns = [
+    path("cache/stats/", views.CacheStatsView.as_view(), name="cache_stats"),
+    path(
+        "db/pool/stats/",
+        views.DatabasePoolStatsView.as_view(),
+        name="db_pool_stats",
+    ),
+    path(
+        "auth/pool/stats/",
+        views.PasswordPoolStatsView.as_view(),
+        name="password_pool_stats",
+    ),
+    path("metrics/", views.MetricsView.as_view(), name="metrics"),
+]
@@ -0,0 +1,55 @@
+# Imports
+from django.utils.http import parse_etags, quote_etag
+
+
+# Class to read the version of a row for the conditional requests
+class RowVersion:
+    """
+    ETag of a row built from its version columns, read with one query on the
+    primary key without loading or serializing the row. fields lists the
+    version of the row and of the related rows embedded in its response, as
+    values_list() paths.
+    """
+
+    def __init__(self, model, fields=("version",)):
+        self.model = model
+        self.fields = list(fields)
+
+    def etag(self, values):
+        return quote_etag("v" + ".".join(str(value) for value in values))
+
+    def of(self, instance):
+        # ETag of a loaded instance, following the related paths
+        values = []
+        for path in self.fields:
+            value = instance
+            for name in path.split("__"):
+                value = getattr(value, name)
+            values.append(value)
+        return self.etag(values)
+
+    def query(self, pk):
+        return self.model._default_manager.filter(pk=pk).values_list(*self.fields)
+
+    def get(self, pk):
+        # ETag of the row, None when it does not exist
+        row = self.query(pk).first()
+        return None if row is None else self.etag(row)
+
+    async def aget(self, pk):
+        row = await self.query(pk).afirst()
+        return None if row is None else self.etag(row)
+
+
+# Check an ETag against the If-None-Match header
+def etag_matches(request, etag):
+    etags = parse_etags(request.headers.get("If-None-Match", ""))
+    return etag in etags or "*" in etags
+
+
+# Check an ETag against the If-Match header, a request without it passes
+def precondition_failed(request, etag):
+    if "If-Match" not in request.headers:
+        return False
+    etags = parse_etags(request.headers["If-Match"])
+    return etag not in etags and "*" not in etags
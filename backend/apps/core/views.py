@@ -0,0 +1,107 @@
+# Imports
+from django.http import HttpResponse
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+
+from .cache import response_cache
+from .db.pool import pool_stats
+from .metrics import metrics_registry
+from .passwords import password_pool
+from .permissions import IsSuperUser
+from .swagger import openapi, swagger_auto_schema
+
+
+# Class based view to get the response cache counters
+class CacheStatsView(APIView):
+    # Set permission to superusers only
+    permission_classes = [IsSuperUser]
+
+    # Swagger settings
+    @swagger_auto_schema(
+        operation_id="cache_stats",
+        operation_description="Hit and miss counters of the response cache in this process",
+        responses={
+            status.HTTP_200_OK: openapi.Response(
+                description="Cache counters per resource",
+                schema=openapi.Schema(type=openapi.TYPE_OBJECT),
+            ),
+        },
+        tags=["Operations"],
+    )
+
+    # Get method to return the counters
+    def get(self, request):
+        return Response(response_cache.stats(), status=status.HTTP_200_OK)
+
+
+# Class based view to get the database connection pool stats
+class DatabasePoolStatsView(APIView):
+    # Set permission to superusers only
+    permission_classes = [IsSuperUser]
+
+    # Swagger settings
+    @swagger_auto_schema(
+        operation_id="db_pool_stats",
+        operation_description="Connections in use, idle, waits and reconnects of the database pools in this process",
+        responses={
+            status.HTTP_200_OK: openapi.Response(
+                description="Pool stats per database alias",
+                schema=openapi.Schema(type=openapi.TYPE_OBJECT),
+            ),
+        },
+        tags=["Operations"],
+    )
+
+    # Get method to return the stats
+    def get(self, request):
+        return Response(pool_stats(), status=status.HTTP_200_OK)
+
+
+# Class based view to get the password pool stats
+class PasswordPoolStatsView(APIView):
+    # Set permission to superusers only
+    permission_classes = [IsSuperUser]
+
+    # Swagger settings
+    @swagger_auto_schema(
+        operation_id="password_pool_stats",
+        operation_description="Workers, jobs in flight, rejections and job durations of the password pool in this process",
+        responses={
+            status.HTTP_200_OK: openapi.Response(
+                description="Password pool stats",
+                schema=openapi.Schema(type=openapi.TYPE_OBJECT),
+            ),
+        },
+        tags=["Operations"],
+    )
+
+    # Get method to return the stats
+    def get(self, request):
+        return Response(password_pool.stats(), status=status.HTTP_200_OK)
+
+
+# Class based view to export the request metrics for Prometheus
+class MetricsView(APIView):
+    # Set permission to superusers only
+    permission_classes = [IsSuperUser]
+
+    # Swagger settings
+    @swagger_auto_schema(
+        operation_id="metrics",
+        operation_description="Request latency histograms, query counts and slow queries per URL name and the password pool counters in this process, in the Prometheus text format",
+        responses={
+            status.HTTP_200_OK: openapi.Response(
+                description="Prometheus text exposition",
+                schema=openapi.Schema(type=openapi.TYPE_STRING),
+            ),
+        },
+        tags=["Operations"],
+    )
+
+    # Get method to return the metrics
+    def get(self, request):
+        return HttpResponse(
+            metrics_registry.prometheus() + password_pool.prometheus(),
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )
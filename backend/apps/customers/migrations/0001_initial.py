@@ -0,0 +1,77 @@
+# Generated by Django 4.2.11 on 2026-10-18 14:29
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="Customer",
+            fields=[
+                (
+                    "cust_id",
+                    models.CharField(
+                        editable=False,
+                        max_length=10,
+                        primary_key=True,
+                        serialize=False,
+                        unique=True,
+                        verbose_name="Customer ID",
+                    ),
+                ),
+                (
+                    "username",
+                    models.CharField(
+                        max_length=150, unique=True, verbose_name="Username"
+                    ),
+                ),
+                (
+                    "email",
+                    models.EmailField(
+                        error_messages={
+                            "unique": "A user with this email already exists!"
+                        },
+                        max_length=254,
+                        unique=True,
+                        verbose_name="Email",
+                    ),
+                ),
+                (
+                    "first_name",
+                    models.CharField(max_length=30, verbose_name="First Name"),
+                ),
+                (
+                    "last_name",
+                    models.CharField(max_length=30, verbose_name="Last Name"),
+                ),
+                (
+                    "phone_number",
+                    models.CharField(
+                        max_length=15,
+                        validators=[
+                            django.core.validators.RegexValidator(
+                                message="Phone number must be entered in the format: '+[Country Code]-[Phone Number]'. Country code should be 1 to 3 digits and phone number should be between 9 to 15 digits.",
+                                regex="^\\+\\d{1,3}\\-\\d{9,15}$",
+                            )
+                        ],
+                        verbose_name="Phone Number",
+                    ),
+                ),
+                ("address", models.CharField(max_length=255, verbose_name="Address")),
+                (
+                    "is_active",
+                    models.BooleanField(default=True, verbose_name="Is Active"),
+                ),
+            ],
+            options={
+                "verbose_name": "Customer",
+                "verbose_name_plural": "Customers",
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.11 on 2026-10-18 14:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("customers", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="customer",
+            name="cust_id",
+            field=models.CharField(
+                editable=False,
+                max_length=20,
+                primary_key=True,
+                serialize=False,
+                unique=True,
+                verbose_name="Customer ID",
+            ),
+        ),
+        migrations.AddField(
+            model_name="customer",
+            name="search_text",
+            field=models.TextField(
+                blank=True, default="", editable=False, verbose_name="Search Text"
+            ),
+        ),
+    ]
@@ -0,0 +1,36 @@
+from django.db import migrations
+
+from backend.apps.customers.models import build_search_text
+
+
+# Fill the search text of customers saved before the column existed
+def backfill_search_text(apps, schema_editor, batch_size=1000):
+    Customer = apps.get_model("customers", "Customer")
+    customers = Customer.objects.using(schema_editor.connection.alias)
+
+    batch = []
+    for customer in customers.filter(search_text="").iterator(chunk_size=batch_size):
+        customer.search_text = build_search_text(
+            customer.first_name,
+            customer.last_name,
+            customer.username,
+            customer.email,
+            customer.phone_number,
+        )
+        batch.append(customer)
+        if len(batch) >= batch_size:
+            customers.bulk_update(batch, ["search_text"])
+            batch = []
+    if batch:
+        customers.bulk_update(batch, ["search_text"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("customers", "0002_widen_cust_id_search_text"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_text, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+from django.db import migrations
+
+from backend.apps.core.db.migrations import RunSQLOnPostgres
+
+
+class Migration(migrations.Migration):
+
+    # The index is built concurrently on PostgreSQL
+    atomic = False
+
+    dependencies = [
+        ("customers", "0003_backfill_search_text"),
+    ]
+
+    operations = [
+        # Trigram index used by the customer search, the other databases
+        # search with the in-process index
+        RunSQLOnPostgres(
+            sql=[
+                "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS "
+                "customers_customer_search_trgm "
+                "ON customers_customer USING gin (search_text gin_trgm_ops)",
+            ],
+            reverse_sql=[
+                "DROP INDEX CONCURRENTLY IF EXISTS customers_customer_search_trgm",
+            ],
+        ),
+    ]
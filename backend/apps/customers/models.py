@@ -4,13 +4,23 @@ from django.contrib.auth import get_user_model
 from django.core.validators import RegexValidator
 from django.utils.translation import gettext_lazy as _
 
+from backend.apps.core.ids import next_id
+from backend.apps.core.models import VersionedModel
+
 
 # Get the user model
 User = get_user_model()
 
 
+# Build the normalized text the customer search matches against
+def build_search_text(first_name, last_name, username, email, phone_number):
+    # Keep only the digits of the phone number so any formatting matches
+    phone_digits = "".join(char for char in phone_number if char.isdigit())
+    return " ".join([first_name, last_name, username, email, phone_digits]).lower()
+
+
 # Class based model for the Customer
-class Customer(models.Model):
+class Customer(VersionedModel):
     """
     Model for storing information about customers.
     Attributes:
@@ -22,10 +32,16 @@ class Customer(models.Model):
         phone_number (CharField): A CharField that stores the customer's phone number.
         address (CharField): A CharField that stores the customer's address.
         is_active (BooleanField): A BooleanField that indicates whether the customer is currently active or not.
+        search_text (TextField): A TextField that stores the normalized names, email and phone digits used by the search.
+        version (PositiveIntegerField): A PositiveIntegerField that stores the number of saves of the customer.
+        updated_at (DateTimeField): A DateTimeField that stores when the customer was last saved.
     """
 
+    # Prefix used by the ID allocator
+    id_prefix = "CUST"
+
     cust_id = models.CharField(
-        max_length=10,
+        max_length=20,
         primary_key=True,
         verbose_name=_("Customer ID"),
         unique=True,
@@ -69,6 +85,12 @@ class Customer(models.Model):
         default=True,
         verbose_name=_("Is Active"),
     )
+    search_text = models.TextField(
+        blank=True,
+        default="",
+        editable=False,
+        verbose_name=_("Search Text"),
+    )
 
     # Meta class for the User model
     class Meta:
@@ -79,22 +101,21 @@ class Customer(models.Model):
         return f"{self.first_name} {self.last_name}"
 
     def save(self, *args, **kwargs):
+        # Update the text used by the customer search
+        self.search_text = build_search_text(
+            self.first_name,
+            self.last_name,
+            self.username,
+            self.email,
+            self.phone_number,
+        )
+
         # Generate cust_id if it's not set
         if not self.cust_id:
-            # Get the last employee
-            last_employee = Customer.objects.order_by().last()
-
-            # If there is a last employee, generate a new cust_id
-            if last_employee:
-                last_id = int(last_employee.cust_id[4:])  # Extract numeric part
-                new_id = f"CUST{str(last_id + 1).zfill(4)}"  # Increment and format
-
-            # If there is no last employee, set cust_id to CUST0001
-            else:
-                new_id = "CUST0001"  # Initial ID
+            self.cust_id = next_id(Customer, using=kwargs.get("using"))
 
-            # Set the cust_id
-            self.cust_id = new_id
+            # The key is new, skip the update attempt
+            kwargs.setdefault("force_insert", True)
 
         # Call the save method of the parent class
         super().save(*args, **kwargs)
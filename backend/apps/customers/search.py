@@ -0,0 +1,340 @@
+# Imports
+import heapq
+import logging
+import re
+import threading
+from bisect import bisect_left, insort
+from collections import Counter, defaultdict
+from itertools import repeat
+
+from django.db import connections, router
+from django.db.models import F, Q
+
+from .models import Customer
+
+
+# Get the logger
+logger = logging.getLogger(__name__)
+
+# Trigrams found in more words than this are not used for fuzzy matching
+MAX_POSTING = 20000
+
+# Words looked at per query token for prefix matches
+MAX_PREFIX_WORDS = 1000
+
+# Customers scored per query before the best ones found are returned
+MAX_CANDIDATES = 5000
+
+# Lowest trigram score a match needs
+MIN_SCORE = 0.3
+
+# Digits of a phone number also indexed without the country code
+NATIONAL_DIGITS = 10
+
+
+# Pattern of a word
+WORD = re.compile(r"[^\W_]+")
+
+
+# Split a text into lowercase words
+def tokenize(text):
+    return WORD.findall(text.lower())
+
+
+# Get the words of a search query
+def query_tokens(query):
+    # A phone number is matched on its digits whatever its formatting
+    digits = "".join(char for char in query if char.isdigit())
+    if len(digits) >= 3 and not any(char.isalpha() for char in query):
+        return [digits]
+    return tokenize(query)
+
+
+# Get the indexed words of a customer's search text
+def document_words(search_text):
+    words = set(tokenize(search_text))
+
+    # Phone numbers are typed with or without the country code
+    numbers = [word for word in words if len(word) > NATIONAL_DIGITS]
+    for word in numbers:
+        if word.isdigit():
+            words.add(word[-NATIONAL_DIGITS:])
+    return tuple(words)
+
+
+# Get the trigrams of a word, padded the way pg_trgm pads them
+def trigrams(token):
+    padded = f"  {token} "
+    return {padded[index : index + 3] for index in range(len(padded) - 2)}
+
+
+# Check whether a word is matched on its trigrams, numbers and IDs are not
+def is_fuzzy(word):
+    return word.isalpha()
+
+
+# Class for the in-process n-gram index of the customers
+class CustomerSearchIndex:
+    """
+    In-process word and trigram index over the customer search text, used on
+    databases without trigram indexes (SQLite).
+
+    Each word keeps the sorted IDs of the customers using it, and each trigram
+    the words containing it, so fuzzy matching works on the vocabulary rather
+    than on every customer. A query token scores 2.0 on a customer with the
+    same word, 1.5 on a word it prefixes and the trigram similarity with the
+    closest word otherwise. The customers of each token are read best first
+    and the scan stops once no unread customer can enter the top `limit`.
+
+    The index is built from one scan of the customers when the worker starts
+    and then kept up to date by the post_save / post_delete receivers once
+    the change commits, so it only sees the changes made by this process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self.built = False
+
+    def _reset(self):
+        self.documents = {}
+        self.postings = {}
+        self.vocabulary = []
+        self.grams = defaultdict(set)
+
+    def build(self, using=None):
+        with self._lock:
+            self._reset()
+            postings = defaultdict(list)
+            rows = (
+                Customer.objects.using(using)
+                .values_list("cust_id", "search_text")
+                .iterator(chunk_size=5000)
+            )
+            for cust_id, search_text in rows:
+                words = document_words(search_text)
+                self.documents[cust_id] = words
+                for word in words:
+                    postings[word].append(cust_id)
+
+            # Sort the customers of each word and index the words
+            for cust_ids in postings.values():
+                cust_ids.sort()
+            self.postings = dict(postings)
+            self.vocabulary = sorted(self.postings)
+            for word in self.vocabulary:
+                if is_fuzzy(word):
+                    for gram in trigrams(word):
+                        self.grams[gram].add(word)
+            self.built = True
+
+    def ensure_built(self, using=None):
+        # Build the index once, waiting for a build already running
+        with self._build_lock:
+            if not self.built:
+                self.build(using)
+
+    def update(self, cust_id, search_text):
+        # Nothing to do until the index is built
+        if not self.built:
+            return
+        with self._lock:
+            self._remove(cust_id)
+            self._add(cust_id, search_text)
+
+    def remove(self, cust_id):
+        if not self.built:
+            return
+        with self._lock:
+            self._remove(cust_id)
+
+    def _add_word(self, word, cust_ids):
+        self.postings[word] = cust_ids
+        insort(self.vocabulary, word)
+        if is_fuzzy(word):
+            for gram in trigrams(word):
+                self.grams[gram].add(word)
+
+    def _add(self, cust_id, search_text):
+        words = document_words(search_text)
+        self.documents[cust_id] = words
+        for word in words:
+            if word in self.postings:
+                insort(self.postings[word], cust_id)
+            else:
+                self._add_word(word, [cust_id])
+
+    def _remove(self, cust_id):
+        for word in self.documents.pop(cust_id, ()):
+            cust_ids = self.postings[word]
+            del cust_ids[bisect_left(cust_ids, cust_id)]
+            if cust_ids:
+                continue
+
+            # Drop the words no customer uses anymore
+            del self.postings[word]
+            del self.vocabulary[bisect_left(self.vocabulary, word)]
+            if is_fuzzy(word):
+                for gram in trigrams(word):
+                    self.grams[gram].discard(word)
+
+    def search(self, query, limit, using=None):
+        """
+        Return up to `limit` (cust_id, score) pairs, best match first.
+        """
+
+        # Build the index in the processes that did not warm it up
+        if not self.built:
+            self.ensure_built(using)
+
+        tokens = query_tokens(query)
+        if not tokens:
+            return []
+
+        with self._lock:
+            matches = [self._match(token) for token in tokens]
+            streams = [self._stream(words) for words in matches]
+            bounds = [2.0] * len(tokens)
+            best, seen = [], set()
+
+            while any(streams) and len(seen) < MAX_CANDIDATES:
+                # Read the next customer of each token, best first
+                for index, stream in enumerate(streams):
+                    if stream is None:
+                        continue
+                    entry = next(stream, None)
+                    if entry is None:
+                        streams[index], bounds[index] = None, 0.0
+                        continue
+                    bounds[index], cust_id = entry
+                    if cust_id in seen:
+                        continue
+                    seen.add(cust_id)
+
+                    # Average the best score of the customer's words per token
+                    words = self.documents[cust_id]
+                    score = sum(
+                        max(map(scores.get, words, repeat(0))) for scores in matches
+                    ) / len(tokens)
+                    if len(best) < limit:
+                        heapq.heappush(best, (score, cust_id))
+                    else:
+                        heapq.heappushpop(best, (score, cust_id))
+
+                # No unread customer can score more than the last ones read
+                if len(best) == limit and best[0][0] >= sum(bounds) / len(tokens):
+                    break
+
+        return [(cust_id, score) for score, cust_id in sorted(best, reverse=True)]
+
+    def _stream(self, scores):
+        # Yield (score, cust_id) for the customers using the matched words,
+        # best score first and then the highest ID
+        levels = defaultdict(list)
+        for word, score in scores.items():
+            levels[score].append(reversed(self.postings[word]))
+        for score in sorted(levels, reverse=True):
+            for cust_id in heapq.merge(*levels[score], reverse=True):
+                yield score, cust_id
+
+    def _match(self, token):
+        # Get the score of every word matching a token, the word itself first
+        scores = {token: 2.0} if token in self.postings else {}
+
+        # Words starting with the token
+        index = bisect_left(self.vocabulary, token)
+        for word in self.vocabulary[index : index + MAX_PREFIX_WORDS + 1]:
+            if not word.startswith(token):
+                break
+            scores.setdefault(word, 1.5)
+
+        # Words sharing enough trigrams with the token, only common trigrams
+        # are left out
+        if not is_fuzzy(token):
+            return scores
+        grams = trigrams(token)
+        shared = Counter()
+        for gram in grams:
+            posting = self.grams.get(gram, ())
+            if len(posting) <= MAX_POSTING:
+                shared.update(posting)
+        for word, count in shared.items():
+            if count >= MIN_SCORE * len(grams):
+                scores.setdefault(word, count / len(grams))
+        return scores
+
+
+# Shared in-process index
+search_index = CustomerSearchIndex()
+
+
+# Build the in-process index when a worker starts
+def warm_up(background=False):
+    """
+    Called when a worker starts so the first search does not pay for the
+    scan of the customers. Nothing is built on PostgreSQL, which searches
+    with its trigram index. In the background the worker serves requests
+    while the index is built and a search waits for it. Failures are logged
+    and left to the first search.
+    """
+
+    using = router.db_for_read(Customer)
+    if connections[using].vendor == "postgresql":
+        return
+    if background:
+        threading.Thread(
+            target=build_index, args=(using, True), name="search-warm-up", daemon=True
+        ).start()
+    else:
+        build_index(using)
+
+
+# Build the in-process index, closing the connection of a warm-up thread
+def build_index(using, close=False):
+    try:
+        search_index.ensure_built(using)
+    except Exception:
+        logger.exception("Could not build the customer search index")
+    finally:
+        if close:
+            connections[using].close()
+
+
+# Customers matching a search term on PostgreSQL, best match first
+def trigram_queryset(term, using):
+    from django.contrib.postgres.lookups import TrigramWordSimilar
+    from django.contrib.postgres.search import TrigramWordSimilarity
+
+    return (
+        Customer.objects.using(using)
+        .filter(
+            Q(search_text__contains=term)
+            | Q(TrigramWordSimilar(F("search_text"), term))
+        )
+        .annotate(score=TrigramWordSimilarity(term, "search_text"))
+        .order_by("-score", "cust_id")
+    )
+
+
+# Find customers by name, username, email or phone number
+def find_customers(query, limit=10):
+    """
+    Return up to `limit` customers matching the query, best match first.
+    Uses the pg_trgm index on PostgreSQL and the in-process index elsewhere.
+    """
+
+    using = router.db_for_read(Customer)
+
+    # Rank with the trigram word similarity on PostgreSQL
+    if connections[using].vendor == "postgresql":
+        term = " ".join(query_tokens(query))
+        if not term:
+            return []
+        return list(trigram_queryset(term, using)[:limit])
+
+    # Rank with the in-process index elsewhere
+    ranked = search_index.search(query, limit, using=using)
+    customers = Customer.objects.using(using).in_bulk(
+        [cust_id for cust_id, _ in ranked]
+    )
+    return [customers[cust_id] for cust_id, _ in ranked if cust_id in customers]
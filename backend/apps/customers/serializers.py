@@ -1,6 +1,10 @@
 # Imports
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+
+from backend.apps.core.serializers import ValuesSerializer
+from backend.apps.core.versioning import RowVersion
+
 from .models import Customer
 
 
@@ -24,6 +28,14 @@ class CustomerSearchSerializer(serializers.ModelSerializer):
         ]
 
 
+# Read-only serializer of the customers from values() rows, same output as above
+customer_values = ValuesSerializer(CustomerSearchSerializer)
+
+
+# Version of the customer rows, the ETag of the search responses
+customer_version = RowVersion(Customer)
+
+
 class CustomerCreateSerializer(serializers.ModelSerializer):
     # Meta class for the CustomerCreateSerializer
     class Meta:
@@ -73,3 +85,9 @@ class CustomerUpdateSerializer(serializers.ModelSerializer):
         instance.is_active = validated_data.get("is_active", instance.is_active)
         instance.save()
         return instance
+
+
+class CustomerFindSerializer(serializers.Serializer):
+    # Query parameters of the customer find endpoint
+    q = serializers.CharField(min_length=2, max_length=100)
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=10)
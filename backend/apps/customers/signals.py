@@ -0,0 +1,33 @@
+# Imports
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from backend.apps.core.cache import response_cache
+
+from .models import Customer
+from .search import search_index
+
+
+# Drop the cached search response of a changed customer
+@receiver(post_save, sender=Customer)
+@receiver(post_delete, sender=Customer)
+def invalidate_customer(sender, instance, **kwargs):
+    response_cache.invalidate("customer", instance.cust_id)
+
+
+# Keep the in-process search index up to date once the change commits
+@receiver(post_save, sender=Customer)
+def index_customer(sender, instance, using, **kwargs):
+    transaction.on_commit(
+        partial(search_index.update, instance.cust_id, instance.search_text),
+        using=using,
+    )
+
+
+# Remove a deleted customer from the in-process search index once it commits
+@receiver(post_delete, sender=Customer)
+def unindex_customer(sender, instance, using, **kwargs):
+    transaction.on_commit(partial(search_index.remove, instance.cust_id), using=using)
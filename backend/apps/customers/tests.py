@@ -0,0 +1,86 @@
+# Imports
+from django.db import transaction
+from django.test import TestCase
+
+from .models import Customer
+from .search import find_customers, search_index, warm_up
+
+
+# Create a customer with the given names and phone number
+def create_customer(first_name, last_name, phone_number="+91-9876543210"):
+    username = f"{first_name}.{last_name}".lower()
+    return Customer.objects.create(
+        username=username,
+        email=f"{username}@example.com",
+        first_name=first_name,
+        last_name=last_name,
+        phone_number=phone_number,
+        address="1 Test Street",
+    )
+
+
+# Tests of the in-process customer search index
+class CustomerSearchIndexTests(TestCase):
+    def setUp(self):
+        # Build the index from this test's customers as a worker start does
+        self.rohit = create_customer("Rohit", "Rao", "+91-6369745767")
+        self.rohan = create_customer("Rohan", "Rao", "+91-7026217988")
+        self.priya = create_customer("Priya", "Sharma", "+91-9443393069")
+        search_index.built = False
+        warm_up()
+
+    def find(self, query, limit=10):
+        return [customer.cust_id for customer in find_customers(query, limit)]
+
+    def test_exact_word_ranks_before_prefix_and_fuzzy(self):
+        self.assertEqual(self.find("rohit")[0], self.rohit.cust_id)
+        self.assertEqual(
+            set(self.find("roh")), {self.rohit.cust_id, self.rohan.cust_id}
+        )
+        self.assertEqual(self.find("rohitt rao")[0], self.rohit.cust_id)
+
+    def test_all_words_of_the_query_count(self):
+        self.assertEqual(self.find("rohan rao")[0], self.rohan.cust_id)
+        self.assertEqual(self.find("priya sharma"), [self.priya.cust_id])
+
+    def test_phone_number_with_or_without_country_code(self):
+        self.assertEqual(self.find("+91 63697 45767"), [self.rohit.cust_id])
+        self.assertEqual(self.find("6369745767"), [self.rohit.cust_id])
+        self.assertEqual(self.find("70262"), [self.rohan.cust_id])
+
+    def test_limit_keeps_the_best_matches(self):
+        # Ties go to the highest ID
+        self.assertEqual(self.find("rao", limit=1), [self.rohan.cust_id])
+
+    def test_index_is_built_by_the_warm_up(self):
+        cust_ids = Customer.objects.values_list("cust_id", flat=True)
+        self.assertTrue(search_index.built)
+        self.assertEqual(set(search_index.documents), set(cust_ids))
+
+    def test_saved_and_deleted_customers_are_reindexed(self):
+        # The receivers update the built index once the changes commit
+        with self.captureOnCommitCallbacks(execute=True):
+            self.priya.last_name = "Rao"
+            self.priya.save()
+            self.rohit.delete()
+
+        self.assertEqual(
+            set(self.find("rao")), {self.rohan.cust_id, self.priya.cust_id}
+        )
+        self.assertEqual(self.find("rohit"), [self.rohan.cust_id])
+
+    def test_rolled_back_change_is_not_indexed(self):
+        rohit = self.rohit.cust_id
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    self.priya.last_name = "Rao"
+                    self.priya.save()
+                    self.rohit.delete()
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+
+        self.assertEqual(self.find("priya"), [self.priya.cust_id])
+        self.assertEqual(self.find("rohit")[0], rohit)
+        self.assertNotIn(self.priya.cust_id, self.find("rao"))
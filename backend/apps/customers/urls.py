@@ -5,11 +5,17 @@ from . import views
 
 # Set the url patterns for the customers app
 urlpatterns = [
+    path("find/", views.CustomerFindView.as_view(), name="find_customer"),
     path(
         "search/<str:cust_id>/",
         views.CustomerSearchView.as_view(),
         name="search_customer",
     ),
+    path(
+        "async/search/<str:cust_id>/",
+        views.CustomerSearchAsyncView.as_view(),
+        name="search_customer_async",
+    ),
     path("create/", views.CustomerCreateView.as_view(), name="create_customer"),
     path(
         "update/<str:cust_id>/",
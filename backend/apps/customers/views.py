@@ -1,21 +1,33 @@
 # Imports
+from django.db import transaction
+from django.views import View
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 
-from drf_yasg import openapi
-from drf_yasg.utils import swagger_auto_schema
+from backend.apps.core.cache import cached_response
+from backend.apps.core.responses import json_response
+from backend.apps.core.swagger import openapi, swagger_auto_schema
+from backend.apps.core.throttling import throttled
+from backend.apps.core.versioning import precondition_failed
 
 from .models import Customer
+from .search import find_customers
 from .serializers import (
+    CustomerFindSerializer,
     CustomerSearchSerializer,
     CustomerCreateSerializer,
     CustomerUpdateSerializer,
+    customer_values,
+    customer_version,
 )
 
 
 # Class based view to search the customer
 class CustomerSearchView(APIView):
+    # Throttle scope of the view
+    throttle_scope = "search"
+
     # Swagger settings
     @swagger_auto_schema(
         operation_id="customer_search",
@@ -28,12 +40,13 @@ class CustomerSearchView(APIView):
         },
         tags=["Customer"],
     )
+    @cached_response("customer", "cust_id", customer_version)
     def get(self, request, cust_id):
         try:
-            customer = CustomerSearchSerializer(Customer.objects.get(cust_id=cust_id))
+            customer = customer_values.get(Customer.objects.all(), cust_id=cust_id)
 
             return Response(
-                customer.data,
+                customer,
                 status=status.HTTP_200_OK,
             )
         except Customer.DoesNotExist:
@@ -43,6 +56,69 @@ class CustomerSearchView(APIView):
             )
 
 
+# Class based view to search the customer without blocking the worker
+class CustomerSearchAsyncView(View):
+    # Throttle scope of the view
+    throttle_scope = "search"
+
+    # Get method to search the customer with the async ORM
+    @throttled
+    @cached_response("customer", "cust_id", customer_version)
+    async def get(self, request, cust_id):
+        try:
+            customer = await customer_values.aget(
+                Customer.objects.all(), cust_id=cust_id
+            )
+        except Customer.DoesNotExist:
+            return json_response(
+                {"error": "Customer not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        return json_response(customer)
+
+
+# Class based view to find customers by name, username, email or phone number
+class CustomerFindView(APIView):
+    # Throttle scope of the view
+    throttle_scope = "search"
+
+    # Swagger settings
+    @swagger_auto_schema(
+        operation_id="customer_find",
+        query_serializer=CustomerFindSerializer,
+        responses={
+            status.HTTP_200_OK: openapi.Response(
+                description="Matching customers, best match first",
+                schema=CustomerSearchSerializer(many=True),
+            ),
+            status.HTTP_400_BAD_REQUEST: "Invalid Query",
+        },
+        tags=["Customer"],
+    )
+
+    # Get method to find the customers matching a query
+    def get(self, request):
+        # Validate the query parameters
+        serializer = CustomerFindSerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(
+                serializer.errors,
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # Get the ranked matches
+        customers = find_customers(
+            serializer.validated_data["q"],
+            limit=serializer.validated_data["limit"],
+        )
+
+        return Response(
+            {"results": CustomerSearchSerializer(customers, many=True).data},
+            status=status.HTTP_200_OK,
+        )
+
+
 # Class based view to create the customer
 class CustomerCreateView(APIView):
     # Swagger settings
@@ -116,15 +192,26 @@ class CustomerUpdateView(APIView):
             ),
             status.HTTP_400_BAD_REQUEST: "Invalid Data",
             status.HTTP_404_NOT_FOUND: "Customer not found",
+            status.HTTP_412_PRECONDITION_FAILED: "Customer changed since If-Match",
         },
         tags=["Customer"],
     )
 
     # Put method to update an customer
+    @transaction.atomic
     def put(self, request, cust_id):
         try:
-            # Get the customer
-            customer = Customer.objects.get(cust_id=cust_id)
+            # Get the customer, locked until the update is committed
+            customer = Customer.objects.select_for_update().get(cust_id=cust_id)
+
+            # The client updates a version that is not the current one
+            etag = customer_version.of(customer)
+            if precondition_failed(request, etag):
+                return Response(
+                    {"error": "Customer was changed by another request"},
+                    status=status.HTTP_412_PRECONDITION_FAILED,
+                    headers={"ETag": etag},
+                )
 
             # Serialize the data
             serializer = CustomerUpdateSerializer(customer, data=request.data)
@@ -138,6 +225,7 @@ class CustomerUpdateView(APIView):
                 return Response(
                     serializer.data,
                     status=status.HTTP_200_OK,
+                    headers={"ETag": customer_version.of(customer)},
                 )
 
             # Else return the errors
@@ -6,3 +6,7 @@ from django.apps import AppConfig
 class EmployeesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "backend.apps.employees"
+
+    # Connect the signal receivers
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,50 @@
+# Generated by Django 4.2.11 on 2026-10-18 14:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="Employee",
+            fields=[
+                (
+                    "emp_id",
+                    models.CharField(
+                        editable=False,
+                        max_length=10,
+                        primary_key=True,
+                        serialize=False,
+                        unique=True,
+                        verbose_name="Employee ID",
+                    ),
+                ),
+                ("address", models.CharField(max_length=255, verbose_name="Address")),
+                (
+                    "department",
+                    models.CharField(max_length=100, verbose_name="Department"),
+                ),
+                ("position", models.CharField(max_length=100, verbose_name="Position")),
+                (
+                    "salary",
+                    models.DecimalField(
+                        decimal_places=2, max_digits=10, verbose_name="Salary"
+                    ),
+                ),
+                ("hire_date", models.DateField(verbose_name="Hire Date")),
+                (
+                    "is_active",
+                    models.BooleanField(default=True, verbose_name="Is Active"),
+                ),
+            ],
+            options={
+                "verbose_name": "Employee",
+                "verbose_name_plural": "Employees",
+            },
+        ),
+    ]
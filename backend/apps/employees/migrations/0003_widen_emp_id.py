@@ -0,0 +1,25 @@
+# Generated by Django 4.2.11 on 2026-10-18 14:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("employees", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="employee",
+            name="emp_id",
+            field=models.CharField(
+                editable=False,
+                max_length=20,
+                primary_key=True,
+                serialize=False,
+                unique=True,
+                verbose_name="Employee ID",
+            ),
+        ),
+    ]
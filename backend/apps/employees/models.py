@@ -3,13 +3,16 @@ from django.db import models
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
 
+from backend.apps.core.ids import next_id
+from backend.apps.core.models import VersionedModel
+
 
 # Get the user model
 User = get_user_model()
 
 
 # Class based model for the Employee
-class Employee(models.Model):
+class Employee(VersionedModel):
     """
     Model for storing information about employees.
     Attributes:
@@ -21,10 +24,15 @@ class Employee(models.Model):
         salary (DecimalField): A DecimalField that stores the employee's salary.
         hire_date (DateField): A DateField that stores the employee's hire date.
         is_active (BooleanField): A BooleanField that indicates whether the employee is currently active or not.
+        version (PositiveIntegerField): A PositiveIntegerField that stores the number of saves of the employee.
+        updated_at (DateTimeField): A DateTimeField that stores when the employee was last saved.
     """
 
+    # Prefix used by the ID allocator
+    id_prefix = "EMP"
+
     emp_id = models.CharField(
-        max_length=10,
+        max_length=20,
         primary_key=True,
         verbose_name=_("Employee ID"),
         unique=True,
@@ -64,20 +72,10 @@ class Employee(models.Model):
     def save(self, *args, **kwargs):
         # Generate emp_id if it's not set
         if not self.emp_id:
-            # Get the last employee
-            last_employee = Employee.objects.order_by().last()
-
-            # If there is a last employee, generate a new emp_id
-            if last_employee:
-                last_id = int(last_employee.emp_id[3:])  # Extract numeric part
-                new_id = f"EMP{str(last_id + 1).zfill(4)}"  # Increment and format
-
-            # If there is no last employee, set emp_id to EMP0001
-            else:
-                new_id = "EMP0001"  # Initial ID
+            self.emp_id = next_id(Employee, using=kwargs.get("using"))
 
-            # Set the emp_id
-            self.emp_id = new_id
+            # The key is new, skip the update attempt
+            kwargs.setdefault("force_insert", True)
 
         # Call the save method of the parent class
         super().save(*args, **kwargs)
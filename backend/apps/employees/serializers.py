@@ -1,6 +1,10 @@
 # Imports
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+
+from backend.apps.core.serializers import ValuesSerializer
+from backend.apps.core.versioning import RowVersion
+
 from .models import Employee
 
 
@@ -42,6 +46,15 @@ class EmployeeSearchSerializer(serializers.ModelSerializer):
         ]
 
 
+# Read-only serializer of the employees from values() rows, same output as above
+employee_values = ValuesSerializer(EmployeeSearchSerializer)
+
+
+# Version of the employee rows, the search responses embed the user so its
+# version is part of the ETag
+employee_version = RowVersion(Employee, ["version", "user__version"])
+
+
 class EmployeeCreateSerializer(serializers.ModelSerializer):
     # Nested serializer for user creation
     user = UserSerializer()
@@ -135,3 +148,10 @@ class EmployeeUpdateSerializer(serializers.ModelSerializer):
 
         # Return the updated employee data
         return instance
+
+
+# Serializer for the response of the employee login
+class EmployeeLoginSerializer(serializers.Serializer):
+    access = serializers.CharField()
+    refresh = serializers.CharField()
+    employee = EmployeeSearchSerializer()
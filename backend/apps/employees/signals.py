@@ -0,0 +1,29 @@
+# Imports
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from backend.apps.core.cache import response_cache
+
+from .models import Employee
+
+
+# Get the user model
+User = get_user_model()
+
+
+# Drop the cached search response of a changed employee
+@receiver(post_save, sender=Employee)
+@receiver(post_delete, sender=Employee)
+def invalidate_employee(sender, instance, **kwargs):
+    response_cache.invalidate("employee", instance.emp_id)
+
+
+# The employee response embeds the user, drop it when the user changes
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_employee_user(sender, instance, **kwargs):
+    response_cache.invalidate(
+        "employee",
+        *Employee.objects.filter(user_id=instance.pk).values_list("emp_id", flat=True),
+    )
@@ -0,0 +1,93 @@
+# Imports
+import datetime
+import time
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from backend.apps.core.passwords import PasswordPoolSaturated, password_pool
+
+from .models import Employee
+
+
+# Get the user model
+User = get_user_model()
+
+
+# Tests of the employee login, with the passwords checked in the password pool
+@override_settings(
+    PASSWORD_POOL={"ENABLED": True, "WORKERS": 1, "MAX_QUEUE": 0, "TIMEOUT": 30}
+)
+class EmployeeLoginTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(
+            username="cashier",
+            email="cashier@example.com",
+            password="secret",
+            first_name="Test",
+            last_name="Cashier",
+            phone_number="+91-9876543210",
+        )
+        cls.employee = Employee.objects.create(
+            user=user,
+            address="1 Test Street",
+            department="Billing",
+            position="Cashier",
+            salary="1000.00",
+            hire_date=datetime.date(2020, 1, 1),
+        )
+
+    def setUp(self):
+        self.addCleanup(self.stop_pool)
+        password_pool.warm_up()
+
+    def stop_pool(self):
+        # Let the next test start its own workers
+        executor, password_pool._executor = password_pool._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+    def login(self, username, password):
+        return self.client.post(
+            reverse("employee_login"),
+            {"username": username, "password": password},
+            content_type="application/json",
+        )
+
+    def test_login_checks_the_password_in_the_pool(self):
+        submitted = password_pool.stats()["submitted"]
+
+        response = self.login("cashier", "secret")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["employee"]["emp_id"], self.employee.emp_id)
+        self.assertIn("access", response.json())
+        self.assertEqual(password_pool.stats()["submitted"], submitted + 1)
+
+    def test_unknown_username_is_hashed_like_a_wrong_password(self):
+        submitted = password_pool.stats()["submitted"]
+
+        wrong_password = self.login("cashier", "wrong")
+        unknown_user = self.login("nobody", "wrong")
+        self.assertEqual(unknown_user.status_code, 401)
+        self.assertEqual(unknown_user.json(), wrong_password.json())
+        self.assertEqual(password_pool.stats()["submitted"], submitted + 2)
+
+    def test_saturated_pool_returns_503(self):
+        # A job the request gave up on keeps the only worker busy
+        with override_settings(
+            PASSWORD_POOL={
+                "ENABLED": True,
+                "WORKERS": 1,
+                "MAX_QUEUE": 0,
+                "TIMEOUT": 0.5,
+            }
+        ):
+            with self.assertRaises(PasswordPoolSaturated):
+                password_pool.run(time.sleep, 2)
+
+        for username in ("cashier", "nobody"):
+            response = self.login(username, "secret")
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(response["Retry-After"], "1")
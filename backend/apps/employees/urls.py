@@ -10,6 +10,11 @@ urlpatterns = [
         views.EmployeeSearchView.as_view(),
         name="employee_search",
     ),
+    path(
+        "async/search/<str:emp_id>/",
+        views.EmployeeSearchAsyncView.as_view(),
+        name="employee_search_async",
+    ),
     path(
         "create/",
         views.EmployeeCreateView.as_view(),
@@ -30,4 +35,9 @@ urlpatterns = [
         views.EmployeeAuthView.as_view(),
         name="employee_authenticate",
     ),
+    path(
+        "login/",
+        views.EmployeeLoginView.as_view(),
+        name="employee_login",
+    ),
 ]
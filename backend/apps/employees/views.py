@@ -1,19 +1,31 @@
 # Imports
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import update_last_login
+from django.db import transaction
+from django.views import View
 
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import AllowAny
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import RefreshToken
 
-from drf_yasg import openapi
-from drf_yasg.utils import swagger_auto_schema
+from backend.apps.core.cache import cached_response
+from backend.apps.core.passwords import PasswordPoolSaturated, password_pool
+from backend.apps.core.responses import json_response
+from backend.apps.core.swagger import openapi, swagger_auto_schema
+from backend.apps.core.throttling import throttled
+from backend.apps.core.versioning import precondition_failed
 
 from .models import Employee
 from .serializers import (
     EmployeeSearchSerializer,
     EmployeeCreateSerializer,
     EmployeeUpdateSerializer,
+    EmployeeLoginSerializer,
+    employee_values,
+    employee_version,
 )
 
 
@@ -23,6 +35,9 @@ User = get_user_model()
 
 # Class based view to search the employee
 class EmployeeSearchView(APIView):
+    # Throttle scope of the view
+    throttle_scope = "search"
+
     # Swagger settings
     @swagger_auto_schema(
         operation_id="employee_search",
@@ -35,12 +50,13 @@ class EmployeeSearchView(APIView):
         },
         tags=["Employee"],
     )
+    @cached_response("employee", "emp_id", employee_version)
     def get(self, request, emp_id):
         try:
-            employee = EmployeeSearchSerializer(Employee.objects.get(emp_id=emp_id))
+            employee = employee_values.get(Employee.objects.all(), emp_id=emp_id)
 
             return Response(
-                employee.data,
+                employee,
                 status=status.HTTP_200_OK,
             )
         except Employee.DoesNotExist:
@@ -50,6 +66,27 @@ class EmployeeSearchView(APIView):
             )
 
 
+# Class based view to search the employee without blocking the worker
+class EmployeeSearchAsyncView(View):
+    # Throttle scope of the view
+    throttle_scope = "search"
+
+    # Get method to search the employee with the async ORM
+    @throttled
+    @cached_response("employee", "emp_id", employee_version)
+    async def get(self, request, emp_id):
+        try:
+            # The user columns are read through the join
+            employee = await employee_values.aget(Employee.objects.all(), emp_id=emp_id)
+        except Employee.DoesNotExist:
+            return json_response(
+                {"error": "Employee not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        return json_response(employee)
+
+
 # Class based view to create an employee
 class EmployeeCreateView(APIView):
     # Swagger settings
@@ -144,15 +181,30 @@ class EmployeeUpdateView(APIView):
                 description="Employee Updated",
             ),
             status.HTTP_400_BAD_REQUEST: "Invalid Data",
+            status.HTTP_412_PRECONDITION_FAILED: "Employee changed since If-Match",
         },
         tags=["Employee"],
     )
 
     # Put method to update an employee
+    @transaction.atomic
     def put(self, request, emp_id):
         try:
-            # Get the employee
-            employee = Employee.objects.get(emp_id=emp_id)
+            # Get the employee and its user, locked until the update is committed
+            employee = (
+                Employee.objects.select_for_update()
+                .select_related("user")
+                .get(emp_id=emp_id)
+            )
+
+            # The client updates a version that is not the current one
+            etag = employee_version.of(employee)
+            if precondition_failed(request, etag):
+                return Response(
+                    {"error": "Employee was changed by another request"},
+                    status=status.HTTP_412_PRECONDITION_FAILED,
+                    headers={"ETag": etag},
+                )
 
             # Serialize the data
             serializer = EmployeeUpdateSerializer(employee, data=request.data)
@@ -166,6 +218,7 @@ class EmployeeUpdateView(APIView):
                 return Response(
                     serializer.data,
                     status=status.HTTP_200_OK,
+                    headers={"ETag": employee_version.of(employee)},
                 )
 
             # Else return the errors
@@ -226,6 +279,9 @@ class EmployeeAuthView(APIView):
     # Set permission to allow any
     permission_classes = [AllowAny]
 
+    # Throttle scope of the view
+    throttle_scope = "login"
+
     # Swagger settings
     @swagger_auto_schema(
         operation_id="employee_auth",
@@ -244,6 +300,7 @@ class EmployeeAuthView(APIView):
             status.HTTP_400_BAD_REQUEST: "Invalid Data",
             status.HTTP_401_UNAUTHORIZED: "Invalid Credentials / Employeee Not Active",
             status.HTTP_404_NOT_FOUND: "Employee not found",
+            status.HTTP_503_SERVICE_UNAVAILABLE: "Too many logins in progress",
         },
         tags=["Employee"],
     )
@@ -262,18 +319,17 @@ class EmployeeAuthView(APIView):
             )
 
         try:
-            # Get the user
-            user = User.objects.get(username=username)
-
-            # Check if the password is correct
-            if user.check_password(password):
-                # Get the employee
-                employee = EmployeeSearchSerializer(Employee.objects.get(user=user))
+            # Get the employee together with its user
+            employee = Employee.objects.select_related("user").get(
+                user__username=username
+            )
 
+            # Check the password in the password pool
+            if password_pool.check_password(employee.user, password):
                 # Check if the employee is active
-                if employee.data["is_active"]:
+                if employee.is_active:
                     return Response(
-                        employee.data,
+                        EmployeeSearchSerializer(employee).data,
                         status=status.HTTP_200_OK,
                     )
                 else:
@@ -287,8 +343,115 @@ class EmployeeAuthView(APIView):
                     status=status.HTTP_401_UNAUTHORIZED,
                 )
 
-        except User.DoesNotExist:
+        except Employee.DoesNotExist:
             return Response(
                 {"error": "Employee not found"},
                 status=status.HTTP_404_NOT_FOUND,
             )
+
+        except PasswordPoolSaturated:
+            return Response(
+                {"error": "Too many logins in progress, try again shortly"},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": "1"},
+            )
+
+
+# Class based view to log an employee in and return the tokens with the profile
+class EmployeeLoginView(APIView):
+    # Set permission to allow any
+    permission_classes = [AllowAny]
+
+    # Throttle scope of the view
+    throttle_scope = "login"
+
+    # Swagger settings
+    @swagger_auto_schema(
+        operation_id="employee_login",
+        operation_description="Check the credentials once and return the JWT pair together with the employee profile",
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                "username": openapi.Schema(type=openapi.TYPE_STRING),
+                "password": openapi.Schema(type=openapi.TYPE_STRING),
+            },
+        ),
+        responses={
+            status.HTTP_200_OK: openapi.Response(
+                description="Employee logged in",
+                schema=EmployeeLoginSerializer,
+            ),
+            status.HTTP_400_BAD_REQUEST: "Invalid Data",
+            status.HTTP_401_UNAUTHORIZED: "Invalid Credentials / Employeee Not Active",
+            status.HTTP_503_SERVICE_UNAVAILABLE: "Too many logins in progress",
+        },
+        tags=["Employee"],
+    )
+
+    # Post method to log the employee in
+    def post(self, request):
+        # Get the username and password
+        username = request.data.get("username")
+        password = request.data.get("password")
+
+        # Check if the username and password is provided
+        if not username or not password:
+            return Response(
+                {"error": "Username and password is required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # Get the employee together with its user
+        try:
+            employee = Employee.objects.select_related("user").get(
+                user__username=username
+            )
+        except Employee.DoesNotExist:
+            employee = None
+
+        try:
+            # Hash once anyway so unknown usernames take as long as known ones
+            # and get the same answer as a wrong password
+            if employee is None:
+                password_pool.make(password)
+                return Response(
+                    {"error": "Invalid Credentials"},
+                    status=status.HTTP_401_UNAUTHORIZED,
+                )
+            user = employee.user
+
+            # Check the password once, in the password pool
+            if not password_pool.check_password(user, password):
+                return Response(
+                    {"error": "Invalid Credentials"},
+                    status=status.HTTP_401_UNAUTHORIZED,
+                )
+
+            # Check if the employee and its user are active
+            if not employee.is_active or not user.is_active:
+                return Response(
+                    {"error": "Employee is not active"},
+                    status=status.HTTP_401_UNAUTHORIZED,
+                )
+
+            # Issue the token pair the way the token endpoint does
+            refresh = RefreshToken.for_user(user)
+            if jwt_settings.UPDATE_LAST_LOGIN:
+                update_last_login(None, user)
+
+            # Return the tokens with the employee profile
+            return Response(
+                {
+                    "access": str(refresh.access_token),
+                    "refresh": str(refresh),
+                    "employee": EmployeeSearchSerializer(employee).data,
+                },
+                status=status.HTTP_200_OK,
+            )
+
+        except PasswordPoolSaturated:
+            return Response(
+                {"error": "Too many logins in progress, try again shortly"},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": "1"},
+            )
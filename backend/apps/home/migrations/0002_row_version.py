@@ -0,0 +1,25 @@
+# Generated by Django 4.2.11 on 2026-10-18 13:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("home", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, verbose_name="Updated At"),
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="version",
+            field=models.PositiveIntegerField(
+                default=1, editable=False, verbose_name="Version"
+            ),
+        ),
+    ]
@@ -4,9 +4,11 @@ from django.db import models
 from django.core.validators import RegexValidator
 from django.contrib.auth.models import AbstractUser
 
+from backend.apps.core.models import VersionedModel
+
 
 # Class based model for the User
-class User(AbstractUser):
+class User(VersionedModel, AbstractUser):
     """
     User model that extends Django's AbstractUser model.
     to make them unique and adds first_name and last_name fields.
@@ -16,6 +18,8 @@ class User(AbstractUser):
         first_name (CharField): A CharField that stores the user's first name. It has a maximum length of 30 characters.
         last_name (CharField): A CharField that stores the user's last name. It has a maximum length of 30 characters.
         phone_number (PhoneNumberField): A CharField that stores the user's phone number. It is validated using a RegexValidator.
+        version (PositiveIntegerField): A PositiveIntegerField that stores the number of saves of the user.
+        updated_at (DateTimeField): A DateTimeField that stores when the user was last saved.
     """
 
     # Declare the fields
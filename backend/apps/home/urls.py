@@ -6,4 +6,5 @@ from . import views
 # Set the url patters for the home app
 urlpatterns = [
     path("", views.RestAPIHome.as_view(), name="restapi_home"),
+    path("async/", views.RestAPIHomeAsync.as_view(), name="restapi_home_async"),
 ]
@@ -1,11 +1,12 @@
 # Imports
+from django.views import View
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework import generics
 from rest_framework.permissions import AllowAny, IsAuthenticated
 
-from drf_yasg import openapi
-from drf_yasg.utils import swagger_auto_schema
+from backend.apps.core.responses import json_response
+from backend.apps.core.swagger import openapi, swagger_auto_schema
 
 
 # Class based view for the home endpoint
@@ -51,3 +52,19 @@ class RestAPIHome(generics.GenericAPIView, IsAuthenticated):
                 "status": status.HTTP_200_OK,
             }
         )
+
+
+# Class based view for the home endpoint served without a worker thread
+class RestAPIHomeAsync(View):
+    """
+    Async version of the home endpoint for ASGI deployments.
+    """
+
+    async def get(self, request):
+        # Return the response
+        return json_response(
+            {
+                "message": "Welcome to the On Counter Billing System REST API",
+                "status": status.HTTP_200_OK,
+            }
+        )
@@ -0,0 +1,48 @@
+# Imports
+import copy
+
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .cache import get_setting, user_cache
+
+
+# Class based authentication to resolve the token users through the cache
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves the user of a validated token from the
+    user cache, so an authenticated request usually costs no query.
+    """
+
+    def get_user(self, validated_token):
+        # Load the user from the database when the cache is off
+        if not get_setting("ENABLED"):
+            return super().get_user(validated_token)
+
+        # Tokens without a user are rejected by the parent class
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+        user_id = str(validated_token[api_settings.USER_ID_CLAIM])
+
+        # Return the cached user
+        user = user_cache.get(user_id)
+        if user is not None:
+            if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."),
+                    code="password_changed",
+                )
+            return user
+
+        # Read the version before the user so a change made meanwhile is seen
+        version = user_cache.version(user_id)
+        user = super().get_user(validated_token)
+        if version is None:
+            version = user.version
+        user_cache.set(user_id, version, copy.copy(user))
+        return user
@@ -0,0 +1,35 @@
+# Imports
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+from backend.apps.core.passwords import password_pool
+
+
+# Get the user model
+User = get_user_model()
+
+
+# Authentication backend checking the passwords in the password pool
+class PooledModelBackend(ModelBackend):
+    """
+    ModelBackend that verifies and upgrades the password hashes in the
+    password pool instead of the request thread. Raises
+    PasswordPoolSaturated (503) when the pool is full.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = User._default_manager.get_by_natural_key(username)
+        except User.DoesNotExist:
+            # Hash once anyway so unknown usernames take as long as known ones
+            password_pool.make(password)
+            return None
+        if password_pool.check_password(user, password) and self.user_can_authenticate(
+            user
+        ):
+            return user
+        return None
@@ -0,0 +1,146 @@
+# Imports
+import copy
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+
+# Default settings for the user cache
+DEFAULTS = {
+    # Django cache alias holding the per-user versions
+    "ALIAS": "default",
+    # Users kept in memory per process
+    "MAX_SIZE": 1024,
+    # Seconds a user is kept in memory
+    "TIMEOUT": 60,
+    # Turn the cache off without touching the settings of DRF
+    "ENABLED": True,
+}
+
+
+# Read a user cache setting
+def get_setting(name):
+    return getattr(settings, "JWT_USER_CACHE", {}).get(name, DEFAULTS[name])
+
+
+# Class to cache the users resolved from the tokens
+class UserCache:
+    """
+    Bounded in-process LRU cache of users with a time to live.
+
+    Every entry remembers the version of its user at the time it was loaded.
+    With a Django cache shared by the processes (Redis, Memcached, the
+    database) the versions are stored in it and a new version is written by
+    the post_save / post_delete receivers once the transaction commits. A
+    local-memory cache is only seen by its own process, so the entries are
+    then checked against the version column of the user row instead, one
+    primary key lookup rather than loading the user. An entry whose version
+    is no longer current, or whose version was evicted from the Django cache,
+    is loaded again from the database.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    @property
+    def cache(self):
+        return caches[get_setting("ALIAS")]
+
+    def key(self, user_id):
+        return f"jwtauth:user:{user_id}:version"
+
+    @property
+    def shared(self):
+        # Whether the versions written by one process are seen by the others
+        return not isinstance(self.cache, (LocMemCache, DummyCache))
+
+    def row_version(self, user_id):
+        # Version column of the user row, None when the user is gone. Only the
+        # token authentication reads it, so simplejwt is not imported with the
+        # signal receivers
+        from rest_framework_simplejwt.settings import api_settings
+
+        return (
+            get_user_model()
+            ._default_manager.filter(**{api_settings.USER_ID_FIELD: user_id})
+            .values_list("version", flat=True)
+            .first()
+        )
+
+    def current(self, user_id):
+        # Version an entry of the user must have to be used
+        if not self.shared:
+            return self.row_version(user_id)
+        return self.cache.get(self.key(user_id))
+
+    def version(self, user_id):
+        # Get the current version of the user, starting one when missing. The
+        # row version is read with the user itself when the cache is local
+        if not self.shared:
+            return None
+        key = self.key(user_id)
+        version = self.cache.get(key)
+        if version is None:
+            self.cache.add(key, uuid.uuid4().hex, None)
+            version = self.cache.get(key)
+        return version
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+
+        # Drop the entries that expired or belong to an older version
+        version, expires, user = entry
+        if expires <= time.monotonic() or version != self.current(user_id):
+            with self._lock:
+                if self._entries.get(user_id) is entry:
+                    del self._entries[user_id]
+            return None
+
+        with self._lock:
+            if user_id in self._entries:
+                self._entries.move_to_end(user_id)
+
+        # Every request gets its own copy to change
+        return copy.copy(user)
+
+    def set(self, user_id, version, user):
+        entry = (version, time.monotonic() + get_setting("TIMEOUT"), user)
+        with self._lock:
+            self._entries[user_id] = entry
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > get_setting("MAX_SIZE"):
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *user_ids):
+        # Start a new version once the current transaction is committed
+        def bump():
+            self.cache.set_many(
+                {self.key(user_id): uuid.uuid4().hex for user_id in user_ids},
+                None,
+            )
+            with self._lock:
+                for user_id in user_ids:
+                    self._entries.pop(str(user_id), None)
+
+        if user_ids:
+            transaction.on_commit(bump)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared user cache instance
+user_cache = UserCache()
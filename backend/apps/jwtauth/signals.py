@@ -0,0 +1,26 @@
+# Imports
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from backend.apps.employees.models import Employee
+
+from .cache import user_cache
+
+
+# Get the user model
+User = get_user_model()
+
+
+# Drop the cached user when it is changed or deleted
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user(sender, instance, **kwargs):
+    user_cache.invalidate(instance.pk)
+
+
+# Drop the cached user when its employee is changed, deactivated or deleted
+@receiver(post_save, sender=Employee)
+@receiver(post_delete, sender=Employee)
+def invalidate_employee_user(sender, instance, **kwargs):
+    user_cache.invalidate(instance.user_id)
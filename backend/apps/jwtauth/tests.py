@@ -0,0 +1,104 @@
+# Imports
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from django.test import TestCase, override_settings
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .authentication import CachedJWTAuthentication
+from .cache import user_cache
+
+
+# Get the user model
+User = get_user_model()
+
+
+# Tests of the cached token users, with the default local-memory cache
+class UserCacheTests(TestCase):
+    def setUp(self):
+        user_cache.clear()
+        self.user = User.objects.create_user(
+            username="cashier",
+            email="cashier@example.com",
+            password="secret",
+            first_name="Test",
+            last_name="Cashier",
+            phone_number="+91-9876543210",
+        )
+        self.token = AccessToken.for_user(self.user)
+        self.authentication = CachedJWTAuthentication()
+
+    def get_user(self):
+        return self.authentication.get_user(self.token)
+
+    def change_elsewhere(self, **fields):
+        # A save made by another worker, whose receivers this process misses
+        User.objects.filter(pk=self.user.pk).update(version=F("version") + 1, **fields)
+
+    def test_cached_user_costs_one_version_lookup(self):
+        self.get_user()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.get_user().first_name, "Test")
+
+    def test_saved_user_is_reloaded(self):
+        self.get_user()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.first_name = "Changed"
+            self.user.save()
+
+        self.assertEqual(self.get_user().first_name, "Changed")
+
+    def test_change_made_by_another_worker_is_seen(self):
+        self.get_user()
+        self.change_elsewhere(first_name="Changed")
+
+        self.assertEqual(self.get_user().first_name, "Changed")
+
+    def test_deactivated_user_is_rejected(self):
+        self.get_user()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.get_user()
+
+    def test_user_deactivated_by_another_worker_is_rejected(self):
+        self.get_user()
+        self.change_elsewhere(is_active=False)
+
+        with self.assertRaises(AuthenticationFailed):
+            self.get_user()
+
+
+# Tests of the cached token users, with a cache shared by the workers
+class SharedUserCacheTests(UserCacheTests):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(
+            CACHES={
+                "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+                "shared": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": directory.name,
+                },
+            },
+            JWT_USER_CACHE={"ALIAS": "shared"},
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        super().setUp()
+
+    def change_elsewhere(self, **fields):
+        # Another worker saves the user and writes a new version
+        super().change_elsewhere(**fields)
+        user_cache.cache.set(user_cache.key(self.user.pk), "elsewhere", None)
+
+    def test_cached_user_costs_one_version_lookup(self):
+        # The version is read from the shared cache, not the database
+        self.get_user()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_user().first_name, "Test")
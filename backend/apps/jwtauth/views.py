@@ -5,12 +5,14 @@ from rest_framework_simplejwt.views import (
     TokenRefreshView as DefaultTokenRefreshView,
     TokenVerifyView as DefaultTokenVerifyView,
 )
-from drf_yasg.utils import swagger_auto_schema
-from drf_yasg import openapi
+from backend.apps.core.swagger import openapi, swagger_auto_schema
 
 
 # Class baesd view to get the custom token obtain pair view
 class TokenObtainPairView(DefaultTokenObtainPairView):
+    # Throttle scope of the view
+    throttle_scope = "login"
+
     # Swagger settings
     @swagger_auto_schema(
         operation_id="token_obtain_pair",
@@ -44,6 +46,9 @@ class TokenObtainPairView(DefaultTokenObtainPairView):
                     },
                 ),
             ),
+            status.HTTP_503_SERVICE_UNAVAILABLE: openapi.Response(
+                description="Too many logins in progress, retry after the Retry-After header",
+            ),
         },
         tags=["JWT Authentication"],
     )
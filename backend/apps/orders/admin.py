@@ -1,8 +1,9 @@
 # Imports
 from django.contrib import admin
-from .models import Order, CheckoutBill
+from .models import Order, CheckoutBill, BillExportState
 
 
 # Register the models
 admin.site.register(Order)
 admin.site.register(CheckoutBill)
+admin.site.register(BillExportState)
@@ -0,0 +1,188 @@
+# Imports
+import json
+from itertools import islice
+
+from django.db import DatabaseError
+from rest_framework import serializers
+from rest_framework.fields import empty
+
+from backend.apps.catalog.prices import price_orders, price_table
+from backend.apps.catalog.pricing import PricingError
+from backend.apps.customers.models import Customer
+from backend.apps.employees.models import Employee
+
+from .models import CheckoutBill
+from .serializers import CheckoutBillSerializer
+
+
+# Class to load bills from an NDJSON stream
+class BulkBillLoader:
+    """
+    Validates and inserts bills read from an NDJSON stream, one bill per line.
+
+    The field rules are taken from CheckoutBillSerializer, but the employees and
+    customers of a whole chunk are fetched with one query each and the bills of
+    a chunk are inserted with CheckoutBill.objects.create_bills. Results are
+    yielded as NDJSON lines, so nothing grows with the size of the upload.
+    """
+
+    def __init__(self, chunk_size):
+        self.chunk_size = chunk_size
+
+        # Reuse the field definitions of the bill serializer
+        fields = CheckoutBillSerializer().fields
+        self.emp_field = fields["emp_id"]
+        self.cust_field = fields["cust_id"]
+        self.orders_field = fields["orders"]
+        self.order_fields = {
+            name: field
+            for name, field in self.orders_field.child.fields.items()
+            if not field.read_only
+        }
+
+    def process(self, lines):
+        """
+        Yield one encoded result line for every non blank input line.
+        """
+
+        # Number the non blank lines
+        numbered = (
+            (number, line) for number, line in enumerate(lines, start=1) if line.strip()
+        )
+
+        # Process the lines chunk by chunk
+        while True:
+            chunk = list(islice(numbered, self.chunk_size))
+            if not chunk:
+                break
+            for result in self.process_chunk(chunk):
+                yield json.dumps(result) + "\n"
+
+    def process_chunk(self, chunk):
+        # Parse the lines of the chunk
+        parsed = [(number, self.parse(line)) for number, line in chunk]
+
+        # Fetch the employees and customers of the chunk at once
+        employees = Employee.objects.in_bulk(self.collect(parsed, "emp_id"))
+        customers = Customer.objects.in_bulk(self.collect(parsed, "cust_id"))
+        rules = price_table.rules()
+
+        # Validate every bill of the chunk
+        results, valid = [], []
+        for number, data in parsed:
+            entry, errors = self.validate(data, employees, customers, rules)
+            if errors:
+                results.append({"line": number, "errors": errors})
+            else:
+                valid.append((number, entry))
+
+        # Insert the valid bills in one transaction
+        if valid:
+            try:
+                bills = CheckoutBill.objects.create_bills(entry for _, entry in valid)
+            except DatabaseError as error:
+                results.extend(
+                    {"line": number, "errors": {"non_field_errors": [str(error)]}}
+                    for number, _ in valid
+                )
+            else:
+                results.extend(
+                    {
+                        "line": number,
+                        "bill_id": bill.bill_id,
+                        "total_price": str(bill.total_price),
+                    }
+                    for (number, _), bill in zip(valid, bills)
+                )
+
+        # Return the results in input order
+        return sorted(results, key=lambda result: result["line"])
+
+    def collect(self, parsed, name):
+        # Get the distinct string keys used by the chunk
+        return {
+            data[name]
+            for _, data in parsed
+            if isinstance(data, dict) and isinstance(data.get(name), str)
+        }
+
+    def parse(self, line):
+        # Decode a single NDJSON line
+        try:
+            return json.loads(line)
+        except ValueError:
+            return None
+
+    def validate(self, data, employees, customers, rules):
+        # The line must hold a JSON object
+        if not isinstance(data, dict):
+            return None, {"non_field_errors": ["Invalid JSON object"]}
+
+        errors = {}
+
+        # Validate the employee and the customer
+        employee = self.validate_related(
+            self.emp_field, data.get("emp_id"), employees, errors, "emp_id"
+        )
+        customer = self.validate_related(
+            self.cust_field, data.get("cust_id"), customers, errors, "cust_id"
+        )
+
+        # Validate the orders with the order serializer fields
+        orders = data.get("orders", empty)
+        if not isinstance(orders, list):
+            key = "required" if orders is empty else "not_a_list"
+            message = self.orders_field.error_messages[key]
+            errors["orders"] = [str(message).format(input_type=type(orders).__name__)]
+            orders = []
+
+        orders_data, orders_errors, discount = [], [], 0
+        for order in orders:
+            order_data, order_errors = self.validate_order(order)
+            orders_data.append(order_data)
+            orders_errors.append(order_errors)
+        if any(orders_errors):
+            errors["orders"] = orders_errors
+
+        # Price the lines and the bill from the catalog
+        elif orders_data:
+            try:
+                discount = price_orders(orders_data, rules)
+            except PricingError as error:
+                errors["orders"] = error.errors
+
+        # Return the errors if any
+        if errors:
+            return None, errors
+
+        fields = {"emp_id": employee, "cust_id": customer, "discount": discount}
+        return (fields, orders_data), None
+
+    def validate_related(self, field, pk, instances, errors, name):
+        # Check the primary key against the instances of the chunk
+        if pk is None:
+            errors[name] = [str(field.error_messages["required"])]
+        elif not isinstance(pk, str):
+            errors[name] = [
+                field.error_messages["incorrect_type"].format(
+                    data_type=type(pk).__name__
+                )
+            ]
+        elif pk not in instances:
+            errors[name] = [field.error_messages["does_not_exist"].format(pk_value=pk)]
+        else:
+            return instances[pk]
+
+    def validate_order(self, order):
+        # The order must be an object
+        if not isinstance(order, dict):
+            return None, {"non_field_errors": ["Invalid order object"]}
+
+        # Run the validation of every writable order field
+        data, errors = {}, {}
+        for name, field in self.order_fields.items():
+            try:
+                data[name] = field.run_validation(order.get(name, empty))
+            except serializers.ValidationError as error:
+                errors[name] = error.detail
+        return data, errors
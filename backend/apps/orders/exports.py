@@ -0,0 +1,158 @@
+# Imports
+import csv
+import datetime
+import json
+from collections import deque
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import CheckoutBill
+
+
+# Pseudo buffer that hands back what the csv writer writes
+class Echo:
+    def write(self, value):
+        return value
+
+
+# Class to export bills with their order lines
+class BillExporter:
+    """
+    Streams bills and their order lines as CSV or NDJSON, one row per line.
+
+    Rows are read with QuerySet.iterator(chunk_size=...), which uses a
+    server-side cursor on PostgreSQL, and are encoded one at a time, so memory
+    stays flat however many rows are exported. Bills come out in
+    (created_at, bill_id) order and `last` holds the position of the last
+    exported bill for incremental exports.
+
+    created_at is set before the bill's transaction commits, so a bill can
+    become visible after later bills were exported. An incremental export
+    therefore reads again the bills created up to `window` before since, and
+    skips the ones in `exported`, the IDs kept in `recent` by the previous run.
+    """
+
+    # Time a bill may take from its created_at to its commit
+    default_window = datetime.timedelta(minutes=5)
+
+    # Exported columns and the lookups they are read from
+    columns = [
+        ("bill_id", "bill_id"),
+        ("bill_date", "bill_date"),
+        ("created_at", "created_at"),
+        ("emp_id", "emp_id"),
+        ("cust_id", "cust_id"),
+        ("bill_discount", "discount"),
+        ("bill_total", "total_price"),
+        ("order_id", "orders__order_id"),
+        ("order_date", "orders__order_date"),
+        ("item_id", "orders__item_id"),
+        ("quantity", "orders__quantity"),
+        ("unit_price", "orders__unit_price"),
+        ("order_discount", "orders__discount"),
+        ("order_tax", "orders__tax"),
+        ("order_total", "orders__total_price"),
+    ]
+
+    # Supported output formats
+    formats = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+    def __init__(
+        self,
+        output="csv",
+        date_from=None,
+        date_to=None,
+        since=None,
+        exported=(),
+        window=None,
+        chunk_size=2000,
+        using="default",
+    ):
+        self.output = output
+        self.date_from = date_from
+        self.date_to = date_to
+        self.since = since
+        self.exported = set(exported)
+        self.window = self.default_window if window is None else window
+        self.chunk_size = chunk_size
+        self.using = using
+
+        # Progress of the export, with the (created_at, bill_id) of the last
+        # bills read, as far back as the window
+        self.rows = 0
+        self.last = (since, "") if since else None
+        self.seen = deque()
+
+    @property
+    def content_type(self):
+        return self.formats[self.output]
+
+    def get_queryset(self):
+        bills = CheckoutBill.objects.using(self.using)
+
+        # Filter on the bill dates
+        if self.date_from:
+            bills = bills.filter(bill_date__gte=self.date_from)
+        if self.date_to:
+            bills = bills.filter(bill_date__lte=self.date_to)
+
+        # Start a window before the last exported bill
+        if self.since:
+            bills = bills.filter(created_at__gte=self.since - self.window)
+
+        # One row per order line, bills without orders get empty order columns
+        return bills.order_by("created_at", "bill_id", "orders__order_id").values_list(
+            *(lookup for _, lookup in self.columns)
+        )
+
+    def lines(self):
+        """
+        Yield the encoded export one line at a time.
+        """
+
+        names = [name for name, _ in self.columns]
+
+        # Write a header for the csv output
+        if self.output == "csv":
+            writer = csv.writer(Echo())
+            yield writer.writerow(names)
+
+        # Stream the rows, skipping the bills the previous run exported
+        for row in self.get_queryset().iterator(chunk_size=self.chunk_size):
+            self.see(row[2], row[0])
+            if row[0] in self.exported:
+                continue
+            self.rows += 1
+            if self.last is None or row[2] >= self.last[0]:
+                self.last = (row[2], row[0])
+            if self.output == "csv":
+                yield writer.writerow(self.encode(value) for value in row)
+            else:
+                yield json.dumps(dict(zip(names, row)), cls=DjangoJSONEncoder) + "\n"
+
+    def see(self, created_at, bill_id):
+        # Remember a bill once, the rows of a bill follow each other
+        if not self.seen or self.seen[-1][1] != bill_id:
+            self.seen.append((created_at, bill_id))
+        while self.seen[0][0] < created_at - self.window:
+            self.seen.popleft()
+
+    def recent(self):
+        """
+        Get the IDs of the bills the next run reads again and must skip.
+        """
+
+        if self.last is None:
+            return []
+        start = self.last[0] - self.window
+        return sorted(
+            bill_id for created_at, bill_id in self.seen if created_at >= start
+        )
+
+    def encode(self, value):
+        # Encode a value for the csv output
+        if value is None:
+            return ""
+        if hasattr(value, "isoformat"):
+            return value.isoformat()
+        return str(value)
@@ -0,0 +1,131 @@
+# Imports
+import datetime
+import json
+import sys
+import time
+from itertools import groupby, islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from backend.apps.catalog.pricing import (
+    PricingError,
+    compile_rules,
+    from_cents,
+    hundredths,
+)
+from backend.apps.orders.models import CheckoutBill
+
+
+# Command to re-price the stored bills and report the ones that differ
+class Command(BaseCommand):
+    help = (
+        "Re-price the stored bills at their stored unit prices with the taxes, "
+        "discounts and promotions running now, and write one NDJSON line for "
+        "every bill whose discount or total differs. The rules are compiled "
+        "once and the bills are streamed and priced in batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            help="File to write to, the standard output when not given",
+        )
+        parser.add_argument(
+            "--date-from",
+            type=datetime.date.fromisoformat,
+            help="First bill date to audit (YYYY-MM-DD)",
+        )
+        parser.add_argument(
+            "--date-to",
+            type=datetime.date.fromisoformat,
+            help="Last bill date to audit (YYYY-MM-DD)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Bills priced at a time",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database to audit",
+        )
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        chunk_size = options["chunk_size"]
+        if chunk_size < 1:
+            raise CommandError("--chunk-size must be at least 1")
+
+        # One row per order line, in bill order
+        bills = CheckoutBill.objects.using(using)
+        if options["date_from"]:
+            bills = bills.filter(bill_date__gte=options["date_from"])
+        if options["date_to"]:
+            bills = bills.filter(bill_date__lte=options["date_to"])
+        rows = (
+            bills.order_by("bill_id", "orders__order_id")
+            .values_list(
+                "bill_id",
+                "discount",
+                "total_price",
+                "orders__item_id",
+                "orders__quantity",
+                "orders__unit_price",
+            )
+            .iterator(chunk_size=chunk_size)
+        )
+
+        rules = compile_rules(using)
+        stored = self.bills(rows)
+        started = time.perf_counter()
+        audited = differ = 0
+        output = (
+            open(options["output"], "w", encoding="utf-8")
+            if options["output"]
+            else sys.stdout
+        )
+        try:
+            while True:
+                chunk = list(islice(stored, chunk_size))
+                if not chunk:
+                    break
+                priced = rules.price_bills(lines for _, _, _, lines in chunk)
+                for (bill_id, discount, total, _), result in zip(chunk, priced):
+                    audited += 1
+                    line = self.compare(bill_id, discount, total, result)
+                    if line is not None:
+                        differ += 1
+                        output.write(json.dumps(line) + "\n")
+        finally:
+            if output is not sys.stdout:
+                output.close()
+
+        elapsed = time.perf_counter() - started
+        self.stderr.write(f"Audited {audited} bills in {elapsed:.2f}s, {differ} differ")
+
+    def bills(self, rows):
+        # Group the rows into (bill_id, discount, total, lines), prices in cents
+        for bill_id, group in groupby(rows, key=lambda row: row[0]):
+            lines = []
+            for _, discount, total, item_id, quantity, unit_price in group:
+                if item_id is not None:
+                    lines.append((item_id, quantity, hundredths(unit_price)))
+            yield bill_id, hundredths(discount), hundredths(total), lines
+
+    def compare(self, bill_id, discount, total, result):
+        # Describe how the stored bill differs from its new price
+        if isinstance(result, PricingError):
+            return {"bill_id": bill_id, "errors": result.errors}
+        if result.discount == discount and result.total == total:
+            return None
+        return {
+            "bill_id": bill_id,
+            "stored_discount": str(from_cents(discount)),
+            "stored_total": str(from_cents(total)),
+            "discount": str(from_cents(result.discount)),
+            "total": str(from_cents(result.total)),
+            "promotion": result.promotion,
+        }
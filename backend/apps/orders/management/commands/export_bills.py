@@ -0,0 +1,124 @@
+# Imports
+import datetime
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from backend.apps.orders.exports import BillExporter
+from backend.apps.orders.models import BillExportState
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+# Command to export the bills with their orders
+class Command(BaseCommand):
+    help = (
+        "Stream every bill with its order lines to a CSV or NDJSON file. "
+        "With --incremental NAME only the bills created since the last run of "
+        "that export are written."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            help="File to write to, the standard output when not given",
+        )
+        parser.add_argument(
+            "--format",
+            choices=sorted(BillExporter.formats),
+            default="csv",
+            help="Output format",
+        )
+        parser.add_argument(
+            "--date-from",
+            type=datetime.date.fromisoformat,
+            help="First bill date to export (YYYY-MM-DD)",
+        )
+        parser.add_argument(
+            "--date-to",
+            type=datetime.date.fromisoformat,
+            help="Last bill date to export (YYYY-MM-DD)",
+        )
+        parser.add_argument(
+            "--incremental",
+            metavar="NAME",
+            help="Only export the bills created since the last run of this export",
+        )
+        parser.add_argument(
+            "--window-seconds",
+            type=int,
+            default=int(BillExporter.default_window.total_seconds()),
+            help=(
+                "Seconds before the last run read again for the bills that "
+                "committed late"
+            ),
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Rows fetched from the database at a time",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database to export from",
+        )
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be at least 1")
+        if options["window_seconds"] < 0:
+            raise CommandError("--window-seconds must not be negative")
+
+        # Continue from the last run of an incremental export
+        state = None
+        since = None
+        exported = []
+        if options["incremental"]:
+            state, _ = BillExportState.objects.using(using).get_or_create(
+                name=options["incremental"]
+            )
+            since = state.last_created_at
+            exported = state.recent_bill_ids
+
+        exporter = BillExporter(
+            output=options["format"],
+            date_from=options["date_from"],
+            date_to=options["date_to"],
+            since=since,
+            exported=exported,
+            window=datetime.timedelta(seconds=options["window_seconds"]),
+            chunk_size=options["chunk_size"],
+            using=using,
+        )
+
+        # Write the rows
+        started = time.perf_counter()
+        if options["output"]:
+            with open(options["output"], "w", newline="", encoding="utf-8") as file:
+                file.writelines(exporter.lines())
+        else:
+            sys.stdout.writelines(exporter.lines())
+        elapsed = time.perf_counter() - started
+
+        # Save how far the export went
+        if state is not None and exporter.last:
+            state.last_created_at, state.last_bill_id = exporter.last
+            state.recent_bill_ids = exporter.recent()
+            state.save(using=using)
+
+        # Report the rows written and the peak memory of the process
+        summary = f"Exported {exporter.rows} rows in {elapsed:.2f}s"
+        if resource is not None:
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            if sys.platform == "darwin":
+                peak //= 1024
+            summary += f", peak RSS {peak / 1024:.1f} MiB"
+        self.stderr.write(summary)
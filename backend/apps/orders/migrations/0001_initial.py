@@ -0,0 +1,105 @@
+# Generated by Django 4.2.11 on 2026-10-18 14:29
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("employees", "0001_initial"),
+        ("customers", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Order",
+            fields=[
+                (
+                    "order_id",
+                    models.CharField(
+                        editable=False,
+                        max_length=10,
+                        primary_key=True,
+                        serialize=False,
+                        unique=True,
+                        verbose_name="Order ID",
+                    ),
+                ),
+                (
+                    "order_date",
+                    models.DateField(auto_now_add=True, verbose_name="Order Date"),
+                ),
+                ("item_id", models.CharField(max_length=10, verbose_name="Item ID")),
+                ("quantity", models.IntegerField(verbose_name="Quantity")),
+                (
+                    "unit_price",
+                    models.DecimalField(
+                        decimal_places=2, max_digits=10, verbose_name="Unit Price"
+                    ),
+                ),
+                (
+                    "total_price",
+                    models.DecimalField(
+                        decimal_places=2, editable=False, max_digits=10
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["order_date"],
+            },
+        ),
+        migrations.CreateModel(
+            name="CheckoutBill",
+            fields=[
+                (
+                    "bill_id",
+                    models.CharField(
+                        editable=False,
+                        max_length=10,
+                        primary_key=True,
+                        serialize=False,
+                        unique=True,
+                        verbose_name="Bill ID",
+                    ),
+                ),
+                (
+                    "bill_date",
+                    models.DateField(auto_now_add=True, verbose_name="Bill Date"),
+                ),
+                (
+                    "total_price",
+                    models.DecimalField(
+                        decimal_places=2,
+                        editable=False,
+                        max_digits=10,
+                        verbose_name="Total Price",
+                    ),
+                ),
+                (
+                    "cust_id",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="customers.customer",
+                        verbose_name="Customer ID",
+                    ),
+                ),
+                (
+                    "emp_id",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="employees.employee",
+                        verbose_name="Employee ID",
+                    ),
+                ),
+                (
+                    "orders",
+                    models.ManyToManyField(
+                        related_name="bills", to="orders.order", verbose_name="Orders"
+                    ),
+                ),
+            ],
+        ),
+    ]
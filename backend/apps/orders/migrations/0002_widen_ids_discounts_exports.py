@@ -0,0 +1,109 @@
+# Generated by Django 4.2.11 on 2026-10-18 14:30
+
+from django.db import migrations, models
+from django.db.models.functions import Cast
+import django.utils.timezone
+
+
+# Date the bills saved before the column existed by their bill date rather
+# than by when the migration ran, so they stay before the newer bills
+def backfill_created_at(apps, schema_editor):
+    CheckoutBill = apps.get_model("orders", "CheckoutBill")
+    CheckoutBill.objects.using(schema_editor.connection.alias).update(
+        created_at=Cast("bill_date", models.DateTimeField())
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="checkoutbill",
+            name="bill_id",
+            field=models.CharField(
+                editable=False,
+                max_length=20,
+                primary_key=True,
+                serialize=False,
+                unique=True,
+                verbose_name="Bill ID",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="order",
+            name="order_id",
+            field=models.CharField(
+                editable=False,
+                max_length=20,
+                primary_key=True,
+                serialize=False,
+                unique=True,
+                verbose_name="Order ID",
+            ),
+        ),
+        migrations.AddField(
+            model_name="order",
+            name="discount",
+            field=models.DecimalField(
+                decimal_places=2, default=0, max_digits=10, verbose_name="Discount"
+            ),
+        ),
+        migrations.AddField(
+            model_name="order",
+            name="tax",
+            field=models.DecimalField(
+                decimal_places=2, default=0, max_digits=10, verbose_name="Tax"
+            ),
+        ),
+        migrations.AddField(
+            model_name="checkoutbill",
+            name="created_at",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now,
+                editable=False,
+                verbose_name="Created At",
+            ),
+        ),
+        migrations.RunPython(backfill_created_at, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name="checkoutbill",
+            name="discount",
+            field=models.DecimalField(
+                decimal_places=2, default=0, max_digits=10, verbose_name="Discount"
+            ),
+        ),
+        migrations.CreateModel(
+            name="BillExportState",
+            fields=[
+                (
+                    "name",
+                    models.CharField(
+                        max_length=50,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="Name",
+                    ),
+                ),
+                (
+                    "last_created_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Last Created At"
+                    ),
+                ),
+                (
+                    "last_bill_id",
+                    models.CharField(
+                        blank=True, max_length=20, verbose_name="Last Bill ID"
+                    ),
+                ),
+                (
+                    "exported_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Exported At"),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 4.2.11 on 2026-10-18 13:18
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from backend.apps.core.db.migrations import (
+    AddIndexConcurrently,
+    DropFieldIndexConcurrently,
+)
+
+
+class Migration(migrations.Migration):
+
+    # The indexes are built and dropped concurrently on PostgreSQL
+    atomic = False
+
+    dependencies = [
+        ("customers", "0002_widen_cust_id_search_text"),
+        ("employees", "0003_widen_emp_id"),
+        ("orders", "0002_widen_ids_discounts_exports"),
+    ]
+
+    operations = [
+        # Build the new indexes before dropping the ones they replace
+        AddIndexConcurrently(
+            model_name="checkoutbill",
+            index=models.Index(
+                fields=["bill_date", "bill_id"],
+                include=("emp_id", "cust_id", "total_price"),
+                name="bill_date_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="checkoutbill",
+            index=models.Index(
+                fields=["cust_id", "bill_date", "bill_id"], name="bill_cust_date_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="checkoutbill",
+            index=models.Index(
+                fields=["emp_id", "bill_date", "bill_id"], name="bill_emp_date_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="checkoutbill",
+            index=models.Index(
+                fields=["created_at", "bill_id"], name="bill_created_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="order",
+            index=models.Index(
+                fields=["item_id", "order_date", "order_id"],
+                include=("unit_price",),
+                name="order_item_date_idx",
+            ),
+        ),
+        DropFieldIndexConcurrently(
+            model_name="checkoutbill",
+            name="cust_id",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="customers.customer",
+                verbose_name="Customer ID",
+            ),
+        ),
+        DropFieldIndexConcurrently(
+            model_name="checkoutbill",
+            name="emp_id",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="employees.employee",
+                verbose_name="Employee ID",
+            ),
+        ),
+    ]
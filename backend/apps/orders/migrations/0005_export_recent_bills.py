@@ -0,0 +1,20 @@
+# Generated by Django 4.2.11 on 2026-10-18 13:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0004_row_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="billexportstate",
+            name="recent_bill_ids",
+            field=models.JSONField(
+                blank=True, default=list, verbose_name="Recent Bill IDs"
+            ),
+        ),
+    ]
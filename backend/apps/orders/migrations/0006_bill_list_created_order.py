@@ -0,0 +1,56 @@
+# Generated by Django 4.2.11 on 2026-10-18 15:40
+
+from django.db import migrations, models
+
+from backend.apps.core.db.migrations import (
+    AddIndexConcurrently,
+    RemoveIndexConcurrently,
+)
+
+
+class Migration(migrations.Migration):
+
+    # The indexes are built and dropped concurrently on PostgreSQL
+    atomic = False
+
+    dependencies = [
+        ("orders", "0005_export_recent_bills"),
+    ]
+
+    operations = [
+        # Build the new indexes before dropping the ones they replace
+        AddIndexConcurrently(
+            model_name="checkoutbill",
+            index=models.Index(
+                fields=["bill_date", "created_at", "bill_id"],
+                include=("emp_id", "cust_id", "total_price"),
+                name="bill_date_created_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="checkoutbill",
+            index=models.Index(
+                fields=["cust_id", "bill_date", "created_at", "bill_id"],
+                name="bill_cust_created_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="checkoutbill",
+            index=models.Index(
+                fields=["emp_id", "bill_date", "created_at", "bill_id"],
+                name="bill_emp_created_idx",
+            ),
+        ),
+        RemoveIndexConcurrently(
+            model_name="checkoutbill",
+            name="bill_date_idx",
+        ),
+        RemoveIndexConcurrently(
+            model_name="checkoutbill",
+            name="bill_cust_date_idx",
+        ),
+        RemoveIndexConcurrently(
+            model_name="checkoutbill",
+            name="bill_emp_date_idx",
+        ),
+    ]
@@ -1,7 +1,19 @@
 # Imports
-from django.db import models
+from django.db import models, transaction
+from django.dispatch import Signal
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from backend.apps.core.ids import allocate_ids, next_id
+from backend.apps.core.models import VersionedModel
+
+
+# Rows per INSERT of the bulk writes. The bill write path runs a fixed number
+# of queries up to this many lines, and one more INSERT per table for each
+# further batch. SQLite caps the statement at 999 parameters, so there an
+# INSERT holds at most 111 order lines and 499 links
+BULK_BATCH_SIZE = 500
+
 
 # Class based model for the Order model
 class Order(models.Model):
@@ -13,12 +25,17 @@ class Order(models.Model):
         item_id (CharField): A CharField that stores the item's ID.
         quantity (IntegerField): An IntegerField that stores the quantity of the item.
         unit_price (DecimalField): A DecimalField that stores the unit price of the item.
+        discount (DecimalField): A DecimalField that stores the discount taken off the order.
+        tax (DecimalField): A DecimalField that stores the tax charged on the order.
         total_price (DecimalField): A DecimalField that stores the total price of the order.
     """
 
+    # Prefix used by the ID allocator
+    id_prefix = "ORD"
+
     # Fields
     order_id = models.CharField(
-        max_length=10,
+        max_length=20,
         primary_key=True,
         verbose_name=_("Order ID"),
         unique=True,
@@ -30,6 +47,12 @@ class Order(models.Model):
     unit_price = models.DecimalField(
         max_digits=10, decimal_places=2, verbose_name=_("Unit Price")
     )
+    discount = models.DecimalField(
+        max_digits=10, decimal_places=2, default=0, verbose_name=_("Discount")
+    )
+    tax = models.DecimalField(
+        max_digits=10, decimal_places=2, default=0, verbose_name=_("Tax")
+    )
 
     # Calculate field for the total price
     total_price = models.DecimalField(max_digits=10, decimal_places=2, editable=False)
@@ -37,92 +60,232 @@ class Order(models.Model):
     # Calculate the total price
     def save(self, *args, **kwargs):
         # Update the total price
-        self.total_price = self.quantity * self.unit_price
+        self.total_price = self.quantity * self.unit_price - self.discount + self.tax
 
         # Generate order_id if it's not set
         if not self.order_id:
-            # Get the last order
-            last_order = Order.objects.order_by().last()
+            self.order_id = next_id(Order, using=kwargs.get("using"))
 
-            # If there is a last order, generate a new order_id
-            if last_order:
-                last_id = int(last_order.order_id[3:])  # Extract numeric part
-                new_id = f"ORD{str(last_id + 1).zfill(4)}"  # Increment and format
-
-            # If there is no last order, set order_id to ORD0001
-            else:
-                new_id = "ORD0001"  # Initial ID
-
-            # Set the order_id
-            self.order_id = new_id
+            # The key is new, skip the update attempt
+            kwargs.setdefault("force_insert", True)
 
         super(Order, self).save(*args, **kwargs)
 
     # Metadata
     class Meta:
         ordering = ["order_date"]
+        indexes = [
+            # Item lookups and the latest price of an item
+            models.Index(
+                fields=["item_id", "order_date", "order_id"],
+                include=["unit_price"],
+                name="order_item_date_idx",
+            ),
+        ]
 
     # Methods
     def __str__(self):
         return self.order_id
 
 
+# Sent inside the transaction of CheckoutBillManager.create_bills with
+# bills=[(bill, [orders])] and using=<database alias>
+bills_created = Signal()
+
+
+# Manager for the CheckoutBill model
+class CheckoutBillManager(models.Manager):
+    def create_with_orders(self, orders, **fields):
+        """
+        Create a single bill together with its order lines.
+        """
+
+        return self.create_bills([(fields, orders)])[0]
+
+    def create_bills(self, entries):
+        """
+        Create bills together with their order lines in one transaction.
+        Takes an iterable of (bill fields, list of order fields) pairs. All the
+        IDs are allocated up front and every table is written with a single
+        bulk insert, so the number of queries does not grow with the number of
+        lines up to BULK_BATCH_SIZE (fewer on SQLite, see above).
+        """
+
+        # Get the database and the entries
+        using = self.db
+        entries = list(entries)
+
+        # Allocate the IDs for all the bills and orders at once
+        bill_ids = allocate_ids(self.model, len(entries), using=using)
+        order_ids = iter(
+            allocate_ids(Order, sum(len(lines) for _, lines in entries), using=using)
+        )
+
+        # Build the bills, orders and the links between them
+        through = self.model.orders.through
+        bills, orders, links, created = [], [], [], []
+        for bill_id, (fields, lines) in zip(bill_ids, entries):
+            bill_orders = []
+            for line in lines:
+                order = Order(order_id=next(order_ids), **line)
+                order.total_price = (
+                    order.quantity * order.unit_price - order.discount + order.tax
+                )
+                bill_orders.append(order)
+
+            # Compute the total price of the bill once
+            bill = self.model(bill_id=bill_id, **fields)
+            bill.total_price = (
+                sum(order.total_price for order in bill_orders) - bill.discount
+            )
+            bills.append(bill)
+            orders.extend(bill_orders)
+            created.append((bill, bill_orders))
+            links.extend(
+                through(checkoutbill_id=bill_id, order_id=order.order_id)
+                for order in bill_orders
+            )
+
+        # Write everything in one transaction
+        with transaction.atomic(using=using):
+            Order.objects.using(using).bulk_create(orders, batch_size=BULK_BATCH_SIZE)
+            self.bulk_create(bills, batch_size=BULK_BATCH_SIZE)
+            through.objects.using(using).bulk_create(links, batch_size=BULK_BATCH_SIZE)
+
+            # Let the other apps update their own tables
+            bills_created.send(sender=self.model, bills=created, using=using)
+
+        # Return the bills
+        return bills
+
+
 # Class based model for the CheckoutBill model
-class CheckoutBill(models.Model):
+class CheckoutBill(VersionedModel):
     """
     Model for storing information about the bills
     Attributes:
         bill_id (AutoField): An AutoField that stores the bill's ID.
         bill_date (DateField): A DateField that stores the bill's date.
+        created_at (DateTimeField): A DateTimeField that stores when the bill was created.
         emp_id (ForeignKey): A ForeignKey that stores the employee's ID.
         cust_id (ForeignKey): A ForeignKey that stores the customer's ID.
         orders (ManyToManyField): A ManyToManyField that stores the order IDs.
+        discount (DecimalField): A DecimalField that stores the promotion discount taken off the bill.
         total_price (DecimalField): A DecimalField that stores the total price of the bill.
+        version (PositiveIntegerField): A PositiveIntegerField that stores the number of saves of the bill.
+        updated_at (DateTimeField): A DateTimeField that stores when the bill was last saved.
     """
 
+    # Prefix used by the ID allocator
+    id_prefix = "BILL"
+
     # Fields
     bill_id = models.CharField(
-        max_length=10,
+        max_length=20,
         primary_key=True,
         verbose_name=_("Bill ID"),
         unique=True,
         editable=False,
     )
     bill_date = models.DateField(auto_now_add=True, verbose_name=_("Bill Date"))
+    created_at = models.DateTimeField(
+        default=timezone.now,
+        editable=False,
+        verbose_name=_("Created At"),
+    )
     emp_id = models.ForeignKey(
-        "employees.Employee", on_delete=models.CASCADE, verbose_name=_("Employee ID")
+        "employees.Employee",
+        on_delete=models.CASCADE,
+        db_index=False,
+        verbose_name=_("Employee ID"),
     )
     cust_id = models.ForeignKey(
-        "customers.Customer", on_delete=models.CASCADE, verbose_name=_("Customer ID")
+        "customers.Customer",
+        on_delete=models.CASCADE,
+        db_index=False,
+        verbose_name=_("Customer ID"),
     )
     orders = models.ManyToManyField(
         "Order", related_name="bills", verbose_name=_("Orders")
     )
+    discount = models.DecimalField(
+        max_digits=10, decimal_places=2, default=0, verbose_name=_("Discount")
+    )
     total_price = models.DecimalField(
         max_digits=10, decimal_places=2, editable=False, verbose_name=_("Total Price")
     )
 
+    # Set the manager
+    objects = CheckoutBillManager()
+
+    # Metadata
+    class Meta:
+        indexes = [
+            # Bill list pages and the rollup rebuild of a date range
+            models.Index(
+                fields=["bill_date", "created_at", "bill_id"],
+                include=["emp_id", "cust_id", "total_price"],
+                name="bill_date_created_idx",
+            ),
+            # Bills of a customer or an employee, newest first
+            models.Index(
+                fields=["cust_id", "bill_date", "created_at", "bill_id"],
+                name="bill_cust_created_idx",
+            ),
+            models.Index(
+                fields=["emp_id", "bill_date", "created_at", "bill_id"],
+                name="bill_emp_created_idx",
+            ),
+            # Incremental exports
+            models.Index(fields=["created_at", "bill_id"], name="bill_created_idx"),
+        ]
+
     # Calculate the total price
     def save(self, *args, **kwargs):
-        # Update the total price
-        self.total_price = sum(order.total_price for order in self.orders.all())
+        # Update the total price, a new bill has no orders linked yet
+        if not self._state.adding:
+            self.total_price = (
+                sum(order.total_price for order in self.orders.all()) - self.discount
+            )
+        elif self.total_price is None:
+            self.total_price = 0
 
         # Generate bill_id if it's not set
         if not self.bill_id:
-            # Get the last employee
-            last_bill = CheckoutBill.objects.order_by().last()
-
-            # If there is a last bill, generate a new bill_id
-            if last_bill:
-                last_id = int(last_bill.bill_id[4:])  # Extract numeric part
-                new_id = f"BILL{str(last_id + 1).zfill(4)}"  # Increment and format
-
-            # If there is no last bill, set bill_id to BILL0001
-            else:
-                new_id = "BILL0001"  # Initial ID
+            self.bill_id = next_id(CheckoutBill, using=kwargs.get("using"))
 
-            # Set the bill_id
-            self.bill_id = new_id
+            # The key is new, skip the update attempt
+            kwargs.setdefault("force_insert", True)
 
         # Call the save method of the parent class
         super().save(*args, **kwargs)
+
+
+# Class based model for the state of the incremental bill exports
+class BillExportState(models.Model):
+    """
+    Model for storing how far each incremental bill export has gone
+    Attributes:
+        name (CharField): A CharField that stores the name of the export.
+        last_created_at (DateTimeField): A DateTimeField that stores the creation time of the last exported bill.
+        last_bill_id (CharField): A CharField that stores the ID of the last exported bill.
+        recent_bill_ids (JSONField): A JSONField that stores the IDs of the exported bills the next run reads again.
+        exported_at (DateTimeField): A DateTimeField that stores when the export last ran.
+    """
+
+    # Fields
+    name = models.CharField(max_length=50, primary_key=True, verbose_name=_("Name"))
+    last_created_at = models.DateTimeField(
+        null=True, blank=True, verbose_name=_("Last Created At")
+    )
+    last_bill_id = models.CharField(
+        max_length=20, blank=True, verbose_name=_("Last Bill ID")
+    )
+    recent_bill_ids = models.JSONField(
+        default=list, blank=True, verbose_name=_("Recent Bill IDs")
+    )
+    exported_at = models.DateTimeField(auto_now=True, verbose_name=_("Exported At"))
+
+    # Methods
+    def __str__(self):
+        return self.name
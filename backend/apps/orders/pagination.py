@@ -0,0 +1,108 @@
+# Imports
+import base64
+import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+# Class based keyset pagination for the bills
+class BillKeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination over bills, newest first.
+
+    The cursor holds the (bill_date, created_at, bill_id) of the last bill of
+    the page and the next page starts strictly after it, so every page costs
+    the same whatever its depth. Unlike an offset, no skipped rows are ever
+    read. The bills of a day are ordered by creation time, the string IDs
+    only break ties since BILL99999 sorts after BILL100000 as text.
+    """
+
+    # Pagination settings
+    page_size = 50
+    max_page_size = 500
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    ordering = ("-bill_date", "-created_at", "-bill_id")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        # Save the request for the next link
+        self.request = request
+        self.page_size = self.get_page_size(request)
+
+        # Start after the cursor if one is given
+        cursor = self.decode_cursor(request)
+        if cursor:
+            queryset = self.after(queryset, *cursor)
+
+        # Fetch one extra row to know if there is a next page
+        bills = list(queryset.order_by(*self.ordering)[: self.page_size + 1])
+        self.has_next = len(bills) > self.page_size
+        self.page = bills[: self.page_size]
+        return self.page
+
+    def after(self, queryset, bill_date, created_at, bill_id):
+        # Bills after a position, the bill_date bound lets the index start there
+        return queryset.filter(
+            Q(bill_date__lte=bill_date)
+            & (
+                Q(bill_date__lt=bill_date)
+                | Q(bill_date=bill_date, created_at__lt=created_at)
+                | Q(bill_date=bill_date, created_at=created_at, bill_id__lt=bill_id)
+            )
+        )
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "results": data,
+            }
+        )
+
+    def get_page_size(self, request):
+        # Use the requested page size if it is valid
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    def get_next_link(self):
+        # There is no next page
+        if not self.has_next:
+            return None
+
+        # Encode the position of the last bill of the page
+        last = self.page[-1]
+        position = "|".join(
+            [
+                last.bill_date.isoformat(),
+                last.created_at.isoformat(),
+                last.bill_id,
+            ]
+        )
+        cursor = base64.urlsafe_b64encode(position.encode()).decode()
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        # Get the cursor
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        # Decode the position of the last bill
+        try:
+            position = base64.urlsafe_b64decode(encoded.encode()).decode()
+            bill_date, created_at, bill_id = position.split("|", 2)
+            return (
+                datetime.date.fromisoformat(bill_date),
+                datetime.datetime.fromisoformat(created_at),
+                bill_id,
+            )
+        except (TypeError, ValueError):
+            raise NotFound("Invalid cursor")
@@ -1,5 +1,11 @@
 # Imports
 from rest_framework import serializers
+
+from backend.apps.catalog.prices import price_orders
+from backend.apps.catalog.pricing import PricingError
+from backend.apps.core.serializers import ValuesSerializer
+from backend.apps.core.versioning import RowVersion
+
 from .models import CheckoutBill, Order
 
 
@@ -8,6 +14,15 @@ class OrderSerializer(serializers.ModelSerializer):
     # Fields
     order_id = serializers.CharField(read_only=True, required=False)
     order_date = serializers.DateField(read_only=True, required=False)
+    unit_price = serializers.DecimalField(
+        read_only=True, required=False, max_digits=10, decimal_places=2
+    )
+    discount = serializers.DecimalField(
+        read_only=True, required=False, max_digits=10, decimal_places=2
+    )
+    tax = serializers.DecimalField(
+        read_only=True, required=False, max_digits=10, decimal_places=2
+    )
     total_price = serializers.DecimalField(
         read_only=True, required=False, max_digits=10, decimal_places=2
     )
@@ -21,11 +36,20 @@ class OrderSerializer(serializers.ModelSerializer):
             "item_id",
             "quantity",
             "unit_price",
+            "discount",
+            "tax",
             "total_price",
         ]
 
-        # Set read only fields
-        read_only_fields = ["order_id", "order_date", "total_price"]
+        # Set read only fields, the prices come from the catalog
+        read_only_fields = [
+            "order_id",
+            "order_date",
+            "unit_price",
+            "discount",
+            "tax",
+            "total_price",
+        ]
 
 
 # Class based serializer to serialize the bill data
@@ -36,33 +60,76 @@ class CheckoutBillSerializer(serializers.ModelSerializer):
     # Meta class
     class Meta:
         model = CheckoutBill
-        fields = ["bill_id", "bill_date", "emp_id", "cust_id", "orders", "total_price"]
-        read_only_fields = ["bill_id", "bill_date", "total_price"]
+        fields = [
+            "bill_id",
+            "bill_date",
+            "emp_id",
+            "cust_id",
+            "orders",
+            "discount",
+            "total_price",
+        ]
+        read_only_fields = ["bill_id", "bill_date", "discount", "total_price"]
+
+    def validate(self, attrs):
+        # Price the lines and the bill from the catalog
+        try:
+            attrs["discount"] = price_orders(attrs["orders"])
+        except PricingError as error:
+            raise serializers.ValidationError({"orders": error.errors})
+        return attrs
 
     def create(self, validated_data):
         # Get the orders data
         orders_data = validated_data.pop("orders")
 
-        # Create the bill
-        bill = CheckoutBill.objects.create(**validated_data)
+        # Create the bill and its orders in one batch
+        return CheckoutBill.objects.create_with_orders(orders_data, **validated_data)
+
+
+# Read-only serializer of the bills from values() rows, same output as above
+bill_values = ValuesSerializer(CheckoutBillSerializer)
 
-        # Create the orders and associate them with the bill
-        created_orders = []
-        for order_data in orders_data:
-            order = Order.objects.create(**order_data)
-            created_orders.append(order)
 
-        # Add the created orders to the bill
-        bill.orders.add(*created_orders)
+# Version of the bill rows, the ETag of the search responses
+bill_version = RowVersion(CheckoutBill)
 
-        # Update the total price of the bill
-        total_price = sum([order.total_price for order in created_orders])
 
-        # Set the total price of the bill
-        bill.total_price = total_price
+# Class based serializer to validate the bill list filters
+class BillFilterSerializer(serializers.Serializer):
+    # Fields
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    cust_id = serializers.CharField(required=False)
+    emp_id = serializers.CharField(required=False)
+    min_total = serializers.DecimalField(
+        required=False, max_digits=10, decimal_places=2
+    )
+    max_total = serializers.DecimalField(
+        required=False, max_digits=10, decimal_places=2
+    )
 
-        # Save the bill
-        bill.save()
+    # Lookups used for each filter
+    lookups = {
+        "date_from": "bill_date__gte",
+        "date_to": "bill_date__lte",
+        "cust_id": "cust_id",
+        "emp_id": "emp_id",
+        "min_total": "total_price__gte",
+        "max_total": "total_price__lte",
+    }
 
-        # Return the bill
-        return bill
+    def filter_queryset(self, queryset):
+        # Apply the validated filters
+        return queryset.filter(
+            **{self.lookups[name]: value for name, value in self.validated_data.items()}
+        )
+
+
+# Class based serializer to validate the bill export options
+class BillExportSerializer(serializers.Serializer):
+    # Fields
+    output = serializers.ChoiceField(choices=["csv", "ndjson"], default="csv")
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    since = serializers.DateTimeField(required=False)
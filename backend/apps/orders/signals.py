@@ -0,0 +1,54 @@
+# Imports
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from backend.apps.core.cache import response_cache
+
+from .models import CheckoutBill, Order
+
+
+# Bump the version of bills whose orders changed and drop their responses
+def touch_bills(bill_ids):
+    bill_ids = list(bill_ids)
+    if not bill_ids:
+        return
+
+    # The bill response embeds its orders, so its ETag must change with them
+    CheckoutBill.objects.filter(bill_id__in=bill_ids).update(
+        version=F("version") + 1, updated_at=timezone.now()
+    )
+    response_cache.invalidate("bill", *bill_ids)
+
+
+# Drop the cached search response of a changed bill
+@receiver(post_save, sender=CheckoutBill)
+@receiver(post_delete, sender=CheckoutBill)
+def invalidate_bill(sender, instance, **kwargs):
+    response_cache.invalidate("bill", instance.bill_id)
+
+
+# The bill response embeds its orders, update it when an order changes. A
+# deleted order is handled before the delete, while its links still exist
+@receiver(post_save, sender=Order)
+@receiver(pre_delete, sender=Order)
+def invalidate_order_bills(sender, instance, **kwargs):
+    touch_bills(instance.bills.values_list("bill_id", flat=True))
+
+
+# Update the bill response when orders are added or removed
+@receiver(m2m_changed, sender=CheckoutBill.orders.through)
+def invalidate_bill_orders(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+
+    # Changed from the bill side
+    if not reverse:
+        touch_bills([instance.bill_id])
+
+    # Changed from the order side, before a clear the links still exist
+    elif action == "pre_clear":
+        touch_bills(instance.bills.values_list("bill_id", flat=True))
+    else:
+        touch_bills(pk_set)
@@ -0,0 +1,332 @@
+# Imports
+import csv
+import datetime
+import io
+import math
+import os
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import F
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from backend.apps.catalog.models import Item
+from backend.apps.customers.models import Customer
+from backend.apps.core.ids import allocator, sequence_name
+from backend.apps.core.models import IDSequence
+from backend.apps.employees.models import Employee
+
+from .models import BULK_BATCH_SIZE, CheckoutBill, Order
+from .serializers import CheckoutBillSerializer
+
+
+# Get the user model
+User = get_user_model()
+
+
+# Queries of a bill whatever its number of lines, inside a transaction as in
+# the API: a savepoint, update, read back and release for the BILL and ORD ID
+# blocks (one nextval each on PostgreSQL), then a savepoint around the order,
+# bill and link inserts and the daily, employee, customer and item rollup
+# upserts
+def bill_query_budget():
+    id_queries = 1 if connection.vendor == "postgresql" else 4
+    return 2 * id_queries + 2 + 3 + 4
+
+
+# Extra INSERTs when the lines do not fit one batch of the backend
+def extra_batches(fields, rows):
+    batch_size = connection.ops.bulk_batch_size(fields, [None] * rows)
+    return math.ceil(rows / min(batch_size, BULK_BATCH_SIZE)) - 1
+
+
+# Employee, customer and catalog item the bills are made of
+class BillTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(
+            username="cashier",
+            email="cashier@example.com",
+            password="secret",
+            first_name="Test",
+            last_name="Cashier",
+            phone_number="+91-9876543210",
+        )
+        cls.employee = Employee.objects.create(
+            user=user,
+            address="1 Test Street",
+            department="Billing",
+            position="Cashier",
+            salary="1000.00",
+            hire_date=datetime.date(2020, 1, 1),
+        )
+        cls.customer = Customer.objects.create(
+            username="customer",
+            email="customer@example.com",
+            first_name="Test",
+            last_name="Customer",
+            phone_number="+91-9876543210",
+            address="1 Test Street",
+        )
+        Item.objects.create(item_id="ITEM0001", name="Tea", price="10.00")
+
+    def setUp(self):
+        allocator._reset()
+
+    def create_bill(self, lines, customer=None):
+        serializer = CheckoutBillSerializer(
+            data={
+                "emp_id": self.employee.emp_id,
+                "cust_id": (customer or self.customer).cust_id,
+                "orders": [{"item_id": "ITEM0001", "quantity": 2}] * lines,
+            }
+        )
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        return serializer
+
+
+# Tests of the batched bill write path
+class CheckoutBillCreateTests(BillTestCase):
+    def assert_budget(self, lines):
+        # Warm the per-process state (prices, sequences) with a first bill
+        self.create_bill(1).save()
+
+        # Numbers of native sequences are kept after the first bill, the bill
+        # under test reserves its own blocks as on SQLite
+        allocator._blocks.clear()
+
+        serializer = self.create_bill(lines)
+        order_fields = Order._meta.concrete_fields
+        link_fields = CheckoutBill.orders.through._meta.concrete_fields
+        expected = (
+            bill_query_budget()
+            + extra_batches(order_fields, lines)
+            + extra_batches(link_fields, lines)
+        )
+        with self.assertNumQueries(expected):
+            bill = serializer.save()
+
+        self.assertEqual(bill.orders.count(), lines)
+        self.assertEqual(
+            bill.total_price,
+            sum(order.total_price for order in bill.orders.all()) - bill.discount,
+        )
+
+    def test_query_budget_1_line(self):
+        self.assert_budget(1)
+
+    def test_query_budget_10_lines(self):
+        self.assert_budget(10)
+
+    def test_query_budget_500_lines(self):
+        self.assert_budget(500)
+
+    def test_unknown_items_are_reported_per_line(self):
+        Item.objects.create(item_id="ITEM0002", name="Old", price="1", is_active=False)
+        serializer = CheckoutBillSerializer(
+            data={
+                "emp_id": self.employee.emp_id,
+                "cust_id": self.customer.cust_id,
+                "orders": [
+                    {"item_id": "ITEM0001", "quantity": 2},
+                    {"item_id": "ITEM9999", "quantity": 1},
+                    {"item_id": "ITEM0002", "quantity": 1},
+                ],
+            }
+        )
+
+        # Only the lines whose items cannot be sold get an error
+        self.assertFalse(serializer.is_valid())
+        errors = serializer.errors["orders"]
+        self.assertEqual(errors[0], {})
+        self.assertEqual(
+            errors[1], {"item_id": ["Item ITEM9999 is not in the catalog."]}
+        )
+        self.assertEqual(
+            errors[2], {"item_id": ["Item ITEM0002 is not in the catalog."]}
+        )
+
+
+# Tests of the keyset pagination of the bill list
+class BillListPaginationTests(BillTestCase):
+    def list_bills(self, **params):
+        response = self.client.get(reverse("bill_list"), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def follow(self, **params):
+        # Get the bill IDs of every page, following the next links
+        bill_ids = []
+        page = self.list_bills(**params)
+        while True:
+            bill_ids += [bill["bill_id"] for bill in page["results"]]
+            if page["next"] is None:
+                return bill_ids
+            response = self.client.get(page["next"])
+            self.assertEqual(response.status_code, 200)
+            page = response.json()
+
+    def skip_bill_ids_to(self, last_value):
+        # Continue the BILL numbers after the given value
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT setval(%s, %s)", [sequence_name("BILL"), last_value]
+                )
+        else:
+            IDSequence.objects.update_or_create(
+                prefix="BILL", defaults={"last_value": last_value}
+            )
+        allocator._reset()
+
+    def test_bills_of_a_day_are_in_creation_order(self):
+        self.skip_bill_ids_to(99998)
+        first = self.create_bill(1).save()
+        second = self.create_bill(1).save()
+        bill_ids = [second.bill_id, first.bill_id]
+
+        # BILL99999 sorts after the six digit IDs as text
+        self.assertEqual(first.bill_id, "BILL99999")
+        self.assertGreater(first.bill_id, second.bill_id)
+        self.assertEqual(self.follow(), bill_ids)
+        self.assertEqual(self.follow(page_size=1), bill_ids)
+
+    def test_cursor_round_trip(self):
+        bills = [self.create_bill(1).save().bill_id for _ in range(3)]
+
+        page = self.list_bills(page_size=2)
+        self.assertEqual([bill["bill_id"] for bill in page["results"]], bills[:0:-1])
+        self.assertIsNotNone(page["next"])
+        self.assertEqual(self.follow(page_size=1), bills[::-1])
+
+    def test_invalid_cursor(self):
+        self.create_bill(1).save()
+
+        for cursor in ["not a cursor", "MjAyNC0wMS0zMQ==", "eHx5fHo="]:
+            response = self.client.get(reverse("bill_list"), {"cursor": cursor})
+            self.assertEqual(response.status_code, 404)
+
+    def test_filters_apply_with_a_cursor(self):
+        other = Customer.objects.create(
+            username="other",
+            email="other@example.com",
+            first_name="Other",
+            last_name="Customer",
+            phone_number="+91-9876543210",
+            address="2 Test Street",
+        )
+        bills = []
+        for customer in [self.customer, other] * 3:
+            bill = self.create_bill(1, customer=customer).save()
+            if customer == other:
+                bills.append(bill.bill_id)
+
+        self.assertEqual(self.follow(cust_id=other.cust_id, page_size=1), bills[::-1])
+
+    def test_query_count_does_not_grow_with_the_page(self):
+        for _ in range(6):
+            self.create_bill(2).save()
+
+        # The first page and a page behind a cursor cost the same
+        with CaptureQueriesContext(connection) as first:
+            page = self.list_bills(page_size=2)
+        with CaptureQueriesContext(connection) as second:
+            response = self.client.get(page["next"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["results"]), 2)
+        self.assertEqual(len(first), len(second))
+
+
+# Tests of the cached bill search responses
+class BillSearchCacheTests(BillTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.bill = self.create_bill(2).save()
+        self.url = reverse("bill_search", kwargs={"bill_id": self.bill.bill_id})
+
+    def test_deleted_order_updates_the_bill(self):
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.json()["orders"]), 2)
+
+        # The links still exist when the receiver runs
+        with self.captureOnCommitCallbacks(execute=True):
+            self.bill.orders.first().delete()
+
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.json()["orders"]), 1)
+        self.assertEqual(response["ETag"], '"v2"')
+
+    def test_entry_of_an_older_version_is_not_served(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.json()["discount"], "0.00")
+
+        # A save made by another worker, whose invalidation this cache misses
+        CheckoutBill.objects.filter(bill_id=self.bill.bill_id).update(
+            discount="1.00", version=F("version") + 1
+        )
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.json()["discount"], "1.00")
+        self.assertEqual(response["ETag"], '"v2"')
+
+
+# Tests of the search throttle of the bill search views
+@override_settings(
+    REST_FRAMEWORK={
+        **settings.REST_FRAMEWORK,
+        "DEFAULT_THROTTLE_RATES": {
+            **settings.REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"],
+            "search": "2/min",
+        },
+    }
+)
+class BillSearchThrottleTests(BillTestCase):
+    def test_async_view_shares_the_search_bucket(self):
+        bill_id = self.create_bill(1).save().bill_id
+        self.client.get(reverse("bill_search", kwargs={"bill_id": bill_id}))
+
+        # The async view takes its token from the bucket of the DRF view
+        url = reverse("bill_search_async", kwargs={"bill_id": bill_id})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["RateLimit-Limit"], "2")
+        self.assertEqual(response["RateLimit-Remaining"], "0")
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("detail", response.json())
+        self.assertGreaterEqual(int(response["Retry-After"]), 1)
+
+
+# Tests of the incremental bill exports
+class BillExportTests(BillTestCase):
+    def export(self):
+        # Run the incremental export and get the exported bill IDs
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "bills.csv")
+            call_command(
+                "export_bills", output=path, incremental="test", stderr=io.StringIO()
+            )
+            with open(path, newline="", encoding="utf-8") as file:
+                return sorted({row["bill_id"] for row in csv.DictReader(file)})
+
+    def test_late_committed_bill_is_exported_once(self):
+        first = self.create_bill(1).save()
+        second = self.create_bill(2).save()
+        self.assertEqual(self.export(), [first.bill_id, second.bill_id])
+
+        # A bill created before the last export but committed after it
+        late = self.create_bill(1).save()
+        CheckoutBill.objects.filter(bill_id=late.bill_id).update(
+            created_at=second.created_at - datetime.timedelta(seconds=1)
+        )
+
+        self.assertEqual(self.export(), [late.bill_id])
+        self.assertEqual(self.export(), [])
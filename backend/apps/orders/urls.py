@@ -5,14 +5,34 @@ from . import views
 
 # Set url patterns
 urlpatterns = [
+    path(
+        "",
+        views.BillListView.as_view(),
+        name="bill_list",
+    ),
     path(
         "create/",
         views.BillCreateView.as_view(),
         name="bill_create",
     ),
+    path(
+        "bulk/",
+        views.BillBulkCreateView.as_view(),
+        name="bill_bulk_create",
+    ),
+    path(
+        "export/",
+        views.BillExportView.as_view(),
+        name="bill_export",
+    ),
     path(
         "search/<str:bill_id>/",
         views.BillSearchView.as_view(),
         name="bill_search",
     ),
+    path(
+        "async/search/<str:bill_id>/",
+        views.BillSearchAsyncView.as_view(),
+        name="bill_search_async",
+    ),
 ]
@@ -1,15 +1,81 @@
 # Imports
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.views import View
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework import status
+from rest_framework import generics, status
+from rest_framework.permissions import IsAuthenticated
 
-from drf_yasg import openapi
-from drf_yasg.utils import swagger_auto_schema
+from backend.apps.core.cache import cached_response
+from backend.apps.core.idempotency import idempotent
+from backend.apps.core.responses import json_response
+from backend.apps.core.swagger import openapi, swagger_auto_schema
+from backend.apps.core.throttling import throttled
 
-from .serializers import CheckoutBillSerializer
+from .bulk import BulkBillLoader
+from .exports import BillExporter
+from .pagination import BillKeysetPagination
+from .serializers import (
+    BillExportSerializer,
+    BillFilterSerializer,
+    CheckoutBillSerializer,
+    bill_values,
+    bill_version,
+)
 from .models import CheckoutBill
 
 
+# Class based view to list the bills
+class BillListView(generics.ListAPIView):
+    # Set the serializer and the pagination
+    serializer_class = CheckoutBillSerializer
+    pagination_class = BillKeysetPagination
+
+    # Get the filtered bills
+    def get_queryset(self):
+        # No filters while the schema is generated
+        if getattr(self, "swagger_fake_view", False):
+            return CheckoutBill.objects.none()
+
+        filters = BillFilterSerializer(data=self.request.query_params)
+        filters.is_valid(raise_exception=True)
+        return filters.filter_queryset(CheckoutBill.objects.all())
+
+    # Page through the bills as values() rows, their orders in one query
+    def list(self, request, *args, **kwargs):
+        bills = bill_values.queryset(self.get_queryset(), "created_at")
+        page = self.paginate_queryset(bills)
+        return self.get_paginated_response(bill_values.serialize(page))
+
+    # Swagger settings
+    @swagger_auto_schema(
+        operation_description="List the bills, newest first, one page at a time",
+        query_serializer=BillFilterSerializer,
+        manual_parameters=[
+            openapi.Parameter(
+                "cursor",
+                openapi.IN_QUERY,
+                description="Cursor of the page, taken from the next link",
+                type=openapi.TYPE_STRING,
+            ),
+            openapi.Parameter(
+                "page_size",
+                openapi.IN_QUERY,
+                description="Number of bills per page",
+                type=openapi.TYPE_INTEGER,
+            ),
+        ],
+        responses={200: "OK", 400: "Bad Request", 404: "Invalid cursor"},
+        tags=["Bill"],
+    )
+
+    # Get method to list the bills
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+
 # Class based view to create a bill
 class BillCreateView(APIView):
     # Swagger settings
@@ -26,19 +92,29 @@ class BillCreateView(APIView):
                         properties={
                             "item_id": openapi.Schema(type=openapi.TYPE_STRING),
                             "quantity": openapi.Schema(type=openapi.TYPE_INTEGER),
-                            "unit_price": openapi.Schema(
-                                type=openapi.TYPE_NUMBER, format=openapi.FORMAT_FLOAT
-                            ),
                         },
                     ),
                 ),
             },
         ),
-        responses={201: "Created", 400: "Bad Request"},
+        manual_parameters=[
+            openapi.Parameter(
+                "Idempotency-Key",
+                openapi.IN_HEADER,
+                description="Unique key of the bill, a retry with the same key returns the first response",
+                type=openapi.TYPE_STRING,
+            ),
+        ],
+        responses={
+            201: "Created",
+            400: "Bad Request",
+            422: "Idempotency-Key used for another request",
+        },
         tags=["Bill"],
     )
 
     # Post method to create a bill
+    @idempotent("bill_create")
     def post(self, request, format=None):
         # Deserialize the data for the bill
         bill_data = request.data
@@ -52,8 +128,100 @@ class BillCreateView(APIView):
             return Response(bill_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+# Class based view to create bills in bulk from an NDJSON upload
+class BillBulkCreateView(APIView):
+    # Throttle scope of the view
+    throttle_scope = "bulk_upload"
+
+    # Swagger settings
+    @swagger_auto_schema(
+        operation_description=(
+            "Create bills from an NDJSON body with one bill per line, in the "
+            "same format as the bill create endpoint. Returns one NDJSON result "
+            "line per bill with either the bill_id or the errors."
+        ),
+        manual_parameters=[
+            openapi.Parameter(
+                "chunk_size",
+                openapi.IN_QUERY,
+                description="Number of bills validated and inserted per transaction",
+                type=openapi.TYPE_INTEGER,
+            ),
+        ],
+        responses={200: "NDJSON results", 400: "Bad Request"},
+        tags=["Bill"],
+    )
+
+    # Post method to create the bills
+    def post(self, request, format=None):
+        # Get the chunk size
+        options = settings.BILL_BULK_UPLOAD
+        try:
+            chunk_size = int(
+                request.query_params.get("chunk_size", options["CHUNK_SIZE"])
+            )
+        except ValueError:
+            chunk_size = 0
+
+        # Check the chunk size
+        if not 0 < chunk_size <= options["MAX_CHUNK_SIZE"]:
+            return Response(
+                {
+                    "error": f"chunk_size must be between 1 and {options['MAX_CHUNK_SIZE']}"
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # Read the body line by line and stream the results back
+        loader = BulkBillLoader(chunk_size)
+        return StreamingHttpResponse(
+            loader.process(request._request),
+            content_type="application/x-ndjson",
+        )
+
+
+# Class based view to export the bills with their orders
+class BillExportView(APIView):
+    # Set permission to authenticated users only
+    permission_classes = [IsAuthenticated]
+
+    # Swagger settings
+    @swagger_auto_schema(
+        operation_description=(
+            "Stream every bill with its order lines as CSV or NDJSON, one row "
+            "per order line. Use since to only get the bills created after a "
+            "previous export. Bills that committed late are not lost: since "
+            "also returns the bills created in the five minutes before it, so "
+            "skip the order lines already received by order_id."
+        ),
+        query_serializer=BillExportSerializer,
+        responses={200: "CSV or NDJSON rows", 400: "Bad Request"},
+        tags=["Bill"],
+    )
+
+    # Get method to export the bills
+    def get(self, request, format=None):
+        # Validate the export options
+        options = BillExportSerializer(data=request.query_params)
+        if not options.is_valid():
+            return Response(options.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        # Stream the rows
+        exporter = BillExporter(**options.validated_data)
+        response = StreamingHttpResponse(
+            exporter.lines(), content_type=exporter.content_type
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="bills.{exporter.output}"'
+        )
+        return response
+
+
 # Class based view to search for a bill
 class BillSearchView(APIView):
+    # Throttle scope of the view
+    throttle_scope = "search"
+
     # Swagger settings
     @swagger_auto_schema(
         responses={200: "OK", 404: "Not Found"},
@@ -61,6 +229,7 @@ class BillSearchView(APIView):
     )
 
     # Get method to search for a bill
+    @cached_response("bill", "bill_id", bill_version)
     def get(self, request, bill_id, format=None):
         # If the bill ID is not provided, return a 404 response
         if not bill_id:
@@ -70,11 +239,30 @@ class BillSearchView(APIView):
 
         # Search for the bill with the given ID
         try:
-            bill = CheckoutBill.objects.get(bill_id=bill_id)
-            bill_serializer = CheckoutBillSerializer(bill)
-            return Response(bill_serializer.data, status=status.HTTP_200_OK)
+            bill = bill_values.get(CheckoutBill.objects.all(), bill_id=bill_id)
+            return Response(bill, status=status.HTTP_200_OK)
         except CheckoutBill.DoesNotExist:
             return Response(
                 {"error": f"Bill with ID {bill_id} does not exist"},
                 status=status.HTTP_404_NOT_FOUND,
             )
+
+
+# Class based view to search for a bill without blocking the worker
+class BillSearchAsyncView(View):
+    # Throttle scope of the view
+    throttle_scope = "search"
+
+    # Get method to search for a bill with the async ORM
+    @throttled
+    @cached_response("bill", "bill_id", bill_version)
+    async def get(self, request, bill_id):
+        try:
+            bill = await bill_values.aget(CheckoutBill.objects.all(), bill_id=bill_id)
+        except CheckoutBill.DoesNotExist:
+            return json_response(
+                {"error": f"Bill with ID {bill_id} does not exist"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        return json_response(bill)
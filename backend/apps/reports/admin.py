@@ -0,0 +1,10 @@
+# Imports
+from django.contrib import admin
+from .models import DailySales, DailyEmployeeSales, DailyCustomerSales, DailyItemSales
+
+
+# Register the models
+admin.site.register(DailySales)
+admin.site.register(DailyEmployeeSales)
+admin.site.register(DailyCustomerSales)
+admin.site.register(DailyItemSales)
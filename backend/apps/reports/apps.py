@@ -0,0 +1,12 @@
+# Imports
+from django.apps import AppConfig
+
+
+# App configuration
+class ReportsConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "backend.apps.reports"
+
+    # Connect the signal receivers
+    def ready(self):
+        from . import signals  # noqa: F401
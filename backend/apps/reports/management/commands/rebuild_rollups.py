@@ -0,0 +1,85 @@
+# Imports
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Max, Min
+
+from backend.apps.orders.models import CheckoutBill
+from backend.apps.reports.rollups import ROLLUPS, rebuild
+
+
+# Command to rebuild the sales rollup tables
+class Command(BaseCommand):
+    help = (
+        "Rebuild the daily sales rollup tables from the bills and orders, one "
+        "chunk of days per transaction. Without a date range every rollup row "
+        "is rebuilt. Bills created while a chunk is rebuilt may be counted "
+        "twice, so run it when no counter is billing."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--date-from",
+            type=datetime.date.fromisoformat,
+            help="First day to rebuild (YYYY-MM-DD)",
+        )
+        parser.add_argument(
+            "--date-to",
+            type=datetime.date.fromisoformat,
+            help="Last day to rebuild (YYYY-MM-DD)",
+        )
+        parser.add_argument(
+            "--chunk-days",
+            type=int,
+            default=31,
+            help="Number of days rebuilt per transaction",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database to rebuild",
+        )
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        chunk_days = options["chunk_days"]
+        if chunk_days < 1:
+            raise CommandError("--chunk-days must be at least 1")
+
+        # Get the range of days that have bills
+        bounds = CheckoutBill.objects.using(using).aggregate(
+            first=Min("bill_date"), last=Max("bill_date")
+        )
+        start = options["date_from"] or bounds["first"]
+        end = options["date_to"] or bounds["last"]
+
+        # A full rebuild also removes the rows of days without bills, in the
+        # transactions of the first and the last chunk
+        full = not options["date_from"] and not options["date_to"]
+
+        # Nothing to rebuild
+        if start is None or end is None or start > end:
+            if full:
+                with transaction.atomic(using=using):
+                    for model in ROLLUPS:
+                        model.objects.using(using).all().delete()
+            self.stdout.write("No bills to roll up")
+            return
+
+        # Rebuild the range chunk by chunk
+        first = True
+        while start <= end:
+            chunk_end = min(start + datetime.timedelta(days=chunk_days - 1), end)
+            rebuild(
+                start,
+                chunk_end,
+                using=using,
+                clear_before=full and first,
+                clear_after=full and chunk_end == end,
+            )
+            self.stdout.write(f"Rebuilt {start} to {chunk_end}")
+            start = chunk_end + datetime.timedelta(days=1)
+            first = False
+
+        self.stdout.write(self.style.SUCCESS("Rollup tables rebuilt"))
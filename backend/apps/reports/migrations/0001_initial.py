@@ -0,0 +1,192 @@
+# Generated by Django 4.2.11 on 2026-10-18 13:17
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("employees", "0003_widen_emp_id"),
+        ("customers", "0002_widen_cust_id_search_text"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyCustomerSales",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(verbose_name="Date")),
+                (
+                    "bill_count",
+                    models.IntegerField(default=0, verbose_name="Bill Count"),
+                ),
+                (
+                    "revenue",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=14,
+                        verbose_name="Revenue",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Daily Customer Sales",
+                "verbose_name_plural": "Daily Customer Sales",
+                "ordering": ["date"],
+            },
+        ),
+        migrations.CreateModel(
+            name="DailyEmployeeSales",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(verbose_name="Date")),
+                (
+                    "bill_count",
+                    models.IntegerField(default=0, verbose_name="Bill Count"),
+                ),
+                (
+                    "revenue",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=14,
+                        verbose_name="Revenue",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Daily Employee Sales",
+                "verbose_name_plural": "Daily Employee Sales",
+                "ordering": ["date"],
+            },
+        ),
+        migrations.CreateModel(
+            name="DailyItemSales",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(verbose_name="Date")),
+                ("item_id", models.CharField(max_length=10, verbose_name="Item ID")),
+                (
+                    "order_count",
+                    models.IntegerField(default=0, verbose_name="Order Count"),
+                ),
+                ("quantity", models.IntegerField(default=0, verbose_name="Quantity")),
+                (
+                    "revenue",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=14,
+                        verbose_name="Revenue",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Daily Item Sales",
+                "verbose_name_plural": "Daily Item Sales",
+                "ordering": ["date"],
+            },
+        ),
+        migrations.CreateModel(
+            name="DailySales",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(unique=True, verbose_name="Date")),
+                (
+                    "bill_count",
+                    models.IntegerField(default=0, verbose_name="Bill Count"),
+                ),
+                (
+                    "order_count",
+                    models.IntegerField(default=0, verbose_name="Order Count"),
+                ),
+                ("quantity", models.IntegerField(default=0, verbose_name="Quantity")),
+                (
+                    "revenue",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=14,
+                        verbose_name="Revenue",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Daily Sales",
+                "verbose_name_plural": "Daily Sales",
+                "ordering": ["date"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="dailyitemsales",
+            constraint=models.UniqueConstraint(
+                fields=("date", "item_id"), name="unique_daily_item_sales"
+            ),
+        ),
+        migrations.AddField(
+            model_name="dailyemployeesales",
+            name="emp_id",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                to="employees.employee",
+                verbose_name="Employee ID",
+            ),
+        ),
+        migrations.AddField(
+            model_name="dailycustomersales",
+            name="cust_id",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                to="customers.customer",
+                verbose_name="Customer ID",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="dailyemployeesales",
+            constraint=models.UniqueConstraint(
+                fields=("date", "emp_id"), name="unique_daily_employee_sales"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="dailycustomersales",
+            constraint=models.UniqueConstraint(
+                fields=("date", "cust_id"), name="unique_daily_customer_sales"
+            ),
+        ),
+    ]
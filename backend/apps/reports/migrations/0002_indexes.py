@@ -0,0 +1,57 @@
+# Generated by Django 4.2.11 on 2026-10-18 13:18
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from backend.apps.core.db.migrations import (
+    AddIndexConcurrently,
+    DropFieldIndexConcurrently,
+)
+
+
+class Migration(migrations.Migration):
+
+    # The indexes are built and dropped concurrently on PostgreSQL
+    atomic = False
+
+    dependencies = [
+        ("customers", "0002_widen_cust_id_search_text"),
+        ("employees", "0003_widen_emp_id"),
+        ("reports", "0001_initial"),
+    ]
+
+    operations = [
+        # Build the new indexes before dropping the ones they replace
+        AddIndexConcurrently(
+            model_name="dailycustomersales",
+            index=models.Index(fields=["cust_id", "date"], name="daily_cust_sales_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="dailyemployeesales",
+            index=models.Index(fields=["emp_id", "date"], name="daily_emp_sales_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="dailyitemsales",
+            index=models.Index(fields=["item_id", "date"], name="daily_item_sales_idx"),
+        ),
+        DropFieldIndexConcurrently(
+            model_name="dailycustomersales",
+            name="cust_id",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="customers.customer",
+                verbose_name="Customer ID",
+            ),
+        ),
+        DropFieldIndexConcurrently(
+            model_name="dailyemployeesales",
+            name="emp_id",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="employees.employee",
+                verbose_name="Employee ID",
+            ),
+        ),
+    ]
@@ -0,0 +1,177 @@
+# Imports
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+# Class based model for the daily sales
+class DailySales(models.Model):
+    """
+    Model for storing the sales of each day.
+    Attributes:
+        date (DateField): A DateField that stores the day.
+        bill_count (IntegerField): An IntegerField that stores the number of bills of the day.
+        order_count (IntegerField): An IntegerField that stores the number of order lines of the day.
+        quantity (IntegerField): An IntegerField that stores the number of items sold on the day.
+        revenue (DecimalField): A DecimalField that stores the sum of the bill totals of the day.
+    """
+
+    # Key fields used by the rollup updates
+    key_fields = ["date"]
+
+    # Fields
+    date = models.DateField(unique=True, verbose_name=_("Date"))
+    bill_count = models.IntegerField(default=0, verbose_name=_("Bill Count"))
+    order_count = models.IntegerField(default=0, verbose_name=_("Order Count"))
+    quantity = models.IntegerField(default=0, verbose_name=_("Quantity"))
+    revenue = models.DecimalField(
+        max_digits=14, decimal_places=2, default=0, verbose_name=_("Revenue")
+    )
+
+    # Metadata
+    class Meta:
+        ordering = ["date"]
+        verbose_name = _("Daily Sales")
+        verbose_name_plural = _("Daily Sales")
+
+    # Methods
+    def __str__(self):
+        return f"{self.date}"
+
+
+# Class based model for the daily sales of each employee
+class DailyEmployeeSales(models.Model):
+    """
+    Model for storing the sales of each employee per day.
+    Attributes:
+        date (DateField): A DateField that stores the day.
+        emp_id (ForeignKey): A ForeignKey that stores the employee's ID.
+        bill_count (IntegerField): An IntegerField that stores the number of bills of the employee.
+        revenue (DecimalField): A DecimalField that stores the sum of the bill totals of the employee.
+    """
+
+    # Key fields used by the rollup updates
+    key_fields = ["date", "emp_id"]
+
+    # Fields
+    date = models.DateField(verbose_name=_("Date"))
+    emp_id = models.ForeignKey(
+        "employees.Employee",
+        on_delete=models.CASCADE,
+        db_index=False,
+        verbose_name=_("Employee ID"),
+    )
+    bill_count = models.IntegerField(default=0, verbose_name=_("Bill Count"))
+    revenue = models.DecimalField(
+        max_digits=14, decimal_places=2, default=0, verbose_name=_("Revenue")
+    )
+
+    # Metadata
+    class Meta:
+        ordering = ["date"]
+        verbose_name = _("Daily Employee Sales")
+        verbose_name_plural = _("Daily Employee Sales")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["date", "emp_id"], name="unique_daily_employee_sales"
+            ),
+        ]
+
+        # Report rows of one employee over a date range
+        indexes = [models.Index(fields=["emp_id", "date"], name="daily_emp_sales_idx")]
+
+    # Methods
+    def __str__(self):
+        return f"{self.date} {self.emp_id_id}"
+
+
+# Class based model for the daily sales of each customer
+class DailyCustomerSales(models.Model):
+    """
+    Model for storing the sales of each customer per day.
+    Attributes:
+        date (DateField): A DateField that stores the day.
+        cust_id (ForeignKey): A ForeignKey that stores the customer's ID.
+        bill_count (IntegerField): An IntegerField that stores the number of bills of the customer.
+        revenue (DecimalField): A DecimalField that stores the sum of the bill totals of the customer.
+    """
+
+    # Key fields used by the rollup updates
+    key_fields = ["date", "cust_id"]
+
+    # Fields
+    date = models.DateField(verbose_name=_("Date"))
+    cust_id = models.ForeignKey(
+        "customers.Customer",
+        on_delete=models.CASCADE,
+        db_index=False,
+        verbose_name=_("Customer ID"),
+    )
+    bill_count = models.IntegerField(default=0, verbose_name=_("Bill Count"))
+    revenue = models.DecimalField(
+        max_digits=14, decimal_places=2, default=0, verbose_name=_("Revenue")
+    )
+
+    # Metadata
+    class Meta:
+        ordering = ["date"]
+        verbose_name = _("Daily Customer Sales")
+        verbose_name_plural = _("Daily Customer Sales")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["date", "cust_id"], name="unique_daily_customer_sales"
+            ),
+        ]
+
+        # Report rows of one customer over a date range
+        indexes = [
+            models.Index(fields=["cust_id", "date"], name="daily_cust_sales_idx")
+        ]
+
+    # Methods
+    def __str__(self):
+        return f"{self.date} {self.cust_id_id}"
+
+
+# Class based model for the daily sales of each item
+class DailyItemSales(models.Model):
+    """
+    Model for storing the sales of each item per day.
+    Attributes:
+        date (DateField): A DateField that stores the day.
+        item_id (CharField): A CharField that stores the item's ID.
+        order_count (IntegerField): An IntegerField that stores the number of order lines of the item.
+        quantity (IntegerField): An IntegerField that stores the quantity of the item sold.
+        revenue (DecimalField): A DecimalField that stores the sum of the order totals of the item.
+    """
+
+    # Key fields used by the rollup updates
+    key_fields = ["date", "item_id"]
+
+    # Fields
+    date = models.DateField(verbose_name=_("Date"))
+    item_id = models.CharField(max_length=10, verbose_name=_("Item ID"))
+    order_count = models.IntegerField(default=0, verbose_name=_("Order Count"))
+    quantity = models.IntegerField(default=0, verbose_name=_("Quantity"))
+    revenue = models.DecimalField(
+        max_digits=14, decimal_places=2, default=0, verbose_name=_("Revenue")
+    )
+
+    # Metadata
+    class Meta:
+        ordering = ["date"]
+        verbose_name = _("Daily Item Sales")
+        verbose_name_plural = _("Daily Item Sales")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["date", "item_id"], name="unique_daily_item_sales"
+            ),
+        ]
+
+        # Report rows of one item over a date range
+        indexes = [
+            models.Index(fields=["item_id", "date"], name="daily_item_sales_idx")
+        ]
+
+    # Methods
+    def __str__(self):
+        return f"{self.date} {self.item_id}"
@@ -0,0 +1,279 @@
+# Imports
+from collections import defaultdict
+
+from django.db import IntegrityError, connections, transaction
+from django.db.models import Count, F, Sum
+
+from backend.apps.orders.models import CheckoutBill
+
+from .models import DailySales, DailyEmployeeSales, DailyCustomerSales, DailyItemSales
+
+
+# Rollup models kept up to date by this module
+ROLLUPS = [DailySales, DailyEmployeeSales, DailyCustomerSales, DailyItemSales]
+
+
+# Count field of each rollup, a row whose count drops to 0 is removed
+COUNT_FIELDS = {
+    DailySales: "bill_count",
+    DailyEmployeeSales: "bill_count",
+    DailyCustomerSales: "bill_count",
+    DailyItemSales: "order_count",
+}
+
+
+# Get empty increments for every rollup
+def empty_rows():
+    return {model: defaultdict(lambda: defaultdict(int)) for model in ROLLUPS}
+
+
+# Group the increments of a batch of bills by rollup row
+def collect(bills):
+    """
+    Take [(bill, [orders])] and return {model: {key: {field: increment}}}.
+    """
+
+    rows = empty_rows()
+    for bill, orders in bills:
+        # Bills of the day
+        day = rows[DailySales][(bill.bill_date,)]
+        day["bill_count"] += 1
+        day["revenue"] += bill.total_price
+
+        # Sales of the employee and of the customer
+        for model, pk in (
+            (DailyEmployeeSales, bill.emp_id_id),
+            (DailyCustomerSales, bill.cust_id_id),
+        ):
+            row = rows[model][(bill.bill_date, pk)]
+            row["bill_count"] += 1
+            row["revenue"] += bill.total_price
+
+        # Order lines of the bill
+        add_lines(rows, bill.bill_date, orders)
+
+    return rows
+
+
+# Add the increments of the order lines of a day
+def add_lines(rows, date, orders):
+    day = rows[DailySales][(date,)]
+    day["order_count"] += len(orders)
+    day["quantity"] += sum(order.quantity for order in orders)
+
+    # Sales of each item
+    for order in orders:
+        item = rows[DailyItemSales][(date, order.item_id)]
+        item["order_count"] += 1
+        item["quantity"] += order.quantity
+        item["revenue"] += order.total_price
+
+
+# Add the bills to the rollup tables
+def record_bills(bills, using="default"):
+    for model, rows in collect(bills).items():
+        increment(model, rows, using)
+
+
+# Take deleted bills out of the rollup tables, before their links are deleted
+def remove_bills(bills, using="default"):
+    for model, rows in collect(bills).items():
+        decrement(model, rows, using)
+
+
+# Take deleted order lines out of the rollup tables, given [(date, [orders])]
+def remove_lines(lines, using="default"):
+    rows = empty_rows()
+    for date, orders in lines:
+        add_lines(rows, date, orders)
+    for model, model_rows in rows.items():
+        decrement(model, model_rows, using)
+
+
+# Replace edited order lines in the rollup tables, given [(date, old, new)]
+def replace_lines(lines, using="default"):
+    rows = empty_rows()
+    removed = empty_rows()
+    for date, old_orders, new_orders in lines:
+        add_lines(rows, date, new_orders)
+        add_lines(removed, date, old_orders)
+
+    # Apply the difference, the rows of the old lines exist already
+    for model in ROLLUPS:
+        for key, values in removed[model].items():
+            for name, value in values.items():
+                rows[model][key][name] -= value
+        increment(model, rows[model], using)
+        remove_empty(model, rows[model], using)
+
+
+# Atomically add the increments to the rollup rows, creating missing rows
+def increment(model, rows, using="default"):
+    if not rows:
+        return
+
+    # Upsert all the rows at once where the database supports it
+    if connections[using].features.supports_update_conflicts_with_target:
+        upsert(model, rows, using)
+        return
+
+    # Otherwise update each row with F() and create it when it is missing
+    key_names = [model._meta.get_field(name).attname for name in model.key_fields]
+    for key, values in rows.items():
+        lookup = dict(zip(key_names, key))
+        changes = {name: F(name) + value for name, value in values.items()}
+        queryset = model.objects.using(using).filter(**lookup)
+        if queryset.update(**changes):
+            continue
+        try:
+            with transaction.atomic(using=using):
+                model.objects.using(using).create(**lookup, **values)
+        except IntegrityError:
+            queryset.update(**changes)
+
+
+# Subtract the increments from the rollup rows and remove the emptied rows
+def decrement(model, rows, using="default"):
+    if not rows:
+        return
+
+    # The rows of a recorded bill exist, so they are only ever updated
+    key_names = [model._meta.get_field(name).attname for name in model.key_fields]
+    for key, values in rows.items():
+        model.objects.using(using).filter(**dict(zip(key_names, key))).update(
+            **{name: F(name) - value for name, value in values.items()}
+        )
+
+    remove_empty(model, rows, using)
+
+
+# Remove the rows of the changed days left without any bill or order line
+def remove_empty(model, rows, using="default"):
+    if not rows:
+        return
+    model.objects.using(using).filter(
+        date__in={key[0] for key in rows}, **{COUNT_FIELDS[model]: 0}
+    ).delete()
+
+
+# Increment the rows with INSERT ... ON CONFLICT DO UPDATE
+def upsert(model, rows, using):
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    opts = model._meta
+
+    # Get the key and value columns
+    key_fields = [opts.get_field(name) for name in model.key_fields]
+    value_fields = [
+        field
+        for field in opts.concrete_fields
+        if not field.primary_key and field not in key_fields
+    ]
+    fields = key_fields + value_fields
+    table = quote(opts.db_table)
+
+    # Build the statement, every value column is added to the existing one
+    columns = ", ".join(quote(field.column) for field in fields)
+    conflict = ", ".join(quote(field.column) for field in key_fields)
+    updates = ", ".join(
+        f"{quote(field.column)} = {table}.{quote(field.column)} + EXCLUDED.{quote(field.column)}"
+        for field in value_fields
+    )
+    row_sql = "(" + ", ".join(["%s"] * len(fields)) + ")"
+
+    # Get the parameters of each row
+    params = [
+        list(key) + [values.get(field.name, 0) for field in value_fields]
+        for key, values in rows.items()
+    ]
+
+    # Insert in batches that fit the parameter limit of the database
+    batch_size = max(connection.ops.bulk_batch_size(fields, params), 1)
+    with connection.cursor() as cursor:
+        for start in range(0, len(params), batch_size):
+            batch = params[start : start + batch_size]
+            cursor.execute(
+                f"INSERT INTO {table} ({columns}) VALUES "
+                + ", ".join([row_sql] * len(batch))
+                + f" ON CONFLICT ({conflict}) DO UPDATE SET {updates}",
+                [value for row in batch for value in row],
+            )
+
+
+# Recompute the rollup rows of a range of days from the bills and orders. The
+# rows before start or after end can be removed in the same transaction
+def rebuild(start, end, using="default", clear_before=False, clear_after=False):
+    bills = (
+        CheckoutBill.objects.using(using)
+        .filter(bill_date__range=(start, end))
+        .order_by()
+    )
+    lines = (
+        CheckoutBill.orders.through.objects.using(using)
+        .filter(checkoutbill__bill_date__range=(start, end))
+        .order_by()
+    )
+
+    with transaction.atomic(using=using):
+        # Remove the old rows of the range
+        for model in ROLLUPS:
+            model.objects.using(using).filter(date__range=(start, end)).delete()
+            if clear_before:
+                model.objects.using(using).filter(date__lt=start).delete()
+            if clear_after:
+                model.objects.using(using).filter(date__gt=end).delete()
+
+        # Sales of each day
+        days = {
+            row["checkoutbill__bill_date"]: row
+            for row in lines.values("checkoutbill__bill_date").annotate(
+                order_count=Count("pk"), quantity=Sum("order__quantity")
+            )
+        }
+        DailySales.objects.using(using).bulk_create(
+            DailySales(
+                date=row["bill_date"],
+                bill_count=row["bill_count"],
+                revenue=row["revenue"],
+                order_count=days.get(row["bill_date"], {}).get("order_count") or 0,
+                quantity=days.get(row["bill_date"], {}).get("quantity") or 0,
+            )
+            for row in bills.values("bill_date").annotate(
+                bill_count=Count("pk"), revenue=Sum("total_price")
+            )
+        )
+
+        # Sales of each employee and customer
+        for model, field in (
+            (DailyEmployeeSales, "emp_id"),
+            (DailyCustomerSales, "cust_id"),
+        ):
+            model.objects.using(using).bulk_create(
+                model(
+                    date=row["bill_date"],
+                    bill_count=row["bill_count"],
+                    revenue=row["revenue"],
+                    **{f"{field}_id": row[field]},
+                )
+                for row in bills.values("bill_date", field).annotate(
+                    bill_count=Count("pk"), revenue=Sum("total_price")
+                )
+            )
+
+        # Sales of each item
+        DailyItemSales.objects.using(using).bulk_create(
+            DailyItemSales(
+                date=row["checkoutbill__bill_date"],
+                item_id=row["order__item_id"],
+                order_count=row["order_count"],
+                quantity=row["quantity"],
+                revenue=row["revenue"],
+            )
+            for row in lines.values(
+                "checkoutbill__bill_date", "order__item_id"
+            ).annotate(
+                order_count=Count("pk"),
+                quantity=Sum("order__quantity"),
+                revenue=Sum("order__total_price"),
+            )
+        )
@@ -0,0 +1,64 @@
+# Imports
+from rest_framework import serializers
+from .models import DailySales, DailyEmployeeSales, DailyCustomerSales, DailyItemSales
+
+
+# Class based serializer to validate the report filters
+class ReportFilterSerializer(serializers.Serializer):
+    # Fields
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    emp_id = serializers.CharField(required=False)
+    cust_id = serializers.CharField(required=False)
+    item_id = serializers.CharField(required=False)
+
+    # Lookups used for each filter
+    lookups = {
+        "date_from": "date__gte",
+        "date_to": "date__lte",
+        "emp_id": "emp_id",
+        "cust_id": "cust_id",
+        "item_id": "item_id",
+    }
+
+    def filter_queryset(self, queryset, allowed):
+        # Apply the validated filters the report supports
+        return queryset.filter(
+            **{
+                self.lookups[name]: value
+                for name, value in self.validated_data.items()
+                if name in allowed
+            }
+        )
+
+
+# Class based serializer for the daily sales
+class DailySalesSerializer(serializers.ModelSerializer):
+    # Meta class
+    class Meta:
+        model = DailySales
+        fields = ["date", "bill_count", "order_count", "quantity", "revenue"]
+
+
+# Class based serializer for the daily sales of each employee
+class DailyEmployeeSalesSerializer(serializers.ModelSerializer):
+    # Meta class
+    class Meta:
+        model = DailyEmployeeSales
+        fields = ["date", "emp_id", "bill_count", "revenue"]
+
+
+# Class based serializer for the daily sales of each customer
+class DailyCustomerSalesSerializer(serializers.ModelSerializer):
+    # Meta class
+    class Meta:
+        model = DailyCustomerSales
+        fields = ["date", "cust_id", "bill_count", "revenue"]
+
+
+# Class based serializer for the daily sales of each item
+class DailyItemSalesSerializer(serializers.ModelSerializer):
+    # Meta class
+    class Meta:
+        model = DailyItemSales
+        fields = ["date", "item_id", "order_count", "quantity", "revenue"]
@@ -0,0 +1,45 @@
+# Imports
+from django.db.models.signals import post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from backend.apps.orders.models import CheckoutBill, Order, bills_created
+
+from .rollups import record_bills, remove_bills, remove_lines, replace_lines
+
+
+# Add new bills to the rollup tables in the same transaction
+@receiver(bills_created, sender=CheckoutBill)
+def update_rollups(sender, bills, using, **kwargs):
+    record_bills(bills, using=using)
+
+
+# Take a deleted bill out of the rollup tables, also when it is deleted with
+# its customer or employee. Its order lines are read before the links go
+@receiver(pre_delete, sender=CheckoutBill)
+def remove_bill_rollups(sender, instance, using, **kwargs):
+    remove_bills([(instance, list(instance.orders.using(using).all()))], using=using)
+
+
+# Take a deleted order line out of the rollups of the bills it belongs to
+@receiver(pre_delete, sender=Order)
+def remove_order_rollups(sender, instance, using, **kwargs):
+    dates = instance.bills.using(using).values_list("bill_date", flat=True)
+    remove_lines([(date, [instance]) for date in dates], using=using)
+
+
+# Read the stored line of an edited order before it is overwritten
+@receiver(pre_save, sender=Order)
+def read_edited_order(sender, instance, using, raw=False, **kwargs):
+    if raw or instance._state.adding:
+        return
+    instance._rollup_old = Order.objects.using(using).filter(pk=instance.pk).first()
+
+
+# Apply the old to new difference of an edited order line to the rollups
+@receiver(post_save, sender=Order)
+def update_order_rollups(sender, instance, created, using, raw=False, **kwargs):
+    old = instance.__dict__.pop("_rollup_old", None)
+    if raw or created or old is None:
+        return
+    dates = instance.bills.using(using).values_list("bill_date", flat=True)
+    replace_lines([(date, [old], [instance]) for date in dates], using=using)
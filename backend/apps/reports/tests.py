@@ -0,0 +1,99 @@
+# Imports
+import datetime
+import io
+from decimal import Decimal
+
+from django.core.management import call_command
+
+from backend.apps.catalog.models import Item
+from backend.apps.orders.models import Order
+from backend.apps.orders.tests import BillTestCase
+
+from .models import DailyCustomerSales, DailyItemSales, DailySales
+from .rollups import ROLLUPS
+
+
+# Get the rollup rows of every table as plain values, without their IDs
+def rollup_rows():
+    rows = {}
+    for model in ROLLUPS:
+        fields = [field.attname for field in model._meta.concrete_fields[1:]]
+        rows[model.__name__] = sorted(model.objects.values_list(*fields))
+    return rows
+
+
+# Tests of the sales rollup tables
+class RollupTests(BillTestCase):
+    def test_deleted_bill_is_subtracted(self):
+        kept = self.create_bill(1).save()
+        self.create_bill(2).save().delete()
+
+        day = DailySales.objects.get()
+        self.assertEqual(day.bill_count, 1)
+        self.assertEqual(day.order_count, 1)
+        self.assertEqual(day.revenue, kept.total_price)
+        self.assertEqual(DailyItemSales.objects.get().quantity, 2)
+
+    def test_customer_delete_removes_its_bills(self):
+        self.create_bill(2).save()
+        self.create_bill(3).save()
+
+        # The bills are deleted with the customer
+        self.customer.delete()
+
+        for model in ROLLUPS:
+            self.assertFalse(model.objects.exists(), model.__name__)
+
+    def test_deleted_order_is_subtracted(self):
+        bill = self.create_bill(2).save()
+        bill.orders.first().delete()
+
+        day = DailySales.objects.get()
+        self.assertEqual(day.order_count, 1)
+        self.assertEqual(day.quantity, 2)
+        self.assertEqual(day.revenue, bill.total_price)
+        item = DailyItemSales.objects.get()
+        self.assertEqual((item.order_count, item.quantity), (1, 2))
+        self.assertEqual(DailyCustomerSales.objects.get().bill_count, 1)
+
+    def test_edited_order_updates_the_rollups(self):
+        Item.objects.create(item_id="ITEM0002", name="Coffee", price="20.00")
+        self.create_bill(2).save()
+
+        # A line gets more of another item
+        order = Order.objects.order_by("pk").first()
+        order.item_id = "ITEM0002"
+        order.quantity = 5
+        order.unit_price = Decimal("20.00")
+        order.save()
+
+        day = DailySales.objects.get()
+        self.assertEqual((day.order_count, day.quantity), (2, 7))
+        items = {
+            row.item_id: (row.order_count, row.quantity, row.revenue)
+            for row in DailyItemSales.objects.all()
+        }
+        self.assertEqual(items["ITEM0001"], (1, 2, order.total_price / 5))
+        self.assertEqual(items["ITEM0002"], (1, 5, order.total_price))
+
+        # The incremental rows match a full rebuild
+        recorded = rollup_rows()
+        call_command("rebuild_rollups", stdout=io.StringIO())
+        self.assertEqual(rollup_rows(), recorded)
+
+        # Moving the last line of an item away removes the item's row
+        order = Order.objects.exclude(pk=order.pk).get()
+        order.item_id = "ITEM0002"
+        order.save()
+        self.assertEqual(DailyItemSales.objects.get().order_count, 2)
+
+    def test_full_rebuild_matches_the_recorded_rows(self):
+        self.create_bill(1).save()
+        self.create_bill(2).save().orders.first().delete()
+        recorded = rollup_rows()
+
+        # A row of a day without bills is removed by the full rebuild
+        DailySales.objects.create(date=datetime.date(2000, 1, 1), bill_count=1)
+        call_command("rebuild_rollups", stdout=io.StringIO())
+
+        self.assertEqual(rollup_rows(), recorded)
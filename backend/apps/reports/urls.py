@@ -0,0 +1,20 @@
+# Imports
+from django.urls import path
+from . import views
+
+
+# Set the url patterns for the reports app
+urlpatterns = [
+    path("daily/", views.DailySalesReportView.as_view(), name="report_daily"),
+    path(
+        "employees/",
+        views.DailyEmployeeSalesReportView.as_view(),
+        name="report_employees",
+    ),
+    path(
+        "customers/",
+        views.DailyCustomerSalesReportView.as_view(),
+        name="report_customers",
+    ),
+    path("items/", views.DailyItemSalesReportView.as_view(), name="report_items"),
+]
@@ -0,0 +1,102 @@
+# Imports
+from rest_framework import generics
+
+from backend.apps.core.swagger import swagger_auto_schema
+
+from .models import DailySales, DailyEmployeeSales, DailyCustomerSales, DailyItemSales
+from .serializers import (
+    ReportFilterSerializer,
+    DailySalesSerializer,
+    DailyEmployeeSalesSerializer,
+    DailyCustomerSalesSerializer,
+    DailyItemSalesSerializer,
+)
+
+
+# Base class for the report views, they only read the rollup tables
+class RollupReportView(generics.ListAPIView):
+    # Filters supported by the report besides the date range
+    filters = []
+
+    # Get the filtered rollup rows
+    def get_queryset(self):
+        # No filters while the schema is generated
+        if getattr(self, "swagger_fake_view", False):
+            return self.model.objects.none()
+
+        filters = ReportFilterSerializer(data=self.request.query_params)
+        filters.is_valid(raise_exception=True)
+        return filters.filter_queryset(
+            self.model.objects.all(), ["date_from", "date_to", *self.filters]
+        )
+
+
+# Class based view for the daily sales report
+class DailySalesReportView(RollupReportView):
+    model = DailySales
+    serializer_class = DailySalesSerializer
+
+    # Swagger settings
+    @swagger_auto_schema(
+        operation_description="Sales of each day",
+        query_serializer=ReportFilterSerializer,
+        tags=["Report"],
+    )
+
+    # Get method for the report
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+
+# Class based view for the daily employee sales report
+class DailyEmployeeSalesReportView(RollupReportView):
+    model = DailyEmployeeSales
+    serializer_class = DailyEmployeeSalesSerializer
+    filters = ["emp_id"]
+
+    # Swagger settings
+    @swagger_auto_schema(
+        operation_description="Sales of each employee per day",
+        query_serializer=ReportFilterSerializer,
+        tags=["Report"],
+    )
+
+    # Get method for the report
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+
+# Class based view for the daily customer sales report
+class DailyCustomerSalesReportView(RollupReportView):
+    model = DailyCustomerSales
+    serializer_class = DailyCustomerSalesSerializer
+    filters = ["cust_id"]
+
+    # Swagger settings
+    @swagger_auto_schema(
+        operation_description="Sales of each customer per day",
+        query_serializer=ReportFilterSerializer,
+        tags=["Report"],
+    )
+
+    # Get method for the report
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+
+# Class based view for the daily item sales report
+class DailyItemSalesReportView(RollupReportView):
+    model = DailyItemSales
+    serializer_class = DailyItemSalesSerializer
+    filters = ["item_id"]
+
+    # Swagger settings
+    @swagger_auto_schema(
+        operation_description="Sales of each item per day",
+        query_serializer=ReportFilterSerializer,
+        tags=["Report"],
+    )
+
+    # Get method for the report
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
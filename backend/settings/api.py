@@ -0,0 +1,52 @@
+# Import settings from prod
+from .prod import *
+
+
+# Apps the API worker leaves out: the admin and its theme, the schema views
+# and the development tools are served by the full worker (backend.wsgi)
+API_EXCLUDED_APPS = [
+    "jazzmin",
+    "django.contrib.admin",
+    "django.contrib.sessions",
+    "django.contrib.messages",
+    "django.contrib.staticfiles",
+    "django_extensions",
+    "drf_yasg",
+]
+
+
+# Installed apps list
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in API_EXCLUDED_APPS]
+
+
+# Middleware list, the API authenticates with JWT and the static files are
+# served by the static build, so the session, auth, messages and static
+# middleware are left out
+MIDDLEWARE = [
+    "backend.apps.core.middleware.PerformanceMiddleware",
+    "django.middleware.security.SecurityMiddleware",
+    "corsheaders.middleware.CorsMiddleware",
+    "django.middleware.common.CommonMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "backend.apps.core.middleware.RateLimitHeadersMiddleware",
+]
+
+
+# Root URL configuration, the app URLs are imported on their first request
+ROOT_URLCONF = "backend.urls_api"
+
+
+# No template engine, the API only renders JSON
+TEMPLATES = []
+
+
+# Django REST Framework Settings, without the browsable API
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    "DEFAULT_RENDERER_CLASSES": ["rest_framework.renderers.JSONRenderer"],
+}
+
+
+# WSGI application
+WSGI_APPLICATION = "backend.wsgi_api.application"
@@ -4,6 +4,8 @@ import dotenv
 import datetime
 from pathlib import Path
 
+from corsheaders.defaults import default_headers
+
 
 # Load the environment variables
 dotenv.load_dotenv()
@@ -21,6 +23,12 @@ SECRET_KEY = os.environ.get("SECRET_KEY")
 AUTH_USER_MODEL = "home.User"
 
 
+# Check the passwords in the password pool
+AUTHENTICATION_BACKENDS = [
+    "backend.apps.jwtauth.backends.PooledModelBackend",
+]
+
+
 # Installed apps list
 INSTALLED_APPS = [
     # Admin theme
@@ -38,11 +46,14 @@ INSTALLED_APPS = [
     "rest_framework",
     "drf_yasg",
     # Installed apps
+    "backend.apps.core.apps.CoreConfig",
     "backend.apps.home.apps.HomeConfig",
     "backend.apps.customers.apps.CustomersConfig",
     "backend.apps.employees.apps.EmployeesConfig",
     "backend.apps.orders.apps.OrdersConfig",
     "backend.apps.jwtauth.apps.JwtauthConfig",
+    "backend.apps.reports.apps.ReportsConfig",
+    "backend.apps.catalog.apps.CatalogConfig",
 ]
 
 
@@ -50,17 +61,33 @@ INSTALLED_APPS = [
 CORS_ALLOWED_ORIGINS = ["https://*"]
 
 
+# Let the browsers send the idempotency keys
+CORS_ALLOW_HEADERS = (*default_headers, "idempotency-key")
+
+
+# Let the browsers read the rate limit headers
+CORS_EXPOSE_HEADERS = [
+    "RateLimit-Limit",
+    "RateLimit-Remaining",
+    "RateLimit-Reset",
+    "Retry-After",
+    "Idempotent-Replayed",
+]
+
+
 # Middleware list
 MIDDLEWARE = [
+    "backend.apps.core.middleware.PerformanceMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "backend.apps.core.staticfiles.StaticFilesMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "backend.apps.core.middleware.RateLimitHeadersMiddleware",
 ]
 
 
@@ -90,6 +117,65 @@ TEMPLATES = [
 WSGI_APPLICATION = "backend.wsgi.application"
 
 
+# Cache configuration
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+}
+
+
+# Response cache settings for the search endpoints
+RESPONSE_CACHE = {
+    "ALIAS": "default",
+    "TIMEOUT": 300,
+    "ENABLED": True,
+}
+
+
+# Process pool hashing and verifying the passwords
+PASSWORD_POOL = {
+    "ENABLED": True,
+    "WORKERS": None,
+    "MAX_QUEUE": 16,
+    "TIMEOUT": 5,
+}
+
+
+# Price table of the catalog items
+CATALOG = {
+    "ALIAS": "default",
+    "MAX_AGE": 60,
+}
+
+
+# Idempotency keys of the create endpoints
+IDEMPOTENCY = {
+    "TTL": 86400,
+    "MAX_KEY_LENGTH": 128,
+    "PRUNE_EVERY": 1000,
+}
+
+
+# Cache of the users resolved from the JWT access tokens. With a cache alias
+# shared by the workers a cached user costs no query, with a local-memory one
+# its row version is checked on every request
+JWT_USER_CACHE = {
+    "ALIAS": "default",
+    "MAX_SIZE": 1024,
+    "TIMEOUT": 60,
+    "ENABLED": True,
+}
+
+
+# Request instrumentation settings
+PERFORMANCE = {
+    "ENABLED": True,
+    "SAMPLE_RATE": 1.0,
+    "SLOW_QUERY_MS": 200,
+}
+
+
 # Internationalization
 LANGUAGE_CODE = "en-us"
 TIME_ZONE = "Asia/Kolkata"
@@ -146,7 +232,7 @@ AUTH_PASSWORD_VALIDATORS = [
 # Django REST Framework Settings
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "backend.apps.jwtauth.authentication.CachedJWTAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticatedOrReadOnly"
@@ -154,10 +240,36 @@ REST_FRAMEWORK = {
     # "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     # "PAGE_SIZE": 10,
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "backend.apps.core.throttling.UserTokenBucketThrottle",
+        "backend.apps.core.throttling.ScopedTokenBucketThrottle",
     ],
-    # "DEFAULT_THROTTLE_RATES": {"anon": "10/hour", "user": "100/hour"},
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": "120/min",
+        "user": "600/min",
+        "login": "30/min",
+        "search": "300/min",
+        "bulk_upload": "10/min",
+    },
+}
+
+
+# Swagger UI and ReDoc settings, the pages load the schema from swagger.json/
+# which serves the file built at deploy time
+SWAGGER_SETTINGS = {
+    "SPEC_URL": ("schema-json", {"format": ".json"}),
+}
+REDOC_SETTINGS = {
+    "SPEC_URL": ("schema-json", {"format": ".json"}),
+}
+
+
+# Token bucket throttle settings
+THROTTLE = {
+    "ENABLED": True,
+    "DATABASE": "default",
+    "EMPLOYEE_RATES": {},
+    "PRUNE_AFTER": 86400,
+    "PRUNE_EVERY": 1000,
 }
 
 
@@ -169,3 +281,17 @@ SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": datetime.timedelta(days=1),
     "REFRESH_TOKEN_LIFETIME": datetime.timedelta(days=7),
 }
+
+
+# ID allocator settings
+ID_ALLOCATOR = {
+    "BLOCK_SIZE": 20,
+    "WIDTH": 4,
+}
+
+
+# Bulk bill upload settings
+BILL_BULK_UPLOAD = {
+    "CHUNK_SIZE": 500,
+    "MAX_CHUNK_SIZE": 5000,
+}
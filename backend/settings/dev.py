@@ -17,3 +17,7 @@ DATABASES = {
         "NAME": BASE_DIR / "database" / "db.sqlite3",
     }
 }
+
+
+# SQLite builds the covering indexes without their INCLUDE columns
+SILENCED_SYSTEM_CHECKS = ["models.W040"]
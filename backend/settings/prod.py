@@ -10,10 +10,19 @@ DEBUG = False
 ALLOWED_HOSTS = [".vercel.app"]
 
 
+# Take the database connections from an in-process pool, set DATABASE_POOL
+# to false to fall back to Django's persistent connections
+DATABASE_POOL = os.environ.get("DATABASE_POOL", "true").lower() in ("1", "true")
+
+
 # PostgreSQL database settings
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql",
+        "ENGINE": (
+            "backend.apps.core.db.postgresql"
+            if DATABASE_POOL
+            else "django.db.backends.postgresql"
+        ),
         "NAME": "billing_db",
         "USER": os.environ.get("POSTGRES_USER"),
         "PASSWORD": os.environ.get("POSTGRES_PASSWORD"),
@@ -22,5 +31,20 @@ DATABASES = {
         "OPTIONS": {
             "sslmode": "require",
         },
+        # Pooled connections go back to the pool after each request,
+        # otherwise they are kept by the worker thread for CONN_MAX_AGE seconds
+        "CONN_MAX_AGE": (
+            0 if DATABASE_POOL else int(os.environ.get("CONN_MAX_AGE", "60"))
+        ),
+        # Check a kept connection before the first query of a request
+        "CONN_HEALTH_CHECKS": True,
+        # Pool settings, see backend/apps/core/db/pool.py
+        "POOL": {
+            "MIN_SIZE": int(os.environ.get("DATABASE_POOL_MIN_SIZE", "1")),
+            "MAX_SIZE": int(os.environ.get("DATABASE_POOL_MAX_SIZE", "10")),
+            "TIMEOUT": float(os.environ.get("DATABASE_POOL_TIMEOUT", "10")),
+            "MAX_LIFETIME": int(os.environ.get("DATABASE_POOL_MAX_LIFETIME", "3600")),
+            "MAX_IDLE": int(os.environ.get("DATABASE_POOL_MAX_IDLE", "600")),
+        },
     }
 }
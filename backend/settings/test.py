@@ -0,0 +1,36 @@
+# Import settings from dev
+from .dev import *
+
+
+# Run with: DJANGO_SETTINGS_MODULE=backend.settings.test python manage.py test
+SECRET_KEY = os.environ.get("SECRET_KEY") or "test-secret-key"
+
+
+# Run the tests on PostgreSQL when POSTGRES_HOST is set, on SQLite otherwise.
+# The SQLite test database is a file so the concurrency tests can open a
+# connection per thread
+if os.environ.get("POSTGRES_HOST"):
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.environ.get("POSTGRES_DB", "billing_db"),
+            "USER": os.environ.get("POSTGRES_USER"),
+            "PASSWORD": os.environ.get("POSTGRES_PASSWORD"),
+            "HOST": os.environ.get("POSTGRES_HOST"),
+            "PORT": os.environ.get("POSTGRES_PORT", "5432"),
+        }
+    }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": BASE_DIR.parent / "test_db.sqlite3",
+            "OPTIONS": {"timeout": 30},
+            "TEST": {"NAME": BASE_DIR.parent / "test_db.sqlite3"},
+        }
+    }
+
+
+# Hash the test passwords quickly and in process
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+PASSWORD_POOL = {**PASSWORD_POOL, "ENABLED": False}
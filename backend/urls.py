@@ -3,24 +3,7 @@ from django.contrib import admin
 from django.urls import path
 from django.urls.conf import include
 
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
-
-from rest_framework import permissions
-
-
-# Swagger settings
-schema_view = get_schema_view(
-    openapi.Info(
-        title="Django REST API - On Counter Billing System Backend API",
-        default_version="v1",
-        description="A Django REST API - On Counter Billing System Backend API",
-        contact=openapi.Contact(email="rohit.vilas.ingole@gmail.com"),
-        license=openapi.License(name="GPL-3.0 license"),
-    ),
-    public=True,
-    permission_classes=(permissions.AllowAny,),
-)
+from backend.apps.core.schema import SchemaFileView, schema_view
 
 
 # Set the url patters
@@ -31,9 +14,11 @@ urlpatterns = [
     path("employee/", include("backend.apps.employees.urls")),
     path("customer/", include("backend.apps.customers.urls")),
     path("bill/", include("backend.apps.orders.urls")),
+    path("report/", include("backend.apps.reports.urls")),
+    path("ops/", include("backend.apps.core.urls")),
     path(
         "swagger<format>/",
-        schema_view.without_ui(cache_timeout=0),
+        SchemaFileView.as_view(),
         name="schema-json",
     ),
     path(
@@ -0,0 +1,22 @@
+# Imports
+from django.urls import path
+
+
+# Include the URLconf of an app, imported when a request first reaches it
+def lazy_include(module):
+    # URLResolver imports a URLconf given by name on its first resolve
+    return (module, None, None)
+
+
+# Set the url patters of the API worker, the admin and the schema views are
+# served by the full worker
+urlpatterns = [
+    path("jwtauth/", lazy_include("backend.apps.jwtauth.urls")),
+    path("employee/", lazy_include("backend.apps.employees.urls")),
+    path("customer/", lazy_include("backend.apps.customers.urls")),
+    path("bill/", lazy_include("backend.apps.orders.urls")),
+    path("report/", lazy_include("backend.apps.reports.urls")),
+    path("ops/", lazy_include("backend.apps.core.urls")),
+    # Matches every path, so it comes last
+    path("", lazy_include("backend.apps.home.urls")),
+]
@@ -9,3 +9,15 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings.prod")
 
 # Initialize the WSGI application
 app = application = get_wsgi_application()
+
+
+# Open the pooled database connections before the first request
+from backend.apps.core.db.pool import warm_up  # noqa: E402
+
+warm_up()
+
+
+# Build the customer search index before the first search
+from backend.apps.customers.search import warm_up as warm_up_search  # noqa: E402
+
+warm_up_search()
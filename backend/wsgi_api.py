@@ -0,0 +1,42 @@
+# Imports
+import os
+import sys
+from django.core.wsgi import get_wsgi_application
+
+
+# Set the default Django settings module, the API only worker
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings.api")
+
+
+# Optional packages Django REST Framework imports when they are installed, used
+# by the schema and browsable API renderers the API worker does not serve, and
+# the PostgreSQL model fields it maps when present, which no model uses and
+# which import psycopg2 and django.test. A None entry makes their import raise
+# ImportError, so DRF skips them
+API_SKIPPED_MODULES = [
+    "yaml",
+    "pygments",
+    "markdown",
+    "coreapi",
+    "coreschema",
+    "django.contrib.postgres.fields",
+]
+
+for module in API_SKIPPED_MODULES:
+    sys.modules.setdefault(module, None)
+
+
+# Initialize the WSGI application
+app = application = get_wsgi_application()
+
+
+# Open the pooled database connections before the first request
+from backend.apps.core.db.pool import warm_up  # noqa: E402
+
+warm_up()
+
+
+# Build the customer search index without holding up the start of the worker
+from backend.apps.customers.search import warm_up as warm_up_search  # noqa: E402
+
+warm_up_search(background=True)
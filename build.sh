@@ -8,9 +8,11 @@ python3 -m ensurepip
 echo "Building the project..."
 python3 -m pip install -r requirements.txt
 
-echo "Make Migration..."
-python3 manage.py makemigrations --noinput
+echo "Migrate..."
 python3 manage.py migrate --noinput
 
+echo "Build OpenAPI Schema..."
+python3 manage.py build_openapi_schema
+
 echo "Collect Static..."
 python3 manage.py collectstatic --noinput --clear
\ No newline at end of file
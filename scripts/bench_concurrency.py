@@ -0,0 +1,165 @@
+"""
+Compare how the sync (WSGI) and async (ASGI) endpoints scale with the number
+of concurrent clients.
+
+Start one server per mode on the same database, for example:
+
+    gunicorn backend.wsgi --workers 1 --threads 8 --bind 127.0.0.1:8000
+    uvicorn backend.asgi:application --workers 1 --port 8001
+
+then point the script at them with endpoint paths that exist in the database:
+
+    python scripts/bench_concurrency.py \\
+        --sync http://127.0.0.1:8000/customer/search/CUST0001/ \\
+        --async http://127.0.0.1:8001/customer/async/search/CUST0001/ \\
+        --concurrency 1,8,32,128 --requests 2000
+
+Each client keeps one HTTP/1.1 connection open. Only the standard library is
+used, so the script runs without the project installed.
+"""
+
+# Imports
+import argparse
+import asyncio
+import json
+import time
+from urllib.parse import urlsplit
+
+
+# Send one GET request over an open connection and read the response
+async def fetch(reader, writer, host, path, headers):
+    writer.write(
+        f"GET {path} HTTP/1.1\r\nHost: {host}\r\n{headers}\r\n".encode("latin-1")
+    )
+    await writer.drain()
+
+    # Read the status line and the headers
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split()[1])
+    fields = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            fields[name.strip().lower()] = value.strip()
+
+    # Read the body
+    if "content-length" in fields:
+        await reader.readexactly(int(fields["content-length"]))
+    elif fields.get("transfer-encoding") == "chunked":
+        while True:
+            size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+            await reader.readexactly(size + 2)
+            if not size:
+                break
+    return status, fields.get("connection", "").lower() != "close"
+
+
+# Run `requests` requests from `concurrency` clients against one URL
+async def run_level(url, concurrency, requests, headers):
+    parts = urlsplit(url)
+    host = parts.hostname
+    port = parts.port or 80
+    path = parts.path + (f"?{parts.query}" if parts.query else "")
+    extra = "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+
+    latencies = []
+    errors = 0
+    remaining = requests
+
+    async def client():
+        nonlocal remaining, errors
+        reader = writer = None
+        while remaining > 0:
+            remaining -= 1
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            started = time.perf_counter()
+            try:
+                status, keep_alive = await fetch(reader, writer, host, path, extra)
+            except (OSError, asyncio.IncompleteReadError, ValueError):
+                errors += 1
+                writer.close()
+                writer = None
+                continue
+            latencies.append(time.perf_counter() - started)
+            errors += status >= 400
+            if not keep_alive:
+                writer.close()
+                writer = None
+        if writer is not None:
+            writer.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+
+    def percentile(q):
+        if not latencies:
+            return None
+        value = latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+        return round(value * 1000, 2)
+
+    return {
+        "concurrency": concurrency,
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "p50_ms": percentile(0.5),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "errors": errors,
+    }
+
+
+# Benchmark every mode at every concurrency level
+async def main(args):
+    headers = {}
+    if args.token:
+        headers["Authorization"] = f"Bearer {args.token}"
+
+    results = {}
+    for mode, url in (("sync", args.sync), ("async", args.async_url)):
+        if not url:
+            continue
+        results[mode] = []
+        for concurrency in args.concurrency:
+            # Warm the server up at this level before measuring
+            await run_level(url, concurrency, concurrency * 2, headers)
+            level = await run_level(url, concurrency, args.requests, headers)
+            results[mode].append(level)
+            print(
+                f"{mode:>5}  c={concurrency:<4} {level['requests_per_second']:>9} req/s"
+                f"  p50 {level['p50_ms']} ms  p95 {level['p95_ms']} ms"
+                f"  p99 {level['p99_ms']} ms  errors {level['errors']}"
+            )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+
+# Parse the command line
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--sync", help="URL of the endpoint served by WSGI")
+    parser.add_argument(
+        "--async", dest="async_url", help="URL of the endpoint served by ASGI"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=lambda value: [int(level) for level in value.split(",")],
+        default=[1, 8, 32, 128],
+        help="Comma separated numbers of concurrent clients",
+    )
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per level")
+    parser.add_argument("--token", help="JWT access token sent as Bearer")
+    parser.add_argument("--output", help="Write the results as JSON")
+    args = parser.parse_args()
+    if not args.sync and not args.async_url:
+        parser.error("give --sync, --async or both")
+    return args
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,36 @@
+"""
+Smallest Django WSGI application that answers a request, the floor the cold
+start of the workers is compared with by scripts/profile_coldstart.py. It has
+no apps, no middleware and no database, and answers every path with an empty
+JSON object.
+"""
+
+# Imports
+from django.conf import settings
+from django.core.wsgi import get_wsgi_application
+from django.http import HttpResponse
+from django.urls import re_path
+
+
+# View answering every path
+def empty(request):
+    return HttpResponse(b"{}", content_type="application/json")
+
+
+# URL patterns of the application
+urlpatterns = [re_path(r"", empty)]
+
+
+# Configure Django without a settings module
+settings.configure(
+    SECRET_KEY="coldstart-baseline",
+    ALLOWED_HOSTS=["*"],
+    ROOT_URLCONF=__name__,
+    INSTALLED_APPS=[],
+    MIDDLEWARE=[],
+    USE_TZ=True,
+)
+
+
+# Initialize the WSGI application
+application = get_wsgi_application()
@@ -0,0 +1,235 @@
+"""
+Measure the cold start of the WSGI workers: import the entry point in a fresh
+interpreter, send it one request and time both, the way a serverless function
+starts on its first call.
+
+Each run starts a new python process per mode, so nothing is cached between
+runs but the files the operating system keeps in memory. One more run under
+`python -X importtime` breaks the import time down by package, it is left out
+of the timings as the tracing slows the imports down. The defaults compare
+the full worker with the API-only worker:
+
+    python scripts/profile_coldstart.py --path /customer/search/CUST0001/
+
+Pass --mode NAME=MODULE:SETTINGS to time other entry points or settings, for
+example against a local database:
+
+    python scripts/profile_coldstart.py \\
+        --mode full=backend.wsgi:local_settings \\
+        --mode api=backend.wsgi_api:local_api_settings
+
+The script prints the median timings of each mode and the packages that took
+the longest to import as JSON, and exits with 1 when the last mode takes more
+than --target-ms to its first response. Only the standard library is used.
+
+The same cold start of a bare Django application (scripts/coldstart_baseline.py)
+is timed first and each mode reports its overhead over it, the part of the
+cold start the project controls. Django alone takes a different time on every
+machine, so compare the target with the baseline of the machine it runs on.
+Pass --no-baseline to skip it.
+"""
+
+# Imports
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import Counter
+from pathlib import Path
+
+
+# Project root, the directory of manage.py
+ROOT = Path(__file__).resolve().parent.parent
+
+
+# Line the child process prints its timings on
+MARKER = "COLDSTART "
+
+
+# Bare Django application the modes are compared with, configured in code
+BASELINE = ("django", "scripts.coldstart_baseline", "scripts.coldstart_baseline")
+
+
+# Code run in the child process: import the entry point, then call it once
+CHILD = (
+    """
+import importlib, io, json, sys, time
+
+started = time.perf_counter()
+application = importlib.import_module(sys.argv[1]).application
+imported = time.perf_counter()
+
+statuses = []
+environ = {
+    "REQUEST_METHOD": "GET",
+    "PATH_INFO": sys.argv[2],
+    "QUERY_STRING": "",
+    "SERVER_NAME": sys.argv[3],
+    "SERVER_PORT": "443",
+    "SERVER_PROTOCOL": "HTTP/1.1",
+    "HTTP_HOST": sys.argv[3],
+    "HTTP_ACCEPT": "application/json",
+    "wsgi.url_scheme": "https",
+    "wsgi.input": io.BytesIO(),
+    "wsgi.errors": sys.stderr,
+    "wsgi.multithread": False,
+    "wsgi.multiprocess": True,
+    "wsgi.run_once": False,
+    "wsgi.version": (1, 0),
+}
+response = application(environ, lambda status, headers, exc_info=None: statuses.append(status))
+body = b"".join(response)
+if hasattr(response, "close"):
+    response.close()
+responded = time.perf_counter()
+
+print(%r + json.dumps({
+    "status": int(statuses[0].split()[0]),
+    "bytes": len(body),
+    "import_ms": (imported - started) * 1000,
+    "request_ms": (responded - imported) * 1000,
+    "first_response_ms": (responded - started) * 1000,
+    "modules": len(sys.modules),
+}), flush=True)
+"""
+    % MARKER
+)
+
+
+# Parse the -X importtime lines into the self time of each top level package
+def import_times(stderr):
+    packages = Counter()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, _, name = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            continue
+        packages[name.strip().split(".")[0]] += int(self_us)
+    return packages
+
+
+# Start one cold worker and return its timings and import times
+def run_once(module, settings, path, host, importtime=False):
+    environ = dict(os.environ, DJANGO_SETTINGS_MODULE=settings)
+    environ["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(ROOT), environ.get("PYTHONPATH")])
+    )
+    options = ["-X", "importtime"] if importtime else []
+    process = subprocess.run(
+        [sys.executable, *options, "-c", CHILD, module, path, host],
+        cwd=ROOT,
+        env=environ,
+        capture_output=True,
+        text=True,
+    )
+    for line in process.stdout.splitlines():
+        if line.startswith(MARKER):
+            return json.loads(line[len(MARKER) :]), import_times(process.stderr)
+    raise RuntimeError(
+        f"{module} with {settings} did not respond:\n{process.stderr[-2000:]}"
+    )
+
+
+# Run one mode several times and keep the medians
+def profile(module, settings, path, host, runs, top):
+    results = [run_once(module, settings, path, host)[0] for _ in range(runs)]
+    _, packages = run_once(module, settings, path, host, importtime=True)
+
+    report = {"module": module, "settings": settings, "status": results[0]["status"]}
+    for key in ("import_ms", "request_ms", "first_response_ms"):
+        report[key] = round(statistics.median(result[key] for result in results), 1)
+    report["modules"] = results[0]["modules"]
+    report["slowest_imports_ms"] = {
+        name: round(total / 1000, 1) for name, total in packages.most_common(top)
+    }
+    return report
+
+
+# Parse a NAME=MODULE:SETTINGS mode
+def parse_mode(value):
+    try:
+        name, target = value.split("=", 1)
+        module, settings = target.split(":", 1)
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected NAME=MODULE:SETTINGS")
+    return name, module, settings
+
+
+# Main function
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--mode",
+        action="append",
+        dest="modes",
+        type=parse_mode,
+        metavar="NAME=MODULE:SETTINGS",
+        help="Entry point to time, can be repeated",
+    )
+    parser.add_argument(
+        "--path", default="/customer/search/CUST0001/", help="Path of the request"
+    )
+    parser.add_argument(
+        "--host", default="coldstart.vercel.app", help="Host header of the request"
+    )
+    parser.add_argument("--runs", type=int, default=5, help="Cold starts per mode")
+    parser.add_argument(
+        "--top", type=int, default=10, help="Slowest packages to list per mode"
+    )
+    parser.add_argument(
+        "--target-ms",
+        type=float,
+        default=300,
+        help="Time to first response the last mode must stay under",
+    )
+    parser.add_argument(
+        "--no-baseline",
+        action="store_false",
+        dest="baseline",
+        help="Do not time the bare Django application",
+    )
+    options = parser.parse_args()
+
+    modes = options.modes or [
+        ("full", "backend.wsgi", "backend.settings.prod"),
+        ("api", "backend.wsgi_api", "backend.settings.api"),
+    ]
+    report = {}
+    for name, module, settings in ([BASELINE] if options.baseline else []) + modes:
+        print(f"Profiling {name}", file=sys.stderr)
+        report[name] = profile(
+            module, settings, options.path, options.host, options.runs, options.top
+        )
+
+    # Overhead of each mode over the bare Django application
+    if options.baseline:
+        baseline_ms = report[BASELINE[0]]["first_response_ms"]
+        for name, _, _ in modes:
+            report[name]["over_baseline_ms"] = round(
+                report[name]["first_response_ms"] - baseline_ms, 1
+            )
+    print(json.dumps(report, indent=2))
+
+    # Check the last mode against the target
+    name = modes[-1][0]
+    first_response_ms = report[name]["first_response_ms"]
+    if first_response_ms > options.target_ms:
+        print(
+            f"{name} takes {first_response_ms} ms to its first response, more "
+            f"than the {options.target_ms} ms target",
+            file=sys.stderr,
+        )
+        if options.baseline:
+            print(
+                f"A bare Django application takes {baseline_ms} ms on this " "machine",
+                file=sys.stderr,
+            )
+        sys.exit(1)
+
+
+# If the file is run as the main program
+if __name__ == "__main__":
+    main()